@@ -0,0 +1,121 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c python:base.gunicorn_conf base.wsgi:application
+
+Workers and threads are sized from the CPUs and memory actually available to
+the container (cgroup limits included). Every value can be overridden with the
+matching ``GUNICORN_*`` environment variable.
+
+The application is preloaded in the master process so imports, compiled
+templates and URL resolvers are shared copy-on-write between workers, and each
+worker is warmed up (DB connection opened, homepage and thank-you page
+rendered) before it starts accepting requests. Migrations are not run here;
+see ``release.sh``.
+"""
+
+import os
+
+
+def _read_cgroup(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def available_cpus():
+    """Return the number of CPUs this process may use, honouring cgroup quotas"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2 ("max 100000" / "200000 100000") then v1
+    quota = _read_cgroup("/sys/fs/cgroup/cpu.max")
+    if quota:
+        limit, period = (quota.split() + ["100000"])[:2]
+        if limit != "max":
+            cpus = min(cpus, max(1, int(int(limit) / int(period))))
+    else:
+        limit = _read_cgroup("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+        period = _read_cgroup("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+        if limit and period and int(limit) > 0:
+            cpus = min(cpus, max(1, int(int(limit) / int(period))))
+    return cpus
+
+
+def available_memory():
+    """Return the bytes of memory this process may use, honouring cgroup limits"""
+    try:
+        memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        memory = None
+
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        limit = _read_cgroup(path)
+        if limit and limit.isdigit():
+            memory = min(memory, int(limit)) if memory else int(limit)
+            break
+    return memory
+
+
+def worker_count(cpus, memory, worker_memory_mb=120, reserved_memory_mb=128):
+    """
+    Return the number of sync workers for the given CPUs and memory (bytes).
+
+    Starts from the usual ``2 * cpus + 1`` and caps it so every worker fits in
+    memory next to the preloaded master.
+    """
+    workers = 2 * cpus + 1
+    if memory:
+        budget = memory // (1024 * 1024) - reserved_memory_mb
+        workers = min(workers, budget // worker_memory_mb)
+    return max(1, int(workers))
+
+
+_cpus = available_cpus()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get(
+    "GUNICORN_WORKERS",
+    worker_count(_cpus, available_memory(), int(os.environ.get("GUNICORN_WORKER_MEMORY_MB", 120))),
+))
+# Threads only pay off while requests wait on Mailtrap / Zapier; SQLite writes
+# are serialised anyway, so keep the default small.
+threads = int(os.environ.get("GUNICORN_THREADS", 2 if _cpus == 1 else 1))
+worker_class = "gthread" if threads > 1 else "sync"
+
+preload_app = True
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 20
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    # Runs in the master after the preloaded app is imported. Rendering once
+    # here fills the template, URL and import caches that workers then share
+    # copy-on-write; the DB connection must not survive the fork.
+    from django.db import connections
+    from home.warmup import warm_up
+
+    for path, status, elapsed in warm_up(server.app.wsgi()):
+        server.log.info("Warm-up (master) %s -> %s in %.0fms", path, status, elapsed * 1000)
+    connections.close_all()
+
+
+def post_fork(server, worker):
+    # Runs in each worker before it accepts connections: open a fresh DB
+    # connection and fill the per-process caches.
+    from django.db import connections
+    from home.warmup import warm_up
+
+    connections.close_all()
+    for path, status, elapsed in warm_up(server.app.wsgi()):
+        worker.log.info("Warm-up (worker %s) %s -> %s in %.0fms", worker.pid, path, status, elapsed * 1000)
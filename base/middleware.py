@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+
+class LazyAdminURLConfMiddleware:
+    """
+    Route admin and editor requests on the public entrypoint to the full URLConf.
+
+    ``base.urls_public`` has no admin routes. Requests under one of
+    ``ADMIN_URL_PREFIXES``, or from a browser carrying a session cookie (editors
+    see the Wagtail userbar, which reverses admin URLs), are resolved against
+    ``ADMIN_URLCONF`` instead. That URLConf is only imported on the first such
+    request, so anonymous traffic never pays for it.
+
+    When ``ROOT_URLCONF`` already is the admin URLConf this middleware removes
+    itself from the stack.
+    """
+
+    def __init__(self, get_response):
+        if not settings.ADMIN_URLCONF or settings.ROOT_URLCONF == settings.ADMIN_URLCONF:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefixes = tuple(settings.ADMIN_URL_PREFIXES)
+
+    def __call__(self, request):
+        if request.path_info.startswith(self.prefixes) or settings.SESSION_COOKIE_NAME in request.COOKIES:
+            request.urlconf = settings.ADMIN_URLCONF
+        return self.get_response(request)
@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     "contact",
     "wagtail.contrib.forms",
     "wagtail.contrib.redirects",
+    "wagtail.contrib.sitemaps",
     "wagtail.embeds",
     "wagtail.sites",
     "wagtail.users",
@@ -47,15 +48,24 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.sitemaps",
+    "rest_framework",
+    "django_tasks",
+    "django_tasks.backends.database",
 
     'wagtail.contrib.settings',
     'wagtail_favicon',
 ]
 
 MIDDLEWARE = [
+    "base.middleware.LazyAdminURLConfMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "home.middleware.CompressionMiddleware",
+    "home.middleware.NotFoundShortcutMiddleware",
+    "home.middleware.CachedSiteMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "home.middleware.EarlyHintsMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -63,7 +73,12 @@ MIDDLEWARE = [
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
 ]
 
-ROOT_URLCONF = "base.urls"
+# The public entrypoint (base.wsgi_public) swaps in the trimmed base.urls_public;
+# admin requests there are routed back to ADMIN_URLCONF on demand. Set
+# DJANGO_ADMIN_URLCONF to an empty string when the admin runs on its own pool.
+ROOT_URLCONF = os.environ.get("DJANGO_ROOT_URLCONF", "base.urls")
+ADMIN_URLCONF = os.environ.get("DJANGO_ADMIN_URLCONF", "base.urls") or None
+ADMIN_URL_PREFIXES = ["/admin/", "/django-admin/"]
 
 TEMPLATES = [
     {
@@ -78,7 +93,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
-                "wagtail.contrib.settings.context_processors.settings",
+                "home.site_settings.settings_context_processor",
             ],
         },
     },
@@ -94,6 +109,129 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        # Keep connections open between requests so the one opened during
+        # worker warm-up (home/warmup.py) is reused.
+        "CONN_MAX_AGE": int(os.environ.get("DJANGO_CONN_MAX_AGE", 300)),
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+
+# Cache
+# Shared by every worker on the host (route invalidation and other
+# cross-worker state). Point DJANGO_CACHE_LOCATION at a tmpfs in production.
+#
+# FileBasedCache's incr() and add() are read-then-write, not atomic, so the form
+# throttle, duplicate-submission claims and circuit breaker counters built on
+# them are best-effort when workers race. Set DJANGO_REDIS_URL (needs the
+# `redis` package) to use Redis, whose incr/add are atomic and which is also
+# shared between hosts.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", os.path.join(BASE_DIR, "cache")),
+    }
+}
+if os.environ.get("DJANGO_REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["DJANGO_REDIS_URL"],
+    }
+
+# How often (seconds) each worker checks whether the known-routes set used by
+# home.middleware.NotFoundShortcutMiddleware must be rebuilt, and how many
+# per-path verdicts it remembers.
+KNOWN_ROUTES_CHECK_INTERVAL = 5
+KNOWN_ROUTES_LRU_SIZE = 2048
+
+# Same for the Site / Wagtail settings snapshot in home/site_settings.py
+SITE_SETTINGS_CHECK_INTERVAL = 5
+
+# Same for the homepage reviews / brand partners snapshot in home/showcase.py
+SHOWCASE_CHECK_INTERVAL = 5
+
+# The hero and the next HOMEPAGE_EAGER_SECTIONS - 1 homepage sections are
+# rendered inline; the rest are fetched as HTML fragments when scrolled near
+# (/sections/<page id>/<section>/, publicly cacheable for HOMEPAGE_FRAGMENT_MAX_AGE)
+HOMEPAGE_EAGER_SECTIONS = 2
+HOMEPAGE_FRAGMENT_MAX_AGE = 300
+
+# Read-only content API (/api/v1/home/, home/api.py): responses are cached until
+# a page is published or a showcase snippet changes, and clients may reuse them
+# for CONTENT_API_MAX_AGE seconds before revalidating with their ETag
+CONTENT_API_MAX_AGE = 60
+CONTENT_API_CACHE_TIMEOUT = 86400
+
+# Response compression (home/compression.py): Brotli (shared responses only),
+# Zstandard or gzip. Bodies under COMPRESSION_MIN_SIZE bytes are sent as is; encoded
+# variants of publicly cacheable responses are kept for COMPRESSION_CACHE_TIMEOUT
+COMPRESSION_MIN_SIZE = 512
+COMPRESSION_CACHE_TIMEOUT = 86400
+
+# Preload/preconnect Link headers for the homepage's critical assets
+# (home/early_hints.py), also sent as 103 Early Hints when the server supports it
+EARLY_HINTS_CACHE_TIMEOUT = 86400
+
+
+# Form submission admission control (home/throttling.py): per-IP token bucket
+# for the HomePage form and /api/contact/submit/, and the window in which an
+# identical submission is answered from the first result.
+FORM_THROTTLE_BURST = 5
+FORM_THROTTLE_RATE_PER_MINUTE = 5
+FORM_DUPLICATE_WINDOW = 600
+# Number of reverse proxies whose X-Forwarded-For entry can be trusted
+FORM_THROTTLE_TRUSTED_PROXIES = int(os.environ.get("FORM_THROTTLE_TRUSTED_PROXIES", 0))
+
+# Submission analytics rollups (home/rollups.py): dimension name -> clean_name
+# prefix of the form field it is read from, and the budget band boundaries (RM).
+SUBMISSION_ROLLUP_DIMENSIONS = {
+    "location": "location",
+    "budget": "budget",
+}
+SUBMISSION_BUDGET_BANDS = [1000, 2000, 5000, 10000]
+
+# Replaying failed Zapier deliveries (home/webhooks.py, manage.py replay_webhooks):
+# concurrent requests, and requests per second allowed to any one host.
+WEBHOOK_REPLAY_WORKERS = 4
+WEBHOOK_REPLAY_RATE_PER_HOST = 2
+
+# Batched / digest notification emails (home/notifications.py) are flushed by a
+# background task when their window closes; sends that failed, and submissions
+# left over, are tried again NOTIFICATION_RETRY_DELAY seconds later
+NOTIFICATION_RETRY_DELAY = int(os.environ.get("NOTIFICATION_RETRY_DELAY", 30))
+
+# Circuit breakers around the Mailtrap, Zapier and SMTP calls (home/circuit.py): a
+# provider's circuit opens after failure_threshold failures within
+# failure_window seconds, and a probe request is let through after reset_timeout.
+CIRCUIT_BREAKERS = {
+    "mailtrap": {"failure_threshold": 5, "failure_window": 120, "reset_timeout": 60},
+    "zapier": {"failure_threshold": 5, "failure_window": 120, "reset_timeout": 60},
+    "smtp": {"failure_threshold": 5, "failure_window": 120, "reset_timeout": 60},
+}
+# Bearer token for the circuit breaker JSON at /metrics/circuit-breakers/ (for
+# monitors without an admin session); the endpoint answers 404 while it is empty
+CIRCUIT_METRICS_TOKEN = os.environ.get("CIRCUIT_METRICS_TOKEN", "")
+
+# Submission archival (home/archive.py): submissions older than this many days
+# are moved by `manage.py archive_submissions` into gzip JSONL files, one per
+# form page and month. Keep the directory on persistent storage.
+SUBMISSION_ARCHIVE_AFTER_DAYS = int(os.environ.get("SUBMISSION_ARCHIVE_AFTER_DAYS", 365))
+SUBMISSION_ARCHIVE_DIR = os.environ.get("SUBMISSION_ARCHIVE_DIR", os.path.join(BASE_DIR, "archive", "submissions"))
+
+# Static export of the public site (home/static_export.py, manage.py export_static):
+# releases are written under STATIC_EXPORT_DIR and STATIC_EXPORT_DIR/current points
+# at the newest one. With STATIC_EXPORT_ON_PUBLISH, publishing a page re-exports.
+STATIC_EXPORT_DIR = os.environ.get("STATIC_EXPORT_DIR", os.path.join(BASE_DIR, "export"))
+STATIC_EXPORT_KEEP = 3
+STATIC_EXPORT_ON_PUBLISH = os.environ.get("STATIC_EXPORT_ON_PUBLISH", "") == "1"
+
+
+# Background tasks (home/tasks.py, and Wagtail's own): stored in the database
+# and run by `manage.py db_worker`, so queued work survives worker restarts
+TASKS = {
+    "default": {
+        "BACKEND": "django_tasks.backends.database.DatabaseBackend",
     }
 }
 
@@ -151,13 +289,34 @@ MEDIA_URL = "/media/"
 # See https://docs.djangoproject.com/en/5.2/ref/settings/#std-setting-STORAGES
 STORAGES = {
     "default": {
-        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        # FileSystemStorage that names image originals and renditions by content
+        # hash, so identical uploads share one file (home/storage.py)
+        "BACKEND": "home.storage.ContentAddressedStorage",
     },
     "staticfiles": {
         "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
     },
 }
 
+# MEDIA_STORAGE=s3 keeps media on S3-compatible object storage (AWS S3, MinIO)
+# instead of MEDIA_ROOT, so more than one web replica can run. Needs
+# django-storages[s3]; credentials come from AWS_ACCESS_KEY_ID and
+# AWS_SECRET_ACCESS_KEY in the environment (home/s3_storage.py)
+MEDIA_STORAGE = os.environ.get("MEDIA_STORAGE", "filesystem")
+if MEDIA_STORAGE == "s3":
+    STORAGES["default"] = {"BACKEND": "home.s3_storage.S3MediaStorage"}
+    AWS_STORAGE_BUCKET_NAME = os.environ.get("AWS_STORAGE_BUCKET_NAME", "media")
+    AWS_S3_ENDPOINT_URL = os.environ.get("AWS_S3_ENDPOINT_URL") or None
+    AWS_S3_REGION_NAME = os.environ.get("AWS_S3_REGION_NAME") or None
+    AWS_S3_CUSTOM_DOMAIN = os.environ.get("AWS_S3_CUSTOM_DOMAIN") or None
+    AWS_QUERYSTRING_AUTH = os.environ.get("AWS_QUERYSTRING_AUTH", "") == "1"
+    AWS_S3_FILE_OVERWRITE = False
+
+# Local read-through cache of image originals read from remote media storage
+MEDIA_CACHE_DIR = os.environ.get("MEDIA_CACHE_DIR", os.path.join(BASE_DIR, "media-cache"))
+# How long media URLs are memoized in the cache
+MEDIA_URL_CACHE_TIMEOUT = 86400
+
 # Django sets a maximum of 1000 fields per form by default, but particularly complex page models
 # can exceed this limit within Wagtail's page editor.
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 10_000
@@ -185,6 +344,30 @@ WAGTAILADMIN_BASE_URL = "https://sengleongaircond.com.my"
 # see https://docs.wagtail.org/en/stable/advanced_topics/deploying.html#user-uploaded-files
 WAGTAILDOCS_EXTENSIONS = ['csv', 'docx', 'key', 'odt', 'pdf', 'pptx', 'rtf', 'txt', 'xlsx', 'zip']
 
+# Phone photos can be uploaded as HEIC (decoded by pillow_heif); originals are
+# converted to web formats after upload, see below
+WAGTAILIMAGES_EXTENSIONS = ["avif", "gif", "heic", "jpg", "jpeg", "png", "webp"]
+
+# Upload-time optimisation of image originals (home/image_optimization.py,
+# manage.py optimize_images): longest side in pixels, format for photos
+# ("webp" or "jpeg") and encoder quality
+IMAGE_OPTIMIZE_ON_UPLOAD = True
+IMAGE_OPTIMIZE_MAX_SIZE = 2560
+IMAGE_OPTIMIZE_PHOTO_FORMAT = "webp"
+IMAGE_OPTIMIZE_QUALITY = 85
+
+
+# Outgoing email. The pooled backend (home/mail.py) keeps authenticated SMTP
+# sessions open between sends. ContactPage notifications go through EMAIL_BACKEND,
+# and so do the HomePage notification emails when NOTIFICATION_EMAIL_TRANSPORT is "smtp"
+# (the default "mailtrap" sends them through the Mailtrap HTTP API).
+EMAIL_BACKEND = "home.mail.PooledSMTPBackend"
+NOTIFICATION_EMAIL_TRANSPORT = os.environ.get("NOTIFICATION_EMAIL_TRANSPORT", "mailtrap")
+# Idle sessions kept per SMTP server, seconds an idle session may be reused
+# for, and messages sent over one session before it is replaced
+EMAIL_POOL_SIZE = 4
+EMAIL_POOL_MAX_IDLE = 60
+EMAIL_POOL_MAX_MESSAGES = 100
 
 # EMAIL_BACKEND = 'django.core.mail.backends.dummy.EmailBackend'
 # EMAIL_HOST = 'localhost'
@@ -1,41 +1,13 @@
-from django.conf import settings
 from django.urls import include, path
 from django.contrib import admin
 
 from wagtail.admin import urls as wagtailadmin_urls
-from wagtail import urls as wagtail_urls
-from wagtail.documents import urls as wagtaildocs_urls
 
-from search import views as search_views
-from wagtail_favicon.urls import urls as favicon_urls
-from home import views as home_views
+from base import urls_public
 
+# The public routes are declared once, in base/urls_public.py; this URLConf
+# adds the admin trees in front of them (the Wagtail page route stays last)
 urlpatterns = [
     path("django-admin/", admin.site.urls),
     path("admin/", include(wagtailadmin_urls)),
-    path("documents/", include(wagtaildocs_urls)),
-    path("search/", search_views.search, name="search"),
-    path('', include(favicon_urls)),
-    path("api/contact/submit/", home_views.submit_contact_form, name="submit_contact_form"),
-    path("thank-you/", home_views.thank_you_page, name="thank_you"),
-]
-
-
-if settings.DEBUG:
-    from django.conf.urls.static import static
-    from django.contrib.staticfiles.urls import staticfiles_urlpatterns
-
-    # Serve static and media files from development server
-    urlpatterns += staticfiles_urlpatterns()
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
-urlpatterns = urlpatterns + [
-    # For anything not caught by a more specific rule above, hand over to
-    # Wagtail's page serving mechanism. This should be the last pattern in
-    # the list:
-    path("", include(wagtail_urls)),
-    # Alternatively, if you want Wagtail pages to be served from a subpath
-    # of your site, rather than the site root:
-    #    path("pages/", include(wagtail_urls)),
-    
-]
+] + urls_public.urlpatterns
@@ -0,0 +1,51 @@
+"""
+Trimmed URLConf for the public WSGI entrypoint (``base.wsgi_public``).
+
+Only the routes anonymous visitors need are declared here: the page tree,
+the contact form API, the thank-you page, sitemap, robots.txt, search,
+documents and favicons.
+The Wagtail and Django admin trees are left out so public workers don't
+import them at start-up; ``base.middleware.LazyAdminURLConfMiddleware``
+loads the full ``base.urls`` on the first admin or editor request instead.
+
+``base.urls`` is these patterns with the admin trees in front, so a public
+route only needs adding here.
+"""
+from django.conf import settings
+from django.urls import include, path
+
+from wagtail import urls as wagtail_urls
+from wagtail.contrib.sitemaps.views import sitemap
+from wagtail.documents import urls as wagtaildocs_urls
+
+from search import views as search_views
+from wagtail_favicon.urls import urls as favicon_urls
+from home import views as home_views
+
+urlpatterns = [
+    path("documents/", include(wagtaildocs_urls)),
+    path("search/", search_views.search, name="search"),
+    path('', include(favicon_urls)),
+    path("api/contact/submit/", home_views.submit_contact_form, name="submit_contact_form"),
+    path("thank-you/", home_views.thank_you_page, name="thank_you"),
+    path("api/csrf/", home_views.csrf_token, name="csrf_token"),
+    path("metrics/circuit-breakers/", home_views.circuit_breaker_metrics, name="circuit_breaker_metrics"),
+    path("api/v1/home/", home_views.content_api_home, name="content_api_home"),
+    path("sections/<int:page_id>/<slug:section_id>/", home_views.section_fragment, name="section_fragment"),
+    path("sitemap.xml", sitemap, name="sitemap"),
+    path("robots.txt", home_views.robots_txt, name="robots_txt"),
+]
+
+
+if settings.DEBUG:
+    from django.conf.urls.static import static
+    from django.contrib.staticfiles.urls import staticfiles_urlpatterns
+
+    # Serve static and media files from development server
+    urlpatterns += staticfiles_urlpatterns()
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+urlpatterns = urlpatterns + [
+    # Wagtail's page serving mechanism must stay the last pattern in the list
+    path("", include(wagtail_urls)),
+]
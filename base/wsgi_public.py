@@ -0,0 +1,21 @@
+"""
+WSGI config for the public-facing worker pool.
+
+Same application as ``base.wsgi`` but routed through the trimmed
+``base.urls_public`` URLConf, so workers serving the homepage and form
+submissions don't import the admin URL trees until an editor needs them.
+Run it as a separate pool, e.g.::
+
+    gunicorn base.wsgi_public:application
+
+and keep ``base.wsgi:application`` for the pool that serves ``/admin/``.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "base.settings.dev")
+os.environ.setdefault("DJANGO_ROOT_URLCONF", "base.urls_public")
+
+application = get_wsgi_application()
@@ -3,7 +3,9 @@ from modelcluster.fields import ParentalKey
 from wagtail.admin.panels import FieldPanel, MultiFieldPanel, InlinePanel, TabbedInterface, ObjectList, FieldRowPanel
 from wagtail.fields import RichTextField
 from wagtail.contrib.forms.models import AbstractEmailForm, AbstractFormField
-from wagtail.contrib.forms.panels import FormSubmissionsPanel
+from home.forms import CachedFormMixin, StreamingExportMixin
+from home.panels import RollupSubmissionsPanel
+from home.rollups import record_submission
 # Create your models here.
 
 
@@ -15,7 +17,7 @@ class FormField(AbstractFormField):
     )
 
 
-class ContactPage(AbstractEmailForm):
+class ContactPage(CachedFormMixin, StreamingExportMixin, AbstractEmailForm):
 
     parent_page_types = [
         'home.HomePage',
@@ -29,7 +31,7 @@ class ContactPage(AbstractEmailForm):
     thank_you_text = RichTextField(blank=True)
 
     content_panels = AbstractEmailForm.content_panels  + [
-        FormSubmissionsPanel(),
+        RollupSubmissionsPanel(),
         FieldPanel('intro'),
         FieldPanel('thank_you_text'),
         InlinePanel('form_fields', label= 'Form Fields'),
@@ -41,6 +43,12 @@ class ContactPage(AbstractEmailForm):
         ]),
         FieldPanel('subject')
         ]
+
+    def process_form_submission(self, form):
+        submission = super().process_form_submission(form)
+        record_submission(submission)
+        return submission
+
     class Meta:
         verbose_name = "Contact Page"
         verbose_name_plural = "Contact Pages"
\ No newline at end of file
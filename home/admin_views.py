@@ -0,0 +1,238 @@
+import csv
+import datetime
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.exceptions import PermissionDenied
+from django.db.models import Sum
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+from django.utils import timezone
+from django.views.generic import TemplateView
+from wagtail.admin.views.generic.base import WagtailAdminTemplateMixin
+from wagtail.admin.views.mixins import Echo
+from wagtail.contrib.forms.utils import get_forms_for_user
+
+from .archive import restore_archive, search_archives
+from .circuit import breakers
+from .models import SubmissionArchive, SubmissionRollup
+from .rollups import TOTAL
+
+
+class FormPagesMixin:
+    """Limit an admin view to users with access to at least one form page"""
+
+    def dispatch(self, request, *args, **kwargs):
+        self.form_pages = list(get_forms_for_user(request.user).specific().order_by("title"))
+        if not self.form_pages:
+            raise PermissionDenied
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_breadcrumbs_items(self):
+        return self.breadcrumbs_items + [{"url": "", "label": self.page_title}]
+
+    def get_selected_page(self):
+        try:
+            selected_page = int(self.request.GET.get("page", ""))
+        except ValueError:
+            return None
+        return selected_page if selected_page in {page.pk for page in self.form_pages} else None
+
+
+class SubmissionReportView(FormPagesMixin, WagtailAdminTemplateMixin, TemplateView):
+    """
+    Leads per day and per configured dimension, read only from the
+    SubmissionRollup counters - never from the FormSubmission rows.
+    """
+    template_name = "home/admin/submission_report.html"
+    page_title = "Submission analytics"
+    header_icon = "form"
+    period_choices = [7, 30, 90, 365]
+    top_values = 15
+
+    def get_filters(self):
+        selected_page = self.get_selected_page()
+        try:
+            days = int(self.request.GET.get("days", 30))
+        except ValueError:
+            days = 30
+        if days not in self.period_choices:
+            days = 30
+        return selected_page, days
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        selected_page, days = self.get_filters()
+        since = timezone.localdate() - datetime.timedelta(days=days - 1)
+
+        rollups = SubmissionRollup.objects.filter(
+            page_id__in=[selected_page] if selected_page else [page.pk for page in self.form_pages],
+            day__gte=since,
+        )
+        daily = list(rollups.filter(dimension=TOTAL).values("day").annotate(total=Sum("count")).order_by("-day"))
+        dimensions = [
+            {
+                "name": dimension,
+                "rows": list(
+                    rollups.filter(dimension=dimension)
+                    .values("value")
+                    .annotate(total=Sum("count"))
+                    .order_by("-total", "value")[:self.top_values]
+                ),
+            }
+            for dimension in getattr(settings, "SUBMISSION_ROLLUP_DIMENSIONS", {})
+        ]
+
+        context.update({
+            "form_pages": self.form_pages,
+            "selected_page": selected_page,
+            "days": days,
+            "period_choices": self.period_choices,
+            "since": since,
+            "total": sum(row["total"] for row in daily),
+            "daily": daily,
+            "dimensions": dimensions,
+            "report_url": reverse("home_submission_report"),
+        })
+        return context
+
+
+class SubmissionArchiveView(FormPagesMixin, WagtailAdminTemplateMixin, TemplateView):
+    """
+    Browse, search, export and restore the monthly submission archives written
+    by home/archive.py. The SubmissionArchive index picks the files to open;
+    matching rows are found by streaming through them.
+    """
+    template_name = "home/admin/submission_archive.html"
+    page_title = "Submission archive"
+    header_icon = "folder-inverse"
+    max_results = 200
+
+    def get_indexes(self):
+        page_ids = [page.pk for page in self.form_pages]
+        selected_page = self.get_selected_page()
+        return SubmissionArchive.objects.filter(page_id__in=[selected_page] if selected_page else page_ids)
+
+    def get_search(self):
+        """Return (query, since, until) from the search form; since/until cover the selected month"""
+        query = self.request.GET.get("q", "").strip()
+        try:
+            month = datetime.datetime.strptime(self.request.GET.get("month", ""), "%Y-%m")
+        except ValueError:
+            return query, None, None
+        since = timezone.make_aware(month)
+        until = timezone.make_aware(month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1))
+        return query, since, until
+
+    def get_field_labels(self):
+        labels = {}
+        for page in self.form_pages:
+            for clean_name, label in page.get_data_fields()[1:]:
+                labels.setdefault(clean_name, label)
+        return labels
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("export") == "csv":
+            return self.export_csv()
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        index = get_object_or_404(self.get_indexes(), pk=request.POST.get("restore"))
+        restored = restore_archive(index)
+        messages.success(request, f"Restored {restored} submissions from {index.month:%B %Y}.")
+        return redirect("home_submission_archive")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query, since, until = self.get_search()
+        indexes = self.get_indexes()
+        results = []
+        if query or since:
+            labels = self.get_field_labels()
+            for index, row in search_archives(indexes, query, since, until):
+                row["fields"] = [(labels.get(name, name), value) for name, value in row["form_data"].items()]
+                row["page_id"] = index.page_id
+                results.append(row)
+                if len(results) >= self.max_results:
+                    break
+
+        context.update({
+            "form_pages": self.form_pages,
+            "selected_page": self.get_selected_page(),
+            "query": query,
+            "month": self.request.GET.get("month", ""),
+            "searched": bool(query or since),
+            "indexes": indexes.select_related("page"),
+            "results": results,
+            "max_results": self.max_results,
+            "export_query": self.request.GET.urlencode(),
+            "archive_url": reverse("home_submission_archive"),
+        })
+        return context
+
+    def export_csv(self):
+        query, since, until = self.get_search()
+        labels = self.get_field_labels()
+        fieldnames = ["id", "page_id", "submit_time"] + list(labels)
+
+        def rows():
+            writer = csv.DictWriter(Echo(), fieldnames=fieldnames, extrasaction="ignore")
+            yield writer.writerow({"id": "Submission id", "page_id": "Page id", "submit_time": "Submission date", **labels})
+            for index, row in search_archives(self.get_indexes(), query, since, until):
+                yield writer.writerow({
+                    **row["form_data"],
+                    "id": row["id"],
+                    "page_id": index.page_id,
+                    "submit_time": row["submit_time"].isoformat(),
+                })
+
+        response = StreamingHttpResponse(rows(), content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="submission-archive-{timezone.localdate():%Y-%m-%d}.csv"'
+        return response
+
+
+class CircuitBreakerView(WagtailAdminTemplateMixin, TemplateView):
+    """
+    State, counters and recent transitions of the Mailtrap and Zapier circuit
+    breakers (home/circuit.py). ``?format=json`` returns the same data (for
+    scrapers without an admin session, see ``home.views.circuit_breaker_metrics``);
+    POST ``reset`` closes a breaker by hand.
+    """
+    template_name = "home/admin/circuit_breakers.html"
+    page_title = "Circuit breakers"
+    header_icon = "warning"
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_superuser:
+            raise PermissionDenied
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_breadcrumbs_items(self):
+        return self.breadcrumbs_items + [{"url": "", "label": self.page_title}]
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("format") == "json":
+            return JsonResponse({"breakers": [breaker.get_status() for breaker in breakers]})
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        for breaker in breakers:
+            if breaker.name == request.POST.get("reset"):
+                breaker.reset()
+                messages.success(request, f"The {breaker.name} circuit breaker has been closed.")
+        return redirect("home_circuit_breakers")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        statuses = [breaker.get_status() for breaker in breakers]
+        for status in statuses:
+            # Stored as epoch seconds so the JSON output stays plain numbers
+            status["opened_at"] = status["opened_at"] and datetime.datetime.fromtimestamp(status["opened_at"], datetime.timezone.utc)
+            for event in status["events"]:
+                event["time"] = datetime.datetime.fromtimestamp(event["time"], datetime.timezone.utc)
+        context.update({
+            "statuses": statuses,
+            "circuit_url": reverse("home_circuit_breakers"),
+        })
+        return context
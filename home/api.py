@@ -0,0 +1,251 @@
+"""
+Read-only JSON content API for the HomePage, for the mobile app and kiosk
+displays that used to scrape the HTML:
+
+    GET /api/v1/home/
+    GET /api/v1/home/?fields=reviews,contact
+
+The response holds the enabled sections in page order, hero, services,
+statistics, partners (with rendition URLs), reviews, contact details and the
+thank-you page settings; ``?fields=`` picks top-level keys.
+
+Rendered responses are cached per host and field selection. The cache key
+carries a generation that is bumped when a page is published, unpublished or
+deleted (``home.signals``) and the generation of this worker's showcase
+snapshot (reviews, partners, images), which the body is built from - keying on
+the shared showcase generation instead would let a worker whose snapshot is
+not yet reloaded store old reviews under the new key. Page edits show up
+immediately, showcase edits within ``SHOWCASE_CHECK_INTERVAL``, and a poll
+between edits costs one cache read and no queries.
+
+Each response has a strong ETag (SHA-256 of the body), so a client polling
+with ``If-None-Match`` gets an empty 304 until something changes.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework import serializers
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from wagtail.models import Site
+from wagtail.rich_text import expand_db_html
+
+from .models import BrandPartner, GoogleReview, HomePage, StatisticItem, ThankYouPageSettings, USPFeature
+from .showcase import showcase
+
+GENERATION_KEY = "home:api:generation"
+CACHE_KEY = "home:api:home:{host}:{generation}:{showcase}:{fields}"
+
+PARTNER_RENDITION = "max-400x200"
+AVATAR_RENDITION = "fill-96x96"
+
+
+def get_rendition_data(image, spec, request):
+    if image is None:
+        return None
+    rendition = image.get_rendition(spec)
+    return {
+        "url": request.build_absolute_uri(rendition.url),
+        "width": rendition.width,
+        "height": rendition.height,
+    }
+
+
+class USPFeatureSerializer(serializers.ModelSerializer):
+    icon = serializers.CharField(source="icon_class")
+
+    class Meta:
+        model = USPFeature
+        fields = ["icon", "title", "description"]
+
+
+class StatisticItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StatisticItem
+        fields = ["number", "label"]
+
+
+class BrandPartnerSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source="alt_text")
+    image = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BrandPartner
+        fields = ["id", "name", "image"]
+
+    def get_image(self, partner):
+        return get_rendition_data(partner.image, PARTNER_RENDITION, self.context["request"])
+
+
+class GoogleReviewSerializer(serializers.ModelSerializer):
+    text = serializers.CharField(source="review_text")
+    source = serializers.CharField(source="review_source")
+    date = serializers.DateTimeField(source="review_date")
+    avatar = serializers.SerializerMethodField()
+
+    class Meta:
+        model = GoogleReview
+        fields = ["id", "name", "rating", "text", "source", "date", "is_verified", "is_featured", "avatar_color", "avatar"]
+
+    def get_avatar(self, review):
+        return get_rendition_data(review.profile_picture, AVATAR_RENDITION, self.context["request"])
+
+
+class ThankYouPageSettingsSerializer(serializers.ModelSerializer):
+    title = serializers.CharField(source="thank_you_title")
+    message = serializers.CharField(source="thank_you_message")
+    info_box_content = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ThankYouPageSettings
+        fields = [
+            "title", "message", "show_info_box", "info_box_title", "info_box_content",
+            "home_button_text", "submit_another_button_text", "show_contact_section",
+            "contact_section_title", "phone_link_text", "whatsapp_link_text",
+        ]
+
+    def get_info_box_content(self, thank_you):
+        return expand_db_html(thank_you.info_box_content)
+
+
+class HomePageSerializer(serializers.ModelSerializer):
+    sections = serializers.SerializerMethodField()
+    hero = serializers.SerializerMethodField()
+    services = serializers.SerializerMethodField()
+    statistics = serializers.SerializerMethodField()
+    partners = serializers.SerializerMethodField()
+    reviews = serializers.SerializerMethodField()
+    contact = serializers.SerializerMethodField()
+    thank_you = serializers.SerializerMethodField()
+
+    class Meta:
+        model = HomePage
+        fields = ["id", "title", "sections", "hero", "services", "statistics", "partners", "reviews", "contact", "thank_you"]
+
+    def get_sections(self, page):
+        return [section.section_id for section in page.get_ordered_sections()]
+
+    def get_hero(self, page):
+        return {
+            "title": page.hero_title,
+            "description": expand_db_html(page.hero_description),
+            "form_title": page.form_title,
+            "form_subtitle": page.form_subtitle,
+        }
+
+    def get_services(self, page):
+        return {
+            "title": page.services_title,
+            "subtitle": page.services_subtitle,
+            "features": USPFeatureSerializer(page.usp_features.all(), many=True).data,
+        }
+
+    def get_statistics(self, page):
+        return {
+            "title": page.stats_title,
+            "subtitle": page.stats_subtitle,
+            "items": StatisticItemSerializer(page.statistics.all(), many=True).data,
+        }
+
+    def get_partners(self, page):
+        return {
+            "title": page.partners_title,
+            "subtitle": page.partners_subtitle,
+            "items": BrandPartnerSerializer(page.get_brand_partners(), many=True, context=self.context).data,
+        }
+
+    def get_reviews(self, page):
+        return {
+            "title": page.testimonials_title,
+            "subtitle": page.testimonials_subtitle,
+            "widget": {
+                "enabled": page.google_widget_enabled,
+                "rating": str(page.google_widget_rating),
+                "review_count": page.google_widget_review_count,
+                "url": page.google_widget_url,
+            },
+            "items": GoogleReviewSerializer(page.get_google_reviews(), many=True, context=self.context).data,
+        }
+
+    def get_contact(self, page):
+        return {
+            "company_name": page.company_name,
+            "phone_primary": page.phone_primary,
+            "phone_secondary": page.phone_secondary,
+            "whatsapp_number": page.whatsapp_number,
+            "whatsapp_message": page.whatsapp_message,
+            "facebook_url": page.facebook_url,
+            "address": {
+                "street": page.address_street,
+                "city": page.address_city,
+                "state": page.address_state,
+                "postcode": page.address_postcode,
+            },
+        }
+
+    def get_thank_you(self, page):
+        return ThankYouPageSettingsSerializer(page.get_thank_you_settings()).data
+
+
+class HomePageContentView(APIView):
+    """GET /api/v1/home/ - the live HomePage as compact JSON"""
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    renderer_classes = [JSONRenderer]
+
+    def get(self, request):
+        fields = self.get_fields(request)
+        unknown = [field for field in fields if field not in HomePageSerializer.Meta.fields]
+        if unknown:
+            return Response({"detail": f"Unknown fields: {', '.join(unknown)}"}, status=400)
+
+        key = self.get_cache_key(request, fields)
+        cached = cache.get(key)
+        if cached is None:
+            page = self.get_page(request)
+            if page is None:
+                return Response({"detail": "No published home page"}, status=404)
+            cached = self.render_content(request, page, fields)
+            cache.set(key, cached, getattr(settings, "CONTENT_API_CACHE_TIMEOUT", 86400))
+        content, etag = cached
+
+        response = HttpResponse(content, content_type="application/json")
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=getattr(settings, "CONTENT_API_MAX_AGE", 60))
+        return get_conditional_response(request, etag=etag, response=response)
+
+    def get_fields(self, request):
+        return sorted({field.strip() for field in request.GET.get("fields", "").split(",") if field.strip()})
+
+    def get_page(self, request):
+        """Return the live, public HomePage at the root of the request's site, or None"""
+        site = Site.find_for_request(request)
+        if site is None:
+            return None
+        page = site.root_page.specific
+        if not isinstance(page, HomePage) or not page.live or page.get_view_restrictions().exists():
+            return None
+        return page
+
+    def get_cache_key(self, request, fields):
+        showcase.refresh()
+        return CACHE_KEY.format(
+            host=request.get_host(),
+            generation=cache.get(GENERATION_KEY, 0),
+            showcase=showcase.generation,
+            fields=",".join(fields) or "*",
+        )
+
+    def render_content(self, request, page, fields):
+        """Return (body, etag) for ``page``"""
+        data = HomePageSerializer(page, context={"request": request}).data
+        if fields:
+            data = {field: data[field] for field in fields}
+        content = JSONRenderer().render(data)
+        return content, f'"{hashlib.sha256(content).hexdigest()}"'
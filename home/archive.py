@@ -0,0 +1,151 @@
+"""
+Cold storage for old form submissions.
+
+``archive_submissions`` moves FormSubmission rows older than a cut-off into
+append-only monthly files, one per form page and month:
+
+    SUBMISSION_ARCHIVE_DIR/<page id>/<YYYY-MM>.jsonl.gz
+
+Each run appends a new gzip member holding one JSON object per line
+({"id", "submit_time", "form_data"}), so existing data is never rewritten.
+``SubmissionArchive`` is the small index over those files (row count, time
+range, size) used by the admin to find, search, export and restore a month.
+
+Rows are deleted from the database only after their lines have been written
+and flushed to disk; if a run is interrupted in between, the rows are archived
+again by the next run and readers skip ids they have already seen.
+"""
+import gzip
+import json
+import os
+from itertools import groupby
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .rollups import keep_rollups
+
+
+def get_archive_dir():
+    return getattr(settings, "SUBMISSION_ARCHIVE_DIR", os.path.join(settings.BASE_DIR, "archive", "submissions"))
+
+
+def get_archive_path(page_id, month):
+    return os.path.join(get_archive_dir(), str(page_id), f"{month:%Y-%m}.jsonl.gz")
+
+
+def month_of(submit_time):
+    return timezone.localtime(submit_time).date().replace(day=1)
+
+
+def append_rows(path, submissions):
+    """Append ``submissions`` to the gzip JSONL file at ``path`` as a new gzip member"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+            for submission in submissions:
+                line = json.dumps(
+                    {
+                        "id": submission.pk,
+                        "submit_time": submission.submit_time.isoformat(),
+                        "form_data": submission.form_data,
+                    },
+                    separators=(",", ":"),
+                    cls=DjangoJSONEncoder,
+                )
+                archive.write(line.encode("utf-8") + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def iter_archived(path):
+    """Yield the archived submissions in the file at ``path`` as dicts, skipping repeated ids"""
+    if not os.path.exists(path):
+        return
+    seen = set()
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            row = json.loads(line)
+            if row["id"] in seen:
+                continue
+            seen.add(row["id"])
+            row["submit_time"] = parse_datetime(row["submit_time"])
+            yield row
+
+
+def archive_submissions(before, batch_size=500, stdout=None):
+    """
+    Move every submission with ``submit_time < before`` into the monthly
+    archives. Returns the number of rows archived.
+    """
+    from wagtail.contrib.forms.models import FormSubmission
+
+    from .models import SubmissionArchive
+
+    archived = 0
+    while True:
+        batch = list(
+            FormSubmission.objects.filter(submit_time__lt=before).order_by("page_id", "submit_time", "pk")[:batch_size]
+        )
+        if not batch:
+            return archived
+        groups = groupby(batch, key=lambda submission: (submission.page_id, month_of(submission.submit_time)))
+        for (page_id, month), rows in groups:
+            rows = list(rows)
+            path = get_archive_path(page_id, month)
+            append_rows(path, rows)
+            with transaction.atomic():
+                index, _ = SubmissionArchive.objects.select_for_update().get_or_create(
+                    page_id=page_id,
+                    month=month,
+                    defaults={"path": os.path.relpath(path, get_archive_dir())},
+                )
+                index.add_rows(rows, os.path.getsize(path))
+                with keep_rollups():
+                    FormSubmission.objects.filter(pk__in=[row.pk for row in rows]).delete()
+            archived += len(rows)
+            if stdout:
+                stdout.write(f"  {month:%Y-%m} page {page_id}: {len(rows)} rows")
+
+
+def restore_archive(index):
+    """Move the submissions of one archived month back into FormSubmission and drop the archive"""
+    from wagtail.contrib.forms.models import FormSubmission
+
+    rows = list(iter_archived(index.get_path()))
+    submissions = [
+        FormSubmission(pk=row["id"], page_id=index.page_id, form_data=row["form_data"], submit_time=row["submit_time"])
+        for row in rows
+    ]
+    with transaction.atomic():
+        FormSubmission.objects.bulk_create(submissions, batch_size=500, ignore_conflicts=True)
+        # submit_time is auto_now_add, so bulk_create overwrote it; put the original times back
+        for submission, row in zip(submissions, rows):
+            submission.submit_time = row["submit_time"]
+        FormSubmission.objects.bulk_update(submissions, ["submit_time"], batch_size=500)
+        index.delete()
+    os.remove(index.get_path())
+    return len(submissions)
+
+
+def search_archives(indexes, query="", since=None, until=None):
+    """
+    Yield (index, row) for archived submissions in ``indexes`` whose form data
+    contains ``query`` (case-insensitive) and whose submit time is in range.
+    The index narrows the files that are opened; each file is streamed.
+    """
+    query = query.casefold()
+    if since:
+        indexes = indexes.filter(last_submit_time__gte=since)
+    if until:
+        indexes = indexes.filter(first_submit_time__lt=until)
+    for index in indexes:
+        for row in iter_archived(index.get_path()):
+            if since and row["submit_time"] < since or until and row["submit_time"] >= until:
+                continue
+            if query and not any(query in str(value).casefold() for value in row["form_data"].values()):
+                continue
+            yield index, row
@@ -1,6 +1,8 @@
 from wagtail import blocks
 from wagtail.images.blocks import ImageChooserBlock
 
+from .script_loader import CRITICAL, IDLE, LOADING_CHOICES
+
 class CallToActionBlock(blocks.StructBlock):
     button_text = blocks.CharBlock(max_length=50)
     button_redirect = blocks.ChoiceBlock(
@@ -33,3 +35,26 @@ class CallToActionBlock(blocks.StructBlock):
         icon = 'pick'
         label = 'Call to Action'
 
+
+
+class EmbedHTMLBlock(blocks.StructBlock):
+    html = blocks.RawHTMLBlock()
+    loading = blocks.ChoiceBlock(choices=LOADING_CHOICES, default=IDLE,
+                                 help_text="When scripts in this HTML run (see home/script_loader.py)")
+
+    def to_python(self, value):
+        return super().to_python(self.upgrade(value))
+
+    def bulk_to_python(self, values):
+        return super().bulk_to_python([self.upgrade(value) for value in values])
+
+    def upgrade(self, value):
+        if isinstance(value, str):
+            # Stored as a plain RawHTMLBlock, before the loading mode existed
+            return {"html": value, "loading": CRITICAL}
+        return value
+
+    class Meta:
+        template = 'blocks/embed_html.html'
+        icon = 'code'
+        label = 'HTML'
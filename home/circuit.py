@@ -0,0 +1,151 @@
+"""
+Circuit breakers around the Mailtrap, Zapier and SMTP calls.
+
+Each provider has one ``CircuitBreaker`` whose state lives in the shared cache,
+so every worker sees the same state:
+
+closed     calls go through; failures within ``failure_window`` seconds are
+           counted and ``failure_threshold`` of them open the circuit.
+open       calls fail fast with ``CircuitOpenError`` for ``reset_timeout``
+           seconds - callers hand the work to their retry path (the pending
+           notification queue, failed webhook deliveries) instead of waiting
+           for a timeout.
+half-open  after ``reset_timeout`` one probe call at a time is let through;
+           success closes the circuit, failure re-opens it.
+
+Per-outcome counters and the most recent transitions are kept in the cache as
+well and shown under Reports -> Circuit breakers; monitors and metrics scrapers
+read the same data from ``/metrics/circuit-breakers/`` with the
+``CIRCUIT_METRICS_TOKEN`` bearer token.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+DEFAULTS = {
+    "failure_threshold": 5,
+    "failure_window": 120,
+    "reset_timeout": 60,
+}
+
+# Outcomes counted for metrics
+OUTCOMES = ("success", "failure", "rejected")
+MAX_EVENTS = 20
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, name):
+        self.name = name
+        self.prefix = f"home:circuit:{name}"
+
+    def get_option(self, option):
+        return getattr(settings, "CIRCUIT_BREAKERS", {}).get(self.name, {}).get(option, DEFAULTS[option])
+
+    @property
+    def state(self):
+        opened_at = cache.get(f"{self.prefix}:opened-at")
+        if opened_at is None:
+            return CLOSED
+        if time.time() - opened_at < self.get_option("reset_timeout"):
+            return OPEN
+        return HALF_OPEN
+
+    def allow(self):
+        """Return True if a call may go ahead; in half-open state only one probe at a time may"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and cache.add(f"{self.prefix}:probe", 1, self.get_option("reset_timeout")):
+            return True
+        self.count("rejected")
+        return False
+
+    def record_success(self):
+        self.count("success")
+        if cache.get(f"{self.prefix}:opened-at") is not None:
+            cache.delete_many([f"{self.prefix}:opened-at", f"{self.prefix}:probe", f"{self.prefix}:failures"])
+            self.add_event(CLOSED, "probe succeeded")
+        elif cache.get(f"{self.prefix}:failures"):
+            cache.delete(f"{self.prefix}:failures")
+
+    def record_failure(self, error=None):
+        self.count("failure")
+        reason = str(error)[:200] if error else ""
+        if self.state == HALF_OPEN:
+            self.open(f"probe failed: {reason}")
+            return
+        key = f"{self.prefix}:failures"
+        cache.add(key, 0, self.get_option("failure_window"))
+        try:
+            failures = cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, self.get_option("failure_window"))
+            failures = 1
+        if failures >= self.get_option("failure_threshold") and self.state == CLOSED:
+            self.open(f"{failures} failures: {reason}")
+
+    def open(self, reason):
+        cache.set(f"{self.prefix}:opened-at", time.time(), None)
+        cache.delete(f"{self.prefix}:probe")
+        self.add_event(OPEN, reason)
+
+    def reset(self):
+        cache.delete_many([f"{self.prefix}:opened-at", f"{self.prefix}:probe", f"{self.prefix}:failures"])
+        self.add_event(CLOSED, "reset from admin")
+
+    def call(self, func, *args, **kwargs):
+        """Run ``func`` through the breaker; raises CircuitOpenError without calling it when open"""
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is {self.state}; not calling the provider")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def count(self, outcome):
+        key = f"{self.prefix}:count:{outcome}"
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+    def add_event(self, state, reason):
+        logger.warning("Circuit breaker %s -> %s (%s)", self.name, state, reason)
+        events = cache.get(f"{self.prefix}:events", [])
+        events = [{"time": time.time(), "state": state, "reason": reason}] + events[:MAX_EVENTS - 1]
+        cache.set(f"{self.prefix}:events", events, None)
+
+    def get_status(self):
+        opened_at = cache.get(f"{self.prefix}:opened-at")
+        return {
+            "name": self.name,
+            "state": self.state,
+            "opened_at": opened_at,
+            "failures": cache.get(f"{self.prefix}:failures", 0),
+            "counts": {outcome: cache.get(f"{self.prefix}:count:{outcome}", 0) for outcome in OUTCOMES},
+            "events": cache.get(f"{self.prefix}:events", []),
+            "options": {option: self.get_option(option) for option in DEFAULTS},
+        }
+
+
+mailtrap_breaker = CircuitBreaker("mailtrap")
+zapier_breaker = CircuitBreaker("zapier")
+# Notification emails sent through EMAIL_BACKEND (NOTIFICATION_EMAIL_TRANSPORT = "smtp")
+smtp_breaker = CircuitBreaker("smtp")
+
+breakers = [mailtrap_breaker, zapier_breaker, smtp_breaker]
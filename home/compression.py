@@ -0,0 +1,190 @@
+"""
+Response compression with cached encoded variants.
+
+``home.middleware.CompressionMiddleware`` compresses text responses (HTML,
+CSS, JavaScript, JSON, XML, SVG) with the best encoding the client accepts:
+Brotli when the ``brotli`` package is installed, Zstandard when ``zstandard``
+is, and gzip.
+
+Responses that are publicly cacheable and carry a strong ETag - homepage
+section fragments, the content API - are the same bytes for every visitor, so
+each encoding is produced once, at the highest level, and kept in the Django
+cache under the URL and ETag; later requests are a cache lookup instead of a
+recompression. Everything else (pages with a per-visitor CSRF token, the admin)
+is compressed per request at a fast level and padded with a random number of
+bytes against BREACH: gzip through Django's random-length file name header,
+Zstandard with a skippable frame. Brotli has no such field, so it is only used
+for shared responses.
+
+A compressed response keeps a strong ETag that names its encoding
+(``"<etag>-br"``), since its bytes differ from the identity response. The suffix
+is taken off ``If-None-Match`` before the view compares ETags, and put back on
+the ETag of the 304 it answers with.
+"""
+import gzip
+import hashlib
+import secrets
+import struct
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Server preference, used when the client weights several encodings equally
+PREFERENCE = ["br", "zstd", "gzip"]
+# Encodings whose output can be padded to a random length (per-visitor responses)
+PADDED_ENCODINGS = ["zstd", "gzip"]
+MAX_RANDOM_BYTES = 100
+
+# First magic number of a Zstandard skippable frame, which decoders ignore
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/manifest+json",
+    "image/svg+xml",
+)
+
+VARIANT_KEY = "home:compressed:{encoding}:{digest}"
+
+
+def encode_etag(etag, encoding):
+    """Return the ETag of the ``encoding`` variant of a response with ``etag``"""
+    if not etag.startswith('"'):
+        # Weak ETags may be shared by equivalent representations
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def strip_etag_encodings(header):
+    """
+    Return (header, variants): ``header`` (If-None-Match) with the encoding
+    suffixes of our ETags removed, and {plain ETag: encoded ETag} for them
+    """
+    variants = {}
+    etags = []
+    for etag in header.split(","):
+        etag = etag.strip()
+        for encoding in PREFERENCE:
+            suffix = f'-{encoding}"'
+            if etag.startswith('"') and etag.endswith(suffix):
+                plain = etag[:-len(suffix)] + '"'
+                variants[plain] = etag
+                etag = plain
+                break
+        etags.append(etag)
+    return ", ".join(etags), variants
+
+
+def get_available_encodings():
+    available = {"br": brotli is not None, "zstd": zstandard is not None, "gzip": True}
+    return [encoding for encoding in PREFERENCE if available[encoding]]
+
+
+def parse_accept_encoding(header):
+    """Return {coding: q} for an Accept-Encoding header"""
+    codings = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def choose_encoding(header, encodings=None):
+    """
+    Return the encoding to use for ``header`` (Accept-Encoding), out of
+    ``encodings`` if given, or None to send the body as is
+    """
+    codings = parse_accept_encoding(header)
+    candidates = []
+    for rank, encoding in enumerate(get_available_encodings()):
+        if encodings is not None and encoding not in encodings:
+            continue
+        q = codings.get(encoding, codings.get("*", 0.0))
+        if q > 0:
+            candidates.append((-q, rank, encoding))
+    return min(candidates)[2] if candidates else None
+
+
+def get_padding_frame():
+    """Return a Zstandard skippable frame of random length"""
+    size = secrets.randbelow(MAX_RANDOM_BYTES + 1)
+    return struct.pack("<II", ZSTD_SKIPPABLE_MAGIC, size) + bytes(size)
+
+
+def encode(content, encoding, best=False):
+    """
+    Encode ``content``: at the highest level for cached shared variants (best),
+    else at a fast level with random-length padding (not for Brotli)
+    """
+    if encoding == "br":
+        return brotli.compress(content, quality=11 if best else 5)
+    if encoding == "zstd":
+        if best:
+            return zstandard.ZstdCompressor(level=19).compress(content)
+        return zstandard.ZstdCompressor(level=3).compress(content) + get_padding_frame()
+    if best:
+        # mtime=0 keeps the cached variant identical for identical content
+        return gzip.compress(content, compresslevel=9, mtime=0)
+    return compress_string(content, max_random_bytes=MAX_RANDOM_BYTES)
+
+
+def is_compressible(response):
+    content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+    if not content_type.startswith(COMPRESSIBLE_TYPES):
+        return False
+    return len(response.content) >= getattr(settings, "COMPRESSION_MIN_SIZE", 512)
+
+
+def is_shared(response):
+    """True if ``response`` is the same for every visitor: public, strong ETag, no cookies"""
+    directives = {directive.strip().split("=")[0].lower() for directive in response.get("Cache-Control", "").split(",")}
+    if "public" not in directives or directives & {"private", "no-store", "no-cache"}:
+        return False
+    return response.get("ETag", "").startswith('"') and not response.cookies
+
+
+def get_variant_key(request, etag, encoding):
+    digest = hashlib.sha256(f"{request.get_host()}\n{request.get_full_path()}\n{etag}".encode()).hexdigest()
+    return VARIANT_KEY.format(encoding=encoding, digest=digest)
+
+
+def compress_response(request, response, encoding):
+    """
+    Return the body of ``response`` encoded with ``encoding``, or None when
+    that would not make it smaller. Shared responses are encoded once and
+    cached per ETag.
+    """
+    if is_shared(response):
+        key = get_variant_key(request, response["ETag"], encoding)
+        content = cache.get(key)
+        if content is None:
+            content = encode(response.content, encoding, best=True)
+            cache.set(key, content, getattr(settings, "COMPRESSION_CACHE_TIMEOUT", 86400))
+    else:
+        content = encode(response.content, encoding)
+    return content if len(content) < len(response.content) else None
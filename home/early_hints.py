@@ -0,0 +1,107 @@
+"""
+Preload and preconnect hints for the critical assets of the homepage.
+
+The browser only discovers ``style.css``, the Inter font stylesheet, Font
+Awesome and the hero background (an inline ``style`` attribute) once it has
+parsed that far into the HTML. ``home.middleware.EarlyHintsMiddleware`` lists
+them up front as ``Link`` headers:
+
+    <https://fonts.gstatic.com>; rel=preconnect; crossorigin
+    </static/css/style.css>; rel=preload; as=style
+    </media/original_images/...jpg>; rel=preload; as=image; fetchpriority=high
+
+The set for a page is computed once per live revision (and showcase
+generation, as replacing an image changes its rendition URL) and cached.
+
+When the WSGI server offers ``wsgi.early_hints`` (gunicorn 22+, granian), the
+hints last sent for a path are also sent as a ``103 Early Hints`` response
+before the view runs, so the browser starts fetching while the page renders.
+That per-path set is keyed by the known-routes generation, which changes when
+a page is published, unpublished or moved, and by the showcase generation.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.templatetags.static import static
+
+from .routes import known_routes
+from .showcase import showcase
+
+# Rendered as <link> tags by home/home_page.html and sent as Link headers
+CRITICAL_ASSETS = [
+    {"rel": "preconnect", "href": "https://fonts.googleapis.com"},
+    {"rel": "preconnect", "href": "https://fonts.gstatic.com", "crossorigin": True},
+    {"rel": "preconnect", "href": "https://cdnjs.cloudflare.com"},
+    {"rel": "stylesheet", "href": "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap"},
+    {"rel": "stylesheet", "href": "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css"},
+    {"rel": "stylesheet", "static": "css/style.css"},
+]
+HERO_RENDITION = "original"
+
+LINKS_KEY = "home:early-hints:page:{page_id}:{revision}:{showcase}"
+PATH_KEY = "home:early-hints:path:{generation}:{showcase}:{host}:{path}"
+
+
+def get_timeout():
+    return getattr(settings, "EARLY_HINTS_CACHE_TIMEOUT", 86400)
+
+
+def get_critical_assets():
+    """``CRITICAL_ASSETS`` with ``static`` paths resolved to ``href``"""
+    return [
+        {"href": static(asset["static"]), **asset} if "static" in asset else asset
+        for asset in CRITICAL_ASSETS
+    ]
+
+
+def get_asset_links():
+    """Hints for the assets every homepage uses"""
+    links = []
+    for asset in get_critical_assets():
+        if asset["rel"] == "preconnect":
+            links.append(f"<{asset['href']}>; rel=preconnect" + ("; crossorigin" if asset.get("crossorigin") else ""))
+        else:
+            links.append(f"<{asset['href']}>; rel=preload; as=style")
+    return links
+
+
+def get_hero_links(page):
+    """Hint for the hero background, when the hero section is shown"""
+    image = page.hero_background_image
+    if image is None or not page.get_ordered_sections().filter(section_id="hero").exists():
+        return []
+    rendition = image.get_rendition(HERO_RENDITION)
+    return [f"<{rendition.url}>; rel=preload; as=image; fetchpriority=high"]
+
+
+def get_page_links(page):
+    """Return the Link header values for ``page``, cached per live revision"""
+    key = LINKS_KEY.format(
+        page_id=page.pk,
+        revision=page.live_revision_id,
+        showcase=cache.get(showcase.generation_key, 0),
+    )
+    hero_links = cache.get(key)
+    if hero_links is None:
+        hero_links = get_hero_links(page)
+        cache.set(key, hero_links, get_timeout())
+    # Static URLs change with each deploy's manifest, not with the revision
+    return get_asset_links() + hero_links
+
+
+def get_path_key(request):
+    known_routes.refresh()
+    return PATH_KEY.format(
+        generation=known_routes.generation,
+        showcase=cache.get(showcase.generation_key, 0),
+        host=request.get_host(),
+        path=request.path,
+    )
+
+
+def get_path_links(request):
+    """Return the hints last computed for this path, or None"""
+    return cache.get(get_path_key(request))
+
+
+def remember_path_links(request, links):
+    cache.set(get_path_key(request), links, get_timeout())
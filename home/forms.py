@@ -0,0 +1,87 @@
+"""
+Per-worker cache of compiled form definitions for Wagtail form pages.
+
+Building a form page's Django form means querying ``form_fields`` and running
+the FormBuilder to create a new form class. ``CachedFormMixin`` does that once
+per page revision and keeps the result in process memory, so rendering and
+validating the form - and mapping ``clean_name`` to ``label`` for emails and
+webhooks - no longer touch the database.
+
+The cache key is the page's live revision (id and publish time), so publishing
+a new revision naturally switches to a freshly built form. Page instances whose
+form fields are held in memory (previews, unsaved revisions) bypass the cache.
+
+``StreamingExportMixin`` swaps in the batched submissions export from
+``home.exports``.
+"""
+import threading
+
+
+class CompiledForm:
+    def __init__(self, fields, form_class):
+        self.fields = fields
+        self.form_class = form_class
+        # [(clean_name, label), ...] in display order
+        self.label_map = [(field.clean_name, field.label) for field in fields]
+
+
+_compiled_forms = {}
+_lock = threading.Lock()
+
+
+class CachedFormMixin:
+    """Mixin for ``AbstractForm`` subclasses with a ``form_fields`` child relation"""
+
+    def _get_form_cache_key(self):
+        # modelcluster keeps unsaved child objects in _cluster_related_objects;
+        # those must not be served from (or stored in) the cache.
+        if self.pk is None or "form_fields" in getattr(self, "_cluster_related_objects", {}):
+            return None
+        # The timestamp guards against revision ids being reused after a
+        # rollback (e.g. between test cases) while this worker stays alive.
+        if self.live_revision_id:
+            return (self.live_revision_id, self.last_published_at)
+        if self.latest_revision_id:
+            return (self.latest_revision_id, self.latest_revision_created_at)
+        return None
+
+    def get_compiled_form(self):
+        revision_id = self._get_form_cache_key()
+        if revision_id is not None:
+            cached = _compiled_forms.get(self.pk)
+            if cached is not None and cached[0] == revision_id:
+                return cached[1]
+
+        fields = list(super().get_form_fields())
+        compiled = CompiledForm(fields, self.form_builder(fields).get_form_class())
+        if revision_id is not None:
+            with _lock:
+                # Only the current revision is kept per page
+                _compiled_forms[self.pk] = (revision_id, compiled)
+        return compiled
+
+    def get_form_fields(self):
+        return self.get_compiled_form().fields
+
+    def get_form_class(self):
+        return self.get_compiled_form().form_class
+
+    def get_field_label_map(self):
+        """Return [(clean_name, label), ...] for the page's form fields"""
+        return self.get_compiled_form().label_map
+
+    def get_labelled_form_data(self, form):
+        """Return {label: value} for the submitted ``form``, in field order"""
+        return {
+            label: form.cleaned_data.get(clean_name, '')
+            for clean_name, label in self.get_field_label_map()
+        }
+
+
+class StreamingExportMixin:
+    """Mixin for ``AbstractForm`` subclasses: export submissions through ``home.exports``"""
+
+    def get_submissions_list_view_class(self):
+        from .exports import StreamingSubmissionsListView
+
+        return self.submissions_list_view_class or StreamingSubmissionsListView
@@ -0,0 +1,230 @@
+"""
+Upload-time optimisation of Wagtail image originals.
+
+Every rendition Wagtail generates starts by decoding the original, so a 4000px
+phone HEIC or a 1.8 MB RGBA PNG logo is paid for again with each new size.
+``optimize_image`` rewrites the original once, right after upload:
+
+- dimensions are capped at ``IMAGE_OPTIMIZE_MAX_SIZE`` pixels on the long side
+  (the focal point is scaled along);
+- EXIF orientation is applied (the focal point is rotated along) and all
+  metadata (EXIF, GPS, XMP) is dropped; a JPEG that only carries metadata has
+  those segments cut out without re-encoding, so no quality is lost;
+- HEIC photos and PNG photos become ``IMAGE_OPTIMIZE_PHOTO_FORMAT`` (WebP by
+  default, or JPEG) at ``IMAGE_OPTIMIZE_QUALITY``;
+- flat PNG graphics such as brand logos (at most 256 colours) are quantised
+  to palette PNGs, keeping transparency.
+
+The result only replaces the original when it is smaller, or when the image
+had to be resized, converted or stripped of metadata; old renditions are
+dropped. An image that is
+already optimised is recognised from its header alone, so re-running is cheap.
+
+``home.signals`` enqueues ``home.tasks.optimize_image_task`` after an image is
+uploaded or its file replaced (``IMAGE_OPTIMIZE_ON_UPLOAD``); ``manage.py optimize_images`` processes
+existing images and reports the bytes saved per image.
+"""
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+# Images with more colours than this are treated as photos
+MAX_LOGO_COLOURS = 256
+
+FORMAT_EXTENSIONS = {"WEBP": ".webp", "JPEG": ".jpg", "PNG": ".png"}
+
+EXIF_ORIENTATION = 0x0112
+# Orientations that swap width and height
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+# JPEG segments that only hold metadata: EXIF/XMP (APP1), IPTC (APP13), comments
+JPEG_METADATA_MARKERS = (0xE1, 0xED, 0xFE)
+JPEG_START_OF_SCAN = 0xDA
+
+
+def get_max_size():
+    return getattr(settings, "IMAGE_OPTIMIZE_MAX_SIZE", 2560)
+
+
+def get_photo_format():
+    return getattr(settings, "IMAGE_OPTIMIZE_PHOTO_FORMAT", "webp").upper()
+
+
+def open_original(data):
+    from PIL import Image as PILImage
+
+    try:
+        from pillow_heif import register_heif_opener
+
+        register_heif_opener()
+    except ImportError:
+        pass
+    return PILImage.open(BytesIO(data))
+
+
+def needs_work(pil_image):
+    """Decide from the header alone whether the original could be improved"""
+    if pil_image.format == "GIF":
+        # Animated GIFs would lose their frames
+        return False
+    if max(pil_image.size) > get_max_size():
+        return True
+    if pil_image.format in ("HEIF", "HEIC", "MPO", "TIFF", "BMP"):
+        return True
+    if pil_image.format == "PNG":
+        return pil_image.mode != "P"
+    return has_metadata(pil_image)
+
+
+def get_orientation(pil_image):
+    return pil_image.getexif().get(EXIF_ORIENTATION, 1)
+
+
+def transpose_focal_point(x, y, width, height, orientation, size):
+    """
+    Map a focal point (centre x/y and width/height, in pixels) of an image of
+    ``size`` through the transform ``ImageOps.exif_transpose`` applies for
+    ``orientation``
+    """
+    image_width, image_height = size
+    if orientation in (2, 3):
+        x = image_width - x
+    if orientation in (3, 4):
+        y = image_height - y
+    if orientation == 5:
+        x, y = y, x
+    elif orientation == 6:
+        x, y = image_height - y, x
+    elif orientation == 7:
+        x, y = image_height - y, image_width - x
+    elif orientation == 8:
+        x, y = y, image_width - x
+    if orientation in TRANSPOSED_ORIENTATIONS:
+        width, height = height, width
+    return x, y, width, height
+
+
+def strip_jpeg_metadata(data):
+    """
+    Return the JPEG ``data`` without its metadata segments, leaving the
+    compressed image untouched, or None if the file cannot be parsed
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+    output = bytearray(data[:2])
+    position = 2
+    while position + 4 <= len(data):
+        if data[position] != 0xFF:
+            return None
+        marker = data[position + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            position += 1
+            continue
+        if marker == JPEG_START_OF_SCAN:
+            output += data[position:]
+            return bytes(output)
+        end = position + 2 + int.from_bytes(data[position + 2:position + 4], "big")
+        if marker not in JPEG_METADATA_MARKERS:
+            output += data[position:end]
+        position = end
+    return None
+
+
+def is_flat_graphic(pil_image):
+    return pil_image.getcolors(maxcolors=MAX_LOGO_COLOURS) is not None
+
+
+def has_metadata(pil_image):
+    return bool(pil_image.info.get("exif") or pil_image.info.get("xmp") or pil_image.getexif())
+
+
+def encode(pil_image, source_format):
+    """Return (bytes, format, (width, height)) for the optimised version of ``pil_image``"""
+    from PIL import Image as PILImage, ImageOps
+
+    quality = getattr(settings, "IMAGE_OPTIMIZE_QUALITY", 85)
+    pil_image = ImageOps.exif_transpose(pil_image)
+    max_size = get_max_size()
+    if max(pil_image.size) > max_size:
+        pil_image.thumbnail((max_size, max_size), PILImage.LANCZOS)
+
+    output = BytesIO()
+    if source_format == "PNG" and is_flat_graphic(pil_image.convert("RGBA")):
+        quantised = pil_image.convert("RGBA").quantize(colors=MAX_LOGO_COLOURS, method=PILImage.Quantize.FASTOCTREE)
+        quantised.save(output, "PNG", optimize=True)
+        return output.getvalue(), "PNG", pil_image.size
+
+    target = source_format if source_format in ("JPEG", "WEBP") else get_photo_format()
+    if target == "JPEG":
+        pil_image.convert("RGB").save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        has_alpha = pil_image.mode in ("RGBA", "LA") or "transparency" in pil_image.info
+        pil_image.convert("RGBA" if has_alpha else "RGB").save(output, "WEBP", quality=quality, method=6)
+    return output.getvalue(), target, pil_image.size
+
+
+def optimize_image(image, dry_run=False):
+    """
+    Optimise the original of ``image`` in place. Returns (old_size, new_size)
+    in bytes, or None if the original was left unchanged.
+    """
+    from wagtail.images import get_image_model
+
+    with image.open_file() as f:
+        data = f.read()
+    pil_image = open_original(data)
+    if not needs_work(pil_image):
+        return None
+
+    source_format = pil_image.format
+    original_size = image.width, image.height
+    orientation = get_orientation(pil_image)
+    stripped = has_metadata(pil_image)
+    new_data = None
+    if source_format == "JPEG" and orientation == 1 and max(pil_image.size) <= get_max_size():
+        # Only metadata to drop: cut it out rather than re-encode
+        new_data = strip_jpeg_metadata(data)
+        new_format, (width, height) = "JPEG", pil_image.size
+    if new_data is None:
+        new_data, new_format, (width, height) = encode(pil_image, source_format)
+    converted = FORMAT_EXTENSIONS.get(source_format) != FORMAT_EXTENSIONS[new_format]
+    changed_shape = (width, height) != original_size
+    if len(new_data) >= len(data) and not (converted or changed_shape or stripped):
+        return None
+    if dry_run:
+        return len(data), len(new_data)
+
+    old_name = image.file.name
+    stem = os.path.splitext(os.path.basename(old_name))[0]
+    # Assigning the file resets width and height; they are set again below
+    image.file.save(stem + FORMAT_EXTENSIONS[new_format], ContentFile(new_data), save=False)
+
+    updates = {
+        "file": image.file.name,
+        "width": width,
+        "height": height,
+        "file_size": len(new_data),
+    }
+    image._set_file_hash()
+    updates["file_hash"] = image.file_hash
+    if image.focal_point_x is not None and (orientation != 1 or changed_shape):
+        focal_point = transpose_focal_point(
+            image.focal_point_x, image.focal_point_y, image.focal_point_width, image.focal_point_height,
+            orientation, original_size,
+        )
+        scale = max(width, height) / max(original_size)
+        for field, value in zip(("focal_point_x", "focal_point_y", "focal_point_width", "focal_point_height"), focal_point):
+            updates[field] = round(value * min(scale, 1))
+
+    # A queryset update, so the post_save hook does not run a second time
+    get_image_model().objects.filter(pk=image.pk).update(**updates)
+    for field, value in updates.items():
+        setattr(image, field, value)
+    for rendition in image.renditions.all():
+        rendition.delete()
+    if old_name != image.file.name:
+        image.file.storage.delete(old_name)
+    return len(data), len(new_data)
+
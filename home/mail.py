@@ -0,0 +1,140 @@
+"""
+Pooled SMTP email backend.
+
+Django's SMTP backend connects, does STARTTLS and logs in for every
+``send_mail()`` call. ``PooledSMTPBackend`` keeps authenticated connections
+open in a per-process pool shared by all threads, so consecutive sends - the
+notification emails, ContactPage's ``send_mail`` and anything else going
+through ``EMAIL_BACKEND`` - reuse one session and only pay the handshake once:
+
+    EMAIL_BACKEND = "home.mail.PooledSMTPBackend"
+
+A connection is checked out for a whole ``send_messages()`` call, so a batch of
+messages is sent back to back over a single session. A connection that was
+dropped by the server is replaced and the message resent once. Idle
+connections older than ``EMAIL_POOL_MAX_IDLE`` seconds are closed rather than
+reused (servers typically drop idle sessions after a minute or two), at most
+``EMAIL_POOL_SIZE`` idle connections are kept per server, and a session is
+retired after ``EMAIL_POOL_MAX_MESSAGES`` messages.
+"""
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail.backends.smtp import EmailBackend
+from django.core.mail.message import sanitize_address
+
+# Errors after which the message is worth resending on a fresh connection
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+_pool = {}
+_pool_lock = threading.Lock()
+
+
+def close_pooled_connections():
+    """Quit every idle pooled connection (tests, process shutdown)"""
+    with _pool_lock:
+        idle = [connection for connections in _pool.values() for connection, _ in connections]
+        _pool.clear()
+    for connection in idle:
+        quit_quietly(connection)
+
+
+def quit_quietly(connection):
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        connection.close()
+
+
+class PooledSMTPBackend(EmailBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_key = (self.host, self.port, self.username, self.use_tls, self.use_ssl)
+
+    def checkout(self):
+        """Return an idle pooled connection that is still fresh enough, or None"""
+        max_idle = getattr(settings, "EMAIL_POOL_MAX_IDLE", 60)
+        now = time.monotonic()
+        stale = []
+        connection = None
+        with _pool_lock:
+            connections = _pool.get(self.pool_key, [])
+            while connections:
+                candidate, released_at = connections.pop()
+                if now - released_at < max_idle:
+                    connection = candidate
+                    break
+                stale.append(candidate)
+        for candidate in stale:
+            quit_quietly(candidate)
+        return connection
+
+    def checkin(self, connection):
+        if getattr(connection, "messages_sent", 0) >= getattr(settings, "EMAIL_POOL_MAX_MESSAGES", 100):
+            quit_quietly(connection)
+            return
+        with _pool_lock:
+            connections = _pool.setdefault(self.pool_key, [])
+            if len(connections) < getattr(settings, "EMAIL_POOL_SIZE", 4):
+                connections.append((connection, time.monotonic()))
+                return
+        quit_quietly(connection)
+
+    def open(self):
+        if self.connection:
+            return False
+        self.connection = self.checkout()
+        if self.connection is not None:
+            # Report a new connection so send_messages() hands it back via close()
+            return True
+        opened = super().open()
+        if self.connection is not None:
+            self.connection.messages_sent = 0
+        return opened
+
+    def close(self):
+        """Return the connection to the pool instead of quitting it"""
+        if self.connection is None:
+            return
+        connection, self.connection = self.connection, None
+        self.checkin(connection)
+
+    def reconnect(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        super().open()
+        if self.connection is None:
+            # open() failed silently
+            raise smtplib.SMTPServerDisconnected(f"Could not reconnect to {self.host}:{self.port}")
+        self.connection.messages_sent = 0
+
+    def _send(self, email_message):
+        if not email_message.recipients():
+            return False
+        encoding = email_message.encoding or settings.DEFAULT_CHARSET
+        from_email = sanitize_address(email_message.from_email, encoding)
+        recipients = [sanitize_address(addr, encoding) for addr in email_message.recipients()]
+        message = email_message.message().as_bytes(linesep="\r\n")
+        try:
+            if self.connection is None:
+                # An earlier message in this batch broke the connection
+                self.reconnect()
+            try:
+                self.connection.sendmail(from_email, recipients, message)
+            except RECONNECT_ERRORS:
+                # The pooled session went away (server idle timeout, restart)
+                self.reconnect()
+                self.connection.sendmail(from_email, recipients, message)
+        except (smtplib.SMTPException, OSError):
+            if self.connection is not None:
+                # Don't return a connection in an unknown state to the pool
+                self.connection.close()
+                self.connection = None
+            if not self.fail_silently:
+                raise
+            return False
+        self.connection.messages_sent += 1
+        return True
@@ -0,0 +1,37 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from home.archive import archive_submissions, get_archive_dir, month_of
+
+
+class Command(BaseCommand):
+    help = "Move old form submissions into compressed monthly archive files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=getattr(settings, "SUBMISSION_ARCHIVE_AFTER_DAYS", 365),
+            help="Archive submissions older than this many days (rounded down to a month boundary)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Submissions moved per transaction")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many submissions would be archived")
+
+    def handle(self, *args, **options):
+        from wagtail.contrib.forms.models import FormSubmission
+
+        # Only archive whole months, so a month is never split between the
+        # hot table and its archive file.
+        cutoff = month_of(timezone.now() - datetime.timedelta(days=options["older_than"]))
+        before = timezone.make_aware(datetime.datetime.combine(cutoff, datetime.time.min))
+
+        pending = FormSubmission.objects.filter(submit_time__lt=before).count()
+        self.stdout.write(f"Submissions before {cutoff:%Y-%m}: {pending}")
+        if options["dry_run"] or not pending:
+            return
+
+        archived = archive_submissions(before, batch_size=options["batch_size"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} submissions to {get_archive_dir()}"))
@@ -0,0 +1,91 @@
+import json
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+# Runs in a fresh interpreter per sample: imports the WSGI module, serves one
+# request through it and reports timings, peak RSS and loaded module count.
+PROBE = r"""
+import io, json, os, resource, sys, time
+
+os.environ["DJANGO_SETTINGS_MODULE"] = {settings_module!r}
+os.environ.pop("DJANGO_ROOT_URLCONF", None)
+start = time.perf_counter()
+module = __import__({entrypoint!r}, fromlist=["application"])
+loaded = time.perf_counter()
+
+status = []
+environ = {{
+    "REQUEST_METHOD": "GET",
+    "PATH_INFO": {path!r},
+    "QUERY_STRING": "",
+    "SERVER_NAME": "localhost",
+    "SERVER_PORT": "80",
+    "SERVER_PROTOCOL": "HTTP/1.1",
+    "HTTP_HOST": "localhost",
+    "wsgi.input": io.BytesIO(),
+    "wsgi.errors": sys.stderr,
+    "wsgi.url_scheme": "http",
+}}
+body = b"".join(module.application(environ, lambda s, h, e=None: status.append(s)))
+served = time.perf_counter()
+
+print(json.dumps({{
+    "import": loaded - start,
+    "first_request": served - loaded,
+    "status": status[0].split()[0],
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare worker cold-start time and memory of the full and public WSGI entrypoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Cold starts per entrypoint (median is reported)")
+        parser.add_argument("--path", default="/", help="Path requested after import")
+        parser.add_argument(
+            "--entrypoint",
+            action="append",
+            dest="entrypoints",
+            help="WSGI module to benchmark (repeatable, default: base.wsgi and base.wsgi_public)",
+        )
+
+    def handle(self, *args, **options):
+        entrypoints = options["entrypoints"] or ["base.wsgi", "base.wsgi_public"]
+        settings_module = settings.SETTINGS_MODULE
+
+        self.stdout.write(
+            f"{'entrypoint':<20} {'import ms':>10} {'1st req ms':>11} {'total ms':>9} {'RSS MB':>8} {'modules':>8} status"
+        )
+        for entrypoint in entrypoints:
+            samples = []
+            for _ in range(options["runs"]):
+                code = PROBE.format(settings_module=settings_module, entrypoint=entrypoint, path=options["path"])
+                result = subprocess.run(
+                    [sys.executable, "-c", code],
+                    capture_output=True,
+                    text=True,
+                    cwd=settings.BASE_DIR,
+                )
+                if result.returncode != 0:
+                    self.stderr.write(result.stderr)
+                    break
+                samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+            if not samples:
+                continue
+
+            def median(key):
+                return statistics.median(sample[key] for sample in samples)
+
+            self.stdout.write(
+                f"{entrypoint:<20} {median('import') * 1000:>10.0f} {median('first_request') * 1000:>11.0f} "
+                f"{(median('import') + median('first_request')) * 1000:>9.0f} {median('rss_kb') / 1024:>8.1f} "
+                f"{median('modules'):>8.0f} {samples[-1]['status']}"
+            )
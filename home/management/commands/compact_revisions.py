@@ -0,0 +1,152 @@
+import datetime
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q, Sum, TextField
+from django.db.models.functions import Cast, Length
+from django.utils import timezone
+
+from home.models import ArchivedRevision
+
+
+def format_size(num_bytes):
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    if num_bytes < 1024 * 1024:
+        return f"{num_bytes / 1024:.1f} KB"
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+def revision_stats(revisions):
+    """Return (count, total size of the JSON content in bytes) for a revision queryset"""
+    stats = revisions.aggregate(size=Sum(Length(Cast("content", TextField()))))
+    return revisions.count(), stats["size"] or 0
+
+
+def select_prunable(rows, keep_last, daily_after):
+    """
+    Apply the retention policy to ``rows`` - (id, object_id, created_at) tuples
+    ordered by object and newest first - and return the ids to prune.
+
+    Per object the newest ``keep_last`` revisions and everything younger than
+    ``daily_after`` are kept; older revisions are thinned to the newest one of
+    each day.
+    """
+    cutoff = timezone.now() - datetime.timedelta(days=daily_after)
+    prunable = []
+    current_object = None
+    position = 0
+    days_seen = set()
+    for revision_id, object_id, created_at in rows:
+        if object_id != current_object:
+            current_object, position, days_seen = object_id, 0, set()
+        position += 1
+        if position <= keep_last or created_at >= cutoff:
+            continue
+        day = timezone.localdate(created_at)
+        if day in days_seen:
+            prunable.append(revision_id)
+        else:
+            days_seen.add(day)
+    return prunable
+
+
+class Command(BaseCommand):
+    help = "Prune old page revisions by retention policy, archiving them compressed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", default="home.HomePage", help="Page model whose revisions are compacted")
+        parser.add_argument("--keep-last", type=int, default=20, help="Always keep this many newest revisions per page")
+        parser.add_argument(
+            "--daily-after",
+            type=int,
+            default=30,
+            help="Keep every revision younger than this many days; keep one per day beyond that",
+        )
+        parser.add_argument("--batch-size", type=int, default=200, help="Revisions archived and deleted per transaction")
+        parser.add_argument("--no-archive", action="store_true", help="Delete pruned revisions without archiving them")
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be pruned without changing anything")
+        parser.add_argument("--vacuum", action="store_true", help="Run VACUUM afterwards to shrink an SQLite database file")
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError):
+            raise CommandError(f"Unknown model {options['model']!r}")
+        if options["keep_last"] < 1:
+            raise CommandError("--keep-last must be at least 1")
+
+        from wagtail.models import Revision, WorkflowState
+
+        revisions = Revision.objects.filter(content_type=ContentType.objects.get_for_model(model))
+        before_count, before_size = revision_stats(revisions)
+        db_size_before = self.get_database_file_size()
+
+        rows = revisions.order_by("object_id", "-created_at", "-pk").values_list("pk", "object_id", "created_at")
+        prunable = set(select_prunable(rows.iterator(), options["keep_last"], options["daily_after"]))
+
+        # Never touch the live or latest revision, scheduled publishes, revisions
+        # in moderation, or revisions that comments were made on (deleting those
+        # would cascade to the comments).
+        pages = model.objects.all()
+        protected = set(pages.exclude(live_revision=None).values_list("live_revision_id", flat=True))
+        protected |= set(pages.exclude(latest_revision=None).values_list("latest_revision_id", flat=True))
+        protected |= set(
+            revisions.filter(
+                Q(approved_go_live_at__isnull=False)
+                | Q(task_states__workflow_state__status__in=[
+                    WorkflowState.STATUS_IN_PROGRESS,
+                    WorkflowState.STATUS_NEEDS_CHANGES,
+                ])
+                | Q(created_comments__isnull=False)
+            ).values_list("pk", flat=True)
+        )
+        prunable = sorted(prunable - protected)
+
+        prunable_size = revision_stats(revisions.filter(pk__in=prunable))[1] if prunable else 0
+        self.stdout.write(f"{model._meta.label} revisions: {before_count} ({format_size(before_size)} of content)")
+        self.stdout.write(f"Prunable by policy: {len(prunable)} ({format_size(prunable_size)})")
+
+        if options["dry_run"] or not prunable:
+            return
+
+        archived_size = 0
+        batch_size = max(1, options["batch_size"])
+        for start in range(0, len(prunable), batch_size):
+            batch = prunable[start:start + batch_size]
+            with transaction.atomic():
+                if not options["no_archive"]:
+                    archives = [ArchivedRevision.from_revision(revision) for revision in revisions.filter(pk__in=batch)]
+                    ArchivedRevision.objects.bulk_create(archives, ignore_conflicts=True)
+                    archived_size += sum(len(archive.compressed_content) for archive in archives)
+                revisions.filter(pk__in=batch).delete()
+            self.stdout.write(f"  pruned {min(start + batch_size, len(prunable))}/{len(prunable)}")
+
+        after_count, after_size = revision_stats(revisions)
+        self.stdout.write(f"{model._meta.label} revisions: {after_count} ({format_size(after_size)} of content)")
+        if not options["no_archive"]:
+            self.stdout.write(
+                f"Archived {len(prunable)} revisions: {format_size(prunable_size)} -> "
+                f"{format_size(archived_size)} compressed"
+            )
+
+        if options["vacuum"]:
+            if connection.vendor != "sqlite":
+                self.stdout.write("Skipping VACUUM: only supported for SQLite")
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute("VACUUM")
+        if db_size_before is not None:
+            self.stdout.write(
+                f"Database file: {format_size(db_size_before)} -> {format_size(self.get_database_file_size())}"
+            )
+
+    def get_database_file_size(self):
+        name = settings.DATABASES["default"]["NAME"]
+        if connection.vendor == "sqlite" and isinstance(name, (str, os.PathLike)) and os.path.exists(name):
+            return os.path.getsize(name)
+        return None
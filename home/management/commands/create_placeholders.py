@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from home.placeholders import create_missing_placeholders
+
+
+class Command(BaseCommand):
+    help = "Create the low-quality placeholders of renditions that have none (bulk-created or made before placeholders)"
+
+    def handle(self, *args, **options):
+        created, failed = create_missing_placeholders(stdout=self.stdout if options["verbosity"] > 1 else None)
+        self.stdout.write(self.style.SUCCESS(f"Created {created} placeholders ({failed} failed)"))
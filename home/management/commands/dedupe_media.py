@@ -0,0 +1,61 @@
+from itertools import groupby
+
+from django.core.management.base import BaseCommand, CommandError
+from wagtail.images import get_image_model
+
+from home.showcase import showcase
+from home.storage import ContentAddressedMixin, merge_images, move_to_content_addressed
+
+
+class Command(BaseCommand):
+    help = "Move image originals and renditions to content-addressed names and merge duplicate images"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report duplicate images, change nothing")
+
+    def handle(self, *args, **options):
+        Image = get_image_model()
+        Rendition = Image.get_rendition_model()
+        if not isinstance(Image._meta.get_field("file").storage, ContentAddressedMixin):
+            raise CommandError("Set STORAGES['default'] to a content-addressed storage (home.storage.ContentAddressedStorage or home.s3_storage.S3MediaStorage) first")
+
+        if options["dry_run"]:
+            self.report_duplicates(Image)
+            return
+
+        moved = 0
+        for model in (Image, Rendition):
+            for instance in model.objects.order_by("pk").iterator():
+                if move_to_content_addressed(instance):
+                    moved += 1
+        self.stdout.write(f"Moved {moved} files to content-addressed names")
+
+        merged = skipped = 0
+        images = Image.objects.order_by("file", "pk")
+        for name, group in groupby(images, key=lambda image: image.file.name):
+            keep, *duplicates = list(group)
+            for duplicate in duplicates:
+                if merge_images(keep, duplicate):
+                    merged += 1
+                    self.stdout.write(f"  {duplicate.title!r} (#{duplicate.pk}) merged into {keep.title!r} (#{keep.pk})")
+                else:
+                    skipped += 1
+                    self.stdout.write(f"  {duplicate.title!r} (#{duplicate.pk}) is used in page content; kept, sharing {name}")
+        if merged:
+            showcase.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"Merged {merged} duplicate images, {skipped} left in place"))
+
+    def report_duplicates(self, Image):
+        from home.storage import hash_content
+
+        by_hash = {}
+        for image in Image.objects.order_by("pk"):
+            try:
+                with image.open_file() as f:
+                    by_hash.setdefault(hash_content(f), []).append(image)
+            except FileNotFoundError:
+                self.stdout.write(f"  #{image.pk} {image.title!r}: file missing")
+        duplicates = [images for images in by_hash.values() if len(images) > 1]
+        for images in duplicates:
+            self.stdout.write("  " + ", ".join(f"#{image.pk} {image.title!r}" for image in images))
+        self.stdout.write(f"{sum(len(images) - 1 for images in duplicates)} duplicate images in {len(duplicates)} groups")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from wagtail.models import Site
+
+from home.static_export import export_site, get_export_dir
+
+
+class Command(BaseCommand):
+    help = "Render the public site to static HTML in a new release directory and switch to it"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--site", type=int, help="Site id to export (default: the default site)")
+        parser.add_argument("--keep", type=int, help="Number of releases to keep (default: STATIC_EXPORT_KEEP)")
+
+    def handle(self, *args, **options):
+        site = None
+        if options["site"]:
+            try:
+                site = Site.objects.get(pk=options["site"])
+            except Site.DoesNotExist:
+                raise CommandError(f"Site {options['site']} does not exist")
+
+        release_dir = export_site(site=site, keep=options["keep"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Exported to {release_dir}; {get_export_dir()}/current now points to it"))
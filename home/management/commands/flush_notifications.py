@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from home.notifications import flush_all_notifications
+
+
+class Command(BaseCommand):
+    help = "Send batched / digest notification emails whose window has elapsed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Send everything pending now, regardless of windows")
+        parser.add_argument(
+            "--loop",
+            type=int,
+            metavar="SECONDS",
+            help="Keep running and check again every SECONDS (for a sidecar process instead of cron)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            for page, count in flush_all_notifications(force=options["force"]).items():
+                self.stdout.write(f"{page.title}: sent {count} submission{'s' if count != 1 else ''} in one email")
+            if not options["loop"]:
+                return
+            time.sleep(options["loop"])
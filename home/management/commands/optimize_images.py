@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+from wagtail.images import get_image_model
+
+from home.image_optimization import optimize_image
+
+
+class Command(BaseCommand):
+    help = "Shrink, strip and convert existing image originals; reports the bytes saved per image"
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="Only these image ids")
+        parser.add_argument("--dry-run", action="store_true", help="Report the savings without replacing any file")
+
+    def handle(self, *args, **options):
+        images = get_image_model().objects.order_by("pk")
+        if options["ids"]:
+            images = images.filter(pk__in=options["ids"])
+
+        total_before = total_after = optimised = 0
+        for image in images.iterator():
+            try:
+                result = optimize_image(image, dry_run=options["dry_run"])
+            except (OSError, ValueError) as e:
+                self.stderr.write(f"  #{image.pk} {image.title!r}: {e}")
+                continue
+            if result is None:
+                continue
+            before, after = result
+            total_before += before
+            total_after += after
+            optimised += 1
+            saved = 100 - after * 100 // before if before else 0
+            self.stdout.write(
+                f"  #{image.pk} {image.title!r}: {filesizeformat(before)} -> {filesizeformat(after)} ({saved}% saved)"
+            )
+
+        verb = "Would optimise" if options["dry_run"] else "Optimised"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {optimised} images, saving {filesizeformat(total_before - total_after)}"
+        ))
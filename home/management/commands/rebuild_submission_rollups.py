@@ -0,0 +1,51 @@
+from itertools import chain
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from wagtail.contrib.forms.models import FormSubmission
+
+from home.archive import iter_archived
+from home.models import SubmissionArchive, SubmissionRollup
+from home.rollups import TOTAL, build_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the submission analytics rollups from stored and archived form submissions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page", type=int, help="Only rebuild the rollups of this form page id")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Submissions read per query")
+
+    def handle(self, *args, **options):
+        submissions = FormSubmission.objects.all()
+        archives = SubmissionArchive.objects.all()
+        rollups = SubmissionRollup.objects.all()
+        if options["page"]:
+            submissions = submissions.filter(page_id=options["page"])
+            archives = archives.filter(page_id=options["page"])
+            rollups = rollups.filter(page_id=options["page"])
+
+        archived = (
+            (index.page_id, row["submit_time"], row["form_data"])
+            for index in archives
+            for row in iter_archived(index.get_path())
+        )
+        counts = build_rollups(chain(
+            submissions.values_list("page_id", "submit_time", "form_data").iterator(chunk_size=options["chunk_size"]),
+            archived,
+        ))
+
+        with transaction.atomic():
+            deleted, _ = rollups.delete()
+            SubmissionRollup.objects.bulk_create(
+                (
+                    SubmissionRollup(page_id=page_id, day=day, dimension=dimension, value=value, count=count)
+                    for (page_id, day, dimension, value), count in counts.items()
+                ),
+                batch_size=500,
+            )
+
+        total = sum(count for (_, _, dimension, _), count in counts.items() if dimension == TOTAL)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(counts)} rollup rows from {total} submissions (replaced {deleted})")
+        )
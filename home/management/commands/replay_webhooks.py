@@ -0,0 +1,62 @@
+import datetime
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from home.models import WebhookDelivery
+from home.webhooks import replay_deliveries
+
+
+def parse_since(value):
+    """Accept an ISO date/datetime or a relative age such as 30m, 12h or 7d"""
+    match = re.fullmatch(r"(\d+)([mhd])", value)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"m": datetime.timedelta(minutes=amount), "h": datetime.timedelta(hours=amount),
+                 "d": datetime.timedelta(days=amount)}[unit]
+        return timezone.now() - delta
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"Can't parse --since {value!r}; use e.g. 2024-05-01 or 7d")
+        moment = datetime.datetime.combine(day, datetime.time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = "Re-send failed Zapier webhook deliveries with bounded concurrency"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Only deliveries that failed after this (ISO date/datetime or 30m/12h/7d)")
+        parser.add_argument("--workers", type=int, help="Concurrent requests (default WEBHOOK_REPLAY_WORKERS)")
+        parser.add_argument("--rate", type=float, help="Requests per second per host (default WEBHOOK_REPLAY_RATE_PER_HOST)")
+        parser.add_argument("--limit", type=int, help="Replay at most this many deliveries")
+        parser.add_argument("--dry-run", action="store_true", help="Only list what would be re-sent")
+
+    def handle(self, *args, **options):
+        deliveries = WebhookDelivery.objects.filter(status=WebhookDelivery.STATUS_FAILED)
+        if options["since"]:
+            deliveries = deliveries.filter(created_at__gte=parse_since(options["since"]))
+        if options["limit"]:
+            deliveries = deliveries[:options["limit"]]
+        deliveries = list(deliveries)
+
+        hosts = sorted({delivery.url for delivery in deliveries})
+        self.stdout.write(f"{len(deliveries)} failed deliveries to {len(hosts)} webhook URL(s)")
+        if options["dry_run"] or not deliveries:
+            return
+
+        def progress(done, total, delivered, failed, elapsed):
+            rate = done / elapsed if elapsed else 0
+            self.stdout.write(f"  [{done}/{total}] delivered {delivered}, failed {failed} ({rate:.1f} submissions/s)")
+
+        delivered, failed = replay_deliveries(
+            deliveries, workers=options["workers"], rate_per_host=options["rate"], progress=progress
+        )
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(f"Delivered {delivered}, still failing {failed}"))
@@ -0,0 +1,27 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from home.archive import restore_archive
+from home.models import SubmissionArchive
+
+
+class Command(BaseCommand):
+    help = "Move one archived month of form submissions back into the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page", type=int, required=True, help="Form page id")
+        parser.add_argument("--month", required=True, help="Month to restore, as YYYY-MM")
+
+    def handle(self, *args, **options):
+        try:
+            month = datetime.datetime.strptime(options["month"], "%Y-%m").date()
+        except ValueError:
+            raise CommandError("--month must look like 2024-01")
+        try:
+            index = SubmissionArchive.objects.get(page_id=options["page"], month=month)
+        except SubmissionArchive.DoesNotExist:
+            raise CommandError(f"No archive for page {options['page']} in {options['month']}")
+
+        restored = restore_archive(index)
+        self.stdout.write(self.style.SUCCESS(f"Restored {restored} submissions"))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from home.storage import upload_media
+
+
+class Command(BaseCommand):
+    help = "Copy the files under MEDIA_ROOT to the configured media storage (e.g. S3), in parallel"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", default=None, help="Directory to upload (default: MEDIA_ROOT)")
+        parser.add_argument("--workers", type=int, default=8, help="Number of parallel uploads (default: 8)")
+
+    def handle(self, *args, **options):
+        if isinstance(default_storage, FileSystemStorage):
+            raise CommandError("STORAGES['default'] is the local file system; set MEDIA_STORAGE=s3 first")
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1")
+
+        source = options["source"] or settings.MEDIA_ROOT
+        uploaded, skipped, failed, total = upload_media(source, workers=options["workers"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f"Uploaded {uploaded} files ({total} bytes), {skipped} already present, {failed} failed"
+        ))
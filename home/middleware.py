@@ -0,0 +1,174 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponseNotFound
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_vary_headers
+
+from . import early_hints
+from .compression import (
+    PADDED_ENCODINGS, choose_encoding, compress_response, encode_etag, is_compressible, is_shared,
+    strip_etag_encodings,
+)
+from .routes import known_routes
+from .site_settings import get_site_for_request
+
+
+class NotFoundShortcutMiddleware:
+    """
+    Answer requests for unknown paths with a minimal 404 before the rest of the stack runs.
+
+    A path is let through when it resolves to a non-page view (thank-you page,
+    form API, admin, ...), when it is the path of a live page, or when a
+    redirect exists for it. Everything else - ``/wp-login.php``, ``/.env`` and
+    the rest of the scanner traffic - gets a plain 404 without sessions,
+    Wagtail's redirect lookup or a page tree walk. Verdicts are memoised per
+    path in a bounded LRU that is reset whenever the known routes change.
+
+    Disabled when DEBUG is on, so developers still get Django's 404 page.
+    """
+
+    def __init__(self, get_response):
+        if settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        known_routes.refresh()
+        path = request.path_info
+        urlconf = getattr(request, "urlconf", None)
+
+        verdict = known_routes.get_verdict((urlconf, path))
+        if verdict is None:
+            verdict = self.is_known(request, urlconf)
+            known_routes.set_verdict((urlconf, path), verdict)
+
+        if not verdict:
+            response = HttpResponseNotFound(b"Not Found", content_type="text/plain")
+            # Not cached downstream: publishing a page at this path takes effect at once
+            response["Cache-Control"] = "no-cache"
+            return response
+        return self.get_response(request)
+
+    def is_known(self, request, urlconf):
+        path = request.path_info
+        candidates = [path]
+        if settings.APPEND_SLASH and not path.endswith("/"):
+            # CommonMiddleware will redirect to the slashed URL if that one exists
+            candidates.append(path + "/")
+
+        for candidate in candidates:
+            try:
+                match = resolve(candidate, urlconf=urlconf)
+            except Resolver404:
+                continue
+            if match.url_name != "wagtail_serve":
+                return True
+            if known_routes.is_known_page_path(candidate):
+                return True
+
+        return known_routes.is_known_redirect_path(request.path)
+
+
+class CachedSiteMiddleware:
+    """
+    Resolve the Wagtail Site from the per-worker snapshot.
+
+    Setting ``request._wagtail_site`` up front means ``Site.find_for_request()``
+    - called by Wagtail's page router, the settings context processor and
+    third-party tags - returns it without querying the database.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        get_site_for_request(request)
+        return self.get_response(request)
+
+
+class CompressionMiddleware:
+    """
+    Compress text responses with Brotli, Zstandard or gzip, whichever the
+    client prefers among those available (see ``home.compression``); Brotli
+    only for shared responses, as its output cannot be padded.
+
+    Publicly cacheable responses with a strong ETag are encoded once per
+    encoding and served from the cache afterwards; their ETag gets the
+    encoding as a suffix. Streaming responses and responses that already have
+    a Content-Encoding are left alone.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        variants = {}
+        if "HTTP_IF_NONE_MATCH" in request.META:
+            request.META["HTTP_IF_NONE_MATCH"], variants = strip_etag_encodings(request.META["HTTP_IF_NONE_MATCH"])
+
+        response = self.get_response(request)
+        if response.status_code == 304 and response.get("ETag") in variants:
+            response["ETag"] = variants[response["ETag"]]
+            return response
+        if response.streaming or response.has_header("Content-Encoding") or not is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        # Per-visitor bodies only get encodings that can be padded against BREACH
+        encodings = None if is_shared(response) else PADDED_ENCODINGS
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), encodings)
+        if encoding is None:
+            return response
+        content = compress_response(request, response, encoding)
+        if content is None:
+            return response
+
+        response.content = content
+        response["Content-Length"] = str(len(content))
+        response["Content-Encoding"] = encoding
+        # The encoded body is a different representation with an ETag of its own
+        if response.has_header("ETag"):
+            response["ETag"] = encode_etag(response["ETag"], encoding)
+        return response
+
+
+class EarlyHintsMiddleware:
+    """
+    Add preload and preconnect ``Link`` headers for the critical assets of
+    HomePages (see ``home.early_hints``).
+
+    Where the WSGI server provides ``wsgi.early_hints``, the hints last
+    computed for the path are sent as a 103 response before the view runs.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        send_early_hints = request.META.get("wsgi.early_hints")
+        if callable(send_early_hints) and request.method == "GET":
+            links = early_hints.get_path_links(request)
+            if links:
+                send_early_hints([("Link", link) for link in links])
+        else:
+            send_early_hints = None
+
+        response = self.get_response(request)
+        links = self.get_links(request, response)
+        if links:
+            existing = response.get("Link")
+            response["Link"] = ", ".join(([existing] if existing else []) + links)
+            if send_early_hints:
+                early_hints.remember_path_links(request, links)
+        return response
+
+    def get_links(self, request, response):
+        from .models import HomePage
+
+        # Set by the before_serve_page hook in wagtail_hooks
+        page = getattr(request, "served_page", None)
+        if not isinstance(page, HomePage) or getattr(request, "is_preview", False):
+            return None
+        if response.status_code != 200 or not response.get("Content-Type", "").startswith("text/html"):
+            return None
+        return early_hints.get_page_links(page)
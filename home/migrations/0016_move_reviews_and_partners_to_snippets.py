@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:51
+
+from django.db import migrations, models
+
+
+def drop_rows_of_unpublished_copies(apps, schema_editor):
+    """
+    Reviews and partners keep their rows but lose the page link. If a copied or
+    unpublished HomePage carried its own set, drop it so the snippet lists are
+    not duplicated - the live homepage's rows are what visitors currently see.
+    """
+    HomePage = apps.get_model('home', 'HomePage')
+    live_ids = list(HomePage.objects.filter(live=True).values_list('pk', flat=True))
+    if not live_ids:
+        return
+    for model_name in ('GoogleReview', 'BrandPartner'):
+        model = apps.get_model('home', model_name)
+        if model.objects.filter(page_id__in=live_ids).exists():
+            model.objects.exclude(page_id__in=live_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0015_add_shopee_floating_button'),
+        ('wagtailimages', '0027_image_description'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_rows_of_unpublished_copies, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='brandpartner',
+            name='page',
+        ),
+        migrations.RemoveField(
+            model_name='googlereview',
+            name='page',
+        ),
+        migrations.RemoveField(
+            model_name='googlereview',
+            name='sort_order',
+        ),
+        migrations.AddIndex(
+            model_name='googlereview',
+            index=models.Index(fields=['-is_featured', '-review_date'], name='home_review_display_order'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('home', '0016_move_reviews_and_partners_to_snippets'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('revision_id', models.PositiveBigIntegerField(help_text='ID of the original revision', unique=True)),
+                ('object_id', models.CharField(db_index=True, max_length=255)),
+                ('object_str', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField()),
+                ('compressed_content', models.BinaryField()),
+                ('content_size', models.PositiveIntegerField(help_text='Size of the uncompressed JSON content in bytes')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['object_id', '-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index wagtailforms_formsubmission on (page_id, submit_time) for the
+    keyset-paginated, date-filtered submissions export in home/exports.py.
+    The table belongs to wagtail.contrib.forms, so the index is created here.
+    """
+
+    dependencies = [
+        ('home', '0017_archivedrevision'),
+        ('wagtailforms', '0005_alter_formsubmission_form_data'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS home_formsubmission_page_time '
+                'ON wagtailforms_formsubmission (page_id, submit_time, id)',
+            reverse_sql='DROP INDEX IF EXISTS home_formsubmission_page_time',
+        ),
+    ]
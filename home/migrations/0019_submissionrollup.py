@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0018_formsubmission_page_submit_time_index'),
+        ('wagtailcore', '0095_groupsitepermission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('dimension', models.CharField(blank=True, max_length=50)),
+                ('value', models.CharField(blank=True, max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailcore.page')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dimension', 'day'], name='home_rollup_dimension_day')],
+                'constraints': [models.UniqueConstraint(fields=('page', 'day', 'dimension', 'value'), name='home_rollup_unique_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0019_submissionrollup'),
+        ('wagtailcore', '0095_groupsitepermission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the archived month')),
+                ('path', models.CharField(help_text='File path relative to SUBMISSION_ARCHIVE_DIR', max_length=255)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('first_submit_time', models.DateTimeField(null=True)),
+                ('last_submit_time', models.DateTimeField(null=True)),
+                ('size_bytes', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailcore.page')),
+            ],
+            options={
+                'ordering': ['-month', 'page_id'],
+                'constraints': [models.UniqueConstraint(fields=('page', 'month'), name='home_archive_unique_month')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0020_submissionarchive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='homepage',
+            name='email_batch_window',
+            field=models.PositiveIntegerField(default=60, help_text='Micro-batched mode: seconds to wait for more submissions after the first one before sending'),
+        ),
+        migrations.AddField(
+            model_name='homepage',
+            name='email_delivery_mode',
+            field=models.CharField(choices=[('immediate', 'Immediate (one email per submission)'), ('batched', 'Micro-batched (combine submissions arriving close together)'), ('digest', 'Digest (one email per period)')], default='immediate', help_text='How notification emails are sent. Batched and digest modes combine several submissions into one email to avoid rate limits and inbox floods.', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='homepage',
+            name='email_digest_interval',
+            field=models.PositiveIntegerField(default=60, help_text='Digest mode: minutes between digest emails'),
+        ),
+        migrations.CreateModel(
+            name='PendingNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('form_data', models.JSONField(help_text='Submitted data as {label: value}')),
+                ('submit_time', models.DateTimeField(auto_now_add=True)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='home.homepage')),
+            ],
+            options={
+                'ordering': ['submit_time', 'pk'],
+                'indexes': [models.Index(fields=['page', 'submit_time'], name='home_pending_page_time')],
+            },
+        ),
+    ]
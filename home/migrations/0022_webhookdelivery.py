@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0021_email_delivery_mode'),
+        ('wagtailcore', '0095_groupsitepermission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhooksettings',
+            name='webhook_accepts_arrays',
+            field=models.BooleanField(default=False, help_text='The webhook accepts a JSON array of submissions per request (Zapier catch hooks do). Used when re-sending failed deliveries.'),
+        ),
+        migrations.AddField(
+            model_name='webhooksettings',
+            name='webhook_batch_size',
+            field=models.PositiveIntegerField(default=50, help_text='Maximum submissions per request when the webhook accepts arrays'),
+        ),
+        migrations.CreateModel(
+            name='WebhookDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500)),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('failed', 'Failed'), ('delivered', 'Delivered')], default='failed', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('response_status', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+                ('page', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailcore.page')),
+            ],
+            options={
+                'ordering': ['created_at', 'pk'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='home_webhook_status_created')],
+            },
+        ),
+    ]
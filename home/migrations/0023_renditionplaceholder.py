@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0022_webhookdelivery'),
+        ('wagtailimages', '0027_image_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenditionPlaceholder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data_uri', models.TextField(help_text='Base64 data URI of the tiny preview image')),
+                ('colour', models.CharField(help_text='Average colour as #rrggbb', max_length=7)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('rendition', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='placeholder', to='wagtailimages.rendition')),
+            ],
+        ),
+    ]
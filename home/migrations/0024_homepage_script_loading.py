@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:34
+
+import wagtail.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0023_renditionplaceholder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='homepage',
+            name='embed_body_loading',
+            field=models.CharField(choices=[('critical', 'Critical - run while the page loads'), ('idle', 'Deferred - run after first paint, when the browser is idle'), ('interaction', 'On interaction - run on the first scroll, click, tap or key press')], default='idle', help_text='When scripts in the <body> code run', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='homepage',
+            name='embed_head_loading',
+            field=models.CharField(choices=[('critical', 'Critical - run while the page loads'), ('idle', 'Deferred - run after first paint, when the browser is idle'), ('interaction', 'On interaction - run on the first scroll, click, tap or key press')], default='idle', help_text='When scripts in the <head> code run. Deferring tracking tags keeps them from delaying the hero.', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='homepage',
+            name='expertise_content_blocks',
+            field=wagtail.fields.StreamField([('heading', 0), ('paragraph', 1), ('image', 2), ('quote', 3), ('html', 6), ('call_to_action', 11)], blank=True, block_lookup={0: ('wagtail.blocks.CharBlock', (), {'form_classname': 'title'}), 1: ('wagtail.blocks.RichTextBlock', (), {}), 2: ('wagtail.images.blocks.ImageChooserBlock', (), {}), 3: ('wagtail.blocks.BlockQuoteBlock', (), {}), 4: ('wagtail.blocks.RawHTMLBlock', (), {}), 5: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('critical', 'Critical - run while the page loads'), ('idle', 'Deferred - run after first paint, when the browser is idle'), ('interaction', 'On interaction - run on the first scroll, click, tap or key press')], 'help_text': 'When scripts in this HTML run (see home/script_loader.py)'}), 6: ('wagtail.blocks.StructBlock', [[('html', 4), ('loading', 5)]], {}), 7: ('wagtail.blocks.CharBlock', (), {'max_length': 50}), 8: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('#hero', 'Hero Section'), ('#usp-section', 'USP Features Section'), ('#expertise-section', 'Statistics/Expertise Section'), ('#partners', 'Partners Section'), ('#testimonials', 'Google Reviews Section')]}), 9: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('#0A1F44', 'primary-navy'), ('#FFFFFF', 'white'), ('#3B82F6', 'sky-blue'), ('#F4F6FA', 'light-gray'), ('#1E293B', 'dark-text'), ('#06B6D4', 'bright-cyan'), ('#1E3A8A', 'dark-navy-hover'), ('#FACC15', 'yellow-highlight')]}), 10: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('white', 'White'), ('black', 'Black'), ('gray', 'Gray')]}), 11: ('wagtail.blocks.StructBlock', [[('button_text', 7), ('button_redirect', 8), ('background_color', 9), ('text_color', 10)]], {})}, null=True),
+        ),
+        migrations.AlterField(
+            model_name='homepage',
+            name='hero_content_blocks',
+            field=wagtail.fields.StreamField([('heading', 0), ('paragraph', 1), ('image', 2), ('quote', 3), ('html', 6), ('call_to_action', 11)], blank=True, block_lookup={0: ('wagtail.blocks.CharBlock', (), {'form_classname': 'title'}), 1: ('wagtail.blocks.RichTextBlock', (), {}), 2: ('wagtail.images.blocks.ImageChooserBlock', (), {}), 3: ('wagtail.blocks.BlockQuoteBlock', (), {}), 4: ('wagtail.blocks.RawHTMLBlock', (), {}), 5: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('critical', 'Critical - run while the page loads'), ('idle', 'Deferred - run after first paint, when the browser is idle'), ('interaction', 'On interaction - run on the first scroll, click, tap or key press')], 'help_text': 'When scripts in this HTML run (see home/script_loader.py)'}), 6: ('wagtail.blocks.StructBlock', [[('html', 4), ('loading', 5)]], {}), 7: ('wagtail.blocks.CharBlock', (), {'max_length': 50}), 8: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('#hero', 'Hero Section'), ('#usp-section', 'USP Features Section'), ('#expertise-section', 'Statistics/Expertise Section'), ('#partners', 'Partners Section'), ('#testimonials', 'Google Reviews Section')]}), 9: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('#0A1F44', 'primary-navy'), ('#FFFFFF', 'white'), ('#3B82F6', 'sky-blue'), ('#F4F6FA', 'light-gray'), ('#1E293B', 'dark-text'), ('#06B6D4', 'bright-cyan'), ('#1E3A8A', 'dark-navy-hover'), ('#FACC15', 'yellow-highlight')]}), 10: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('white', 'White'), ('black', 'Black'), ('gray', 'Gray')]}), 11: ('wagtail.blocks.StructBlock', [[('button_text', 7), ('button_redirect', 8), ('background_color', 9), ('text_color', 10)]], {})}, null=True),
+        ),
+        migrations.AlterField(
+            model_name='homepage',
+            name='partners_content_blocks',
+            field=wagtail.fields.StreamField([('heading', 0), ('paragraph', 1), ('image', 2), ('quote', 3), ('html', 6), ('call_to_action', 11)], blank=True, block_lookup={0: ('wagtail.blocks.CharBlock', (), {'form_classname': 'title'}), 1: ('wagtail.blocks.RichTextBlock', (), {}), 2: ('wagtail.images.blocks.ImageChooserBlock', (), {}), 3: ('wagtail.blocks.BlockQuoteBlock', (), {}), 4: ('wagtail.blocks.RawHTMLBlock', (), {}), 5: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('critical', 'Critical - run while the page loads'), ('idle', 'Deferred - run after first paint, when the browser is idle'), ('interaction', 'On interaction - run on the first scroll, click, tap or key press')], 'help_text': 'When scripts in this HTML run (see home/script_loader.py)'}), 6: ('wagtail.blocks.StructBlock', [[('html', 4), ('loading', 5)]], {}), 7: ('wagtail.blocks.CharBlock', (), {'max_length': 50}), 8: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('#hero', 'Hero Section'), ('#usp-section', 'USP Features Section'), ('#expertise-section', 'Statistics/Expertise Section'), ('#partners', 'Partners Section'), ('#testimonials', 'Google Reviews Section')]}), 9: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('#0A1F44', 'primary-navy'), ('#FFFFFF', 'white'), ('#3B82F6', 'sky-blue'), ('#F4F6FA', 'light-gray'), ('#1E293B', 'dark-text'), ('#06B6D4', 'bright-cyan'), ('#1E3A8A', 'dark-navy-hover'), ('#FACC15', 'yellow-highlight')]}), 10: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('white', 'White'), ('black', 'Black'), ('gray', 'Gray')]}), 11: ('wagtail.blocks.StructBlock', [[('button_text', 7), ('button_redirect', 8), ('background_color', 9), ('text_color', 10)]], {})}, null=True),
+        ),
+        migrations.AlterField(
+            model_name='homepage',
+            name='testimonial_content_blocks',
+            field=wagtail.fields.StreamField([('heading', 0), ('paragraph', 1), ('image', 2), ('quote', 3), ('html', 6), ('call_to_action', 11)], blank=True, block_lookup={0: ('wagtail.blocks.CharBlock', (), {'form_classname': 'title'}), 1: ('wagtail.blocks.RichTextBlock', (), {}), 2: ('wagtail.images.blocks.ImageChooserBlock', (), {}), 3: ('wagtail.blocks.BlockQuoteBlock', (), {}), 4: ('wagtail.blocks.RawHTMLBlock', (), {}), 5: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('critical', 'Critical - run while the page loads'), ('idle', 'Deferred - run after first paint, when the browser is idle'), ('interaction', 'On interaction - run on the first scroll, click, tap or key press')], 'help_text': 'When scripts in this HTML run (see home/script_loader.py)'}), 6: ('wagtail.blocks.StructBlock', [[('html', 4), ('loading', 5)]], {}), 7: ('wagtail.blocks.CharBlock', (), {'max_length': 50}), 8: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('#hero', 'Hero Section'), ('#usp-section', 'USP Features Section'), ('#expertise-section', 'Statistics/Expertise Section'), ('#partners', 'Partners Section'), ('#testimonials', 'Google Reviews Section')]}), 9: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('#0A1F44', 'primary-navy'), ('#FFFFFF', 'white'), ('#3B82F6', 'sky-blue'), ('#F4F6FA', 'light-gray'), ('#1E293B', 'dark-text'), ('#06B6D4', 'bright-cyan'), ('#1E3A8A', 'dark-navy-hover'), ('#FACC15', 'yellow-highlight')]}), 10: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('white', 'White'), ('black', 'Black'), ('gray', 'Gray')]}), 11: ('wagtail.blocks.StructBlock', [[('button_text', 7), ('button_redirect', 8), ('background_color', 9), ('text_color', 10)]], {})}, null=True),
+        ),
+        migrations.AlterField(
+            model_name='homepage',
+            name='usp_content_blocks',
+            field=wagtail.fields.StreamField([('heading', 0), ('paragraph', 1), ('image', 2), ('quote', 3), ('html', 6), ('call_to_action', 11)], blank=True, block_lookup={0: ('wagtail.blocks.CharBlock', (), {'form_classname': 'title'}), 1: ('wagtail.blocks.RichTextBlock', (), {}), 2: ('wagtail.images.blocks.ImageChooserBlock', (), {}), 3: ('wagtail.blocks.BlockQuoteBlock', (), {}), 4: ('wagtail.blocks.RawHTMLBlock', (), {}), 5: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('critical', 'Critical - run while the page loads'), ('idle', 'Deferred - run after first paint, when the browser is idle'), ('interaction', 'On interaction - run on the first scroll, click, tap or key press')], 'help_text': 'When scripts in this HTML run (see home/script_loader.py)'}), 6: ('wagtail.blocks.StructBlock', [[('html', 4), ('loading', 5)]], {}), 7: ('wagtail.blocks.CharBlock', (), {'max_length': 50}), 8: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('#hero', 'Hero Section'), ('#usp-section', 'USP Features Section'), ('#expertise-section', 'Statistics/Expertise Section'), ('#partners', 'Partners Section'), ('#testimonials', 'Google Reviews Section')]}), 9: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('#0A1F44', 'primary-navy'), ('#FFFFFF', 'white'), ('#3B82F6', 'sky-blue'), ('#F4F6FA', 'light-gray'), ('#1E293B', 'dark-text'), ('#06B6D4', 'bright-cyan'), ('#1E3A8A', 'dark-navy-hover'), ('#FACC15', 'yellow-highlight')]}), 10: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('white', 'White'), ('black', 'Black'), ('gray', 'Gray')]}), 11: ('wagtail.blocks.StructBlock', [[('button_text', 7), ('button_redirect', 8), ('background_color', 9), ('text_color', 10)]], {})}, null=True),
+        ),
+    ]
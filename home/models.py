@@ -1,5 +1,6 @@
+from django.conf import settings
 from django.db import models
-from wagtail.admin.panels import FieldPanel, MultiFieldPanel, InlinePanel, TabbedInterface, ObjectList, FieldRowPanel
+from wagtail.admin.panels import FieldPanel, MultiFieldPanel, InlinePanel, TabbedInterface, ObjectList, FieldRowPanel, HelpPanel
 from wagtail.models import Page, Orderable
 from wagtail.fields import RichTextField
 from wagtail.images import get_image_model_string
@@ -9,9 +10,13 @@ from wagtail.fields import StreamField
 from wagtail import blocks
 from wagtail.images.blocks import ImageChooserBlock
 from wagtail.contrib.forms.models import AbstractEmailForm, AbstractFormField
-from wagtail.contrib.forms.panels import FormSubmissionsPanel
 from wagtail.contrib.settings.models import BaseSiteSetting, register_setting
-from .blocks import CallToActionBlock
+from . import early_hints
+from .blocks import CallToActionBlock, EmbedHTMLBlock
+from .forms import CachedFormMixin, StreamingExportMixin
+from .panels import RollupSubmissionsPanel
+from .rollups import record_submission
+from .script_loader import IDLE, LOADING_CHOICES
 
 
 # Webhook Settings - Editable from Wagtail Admin
@@ -32,17 +37,206 @@ class WebhookSettings(BaseSiteSetting):
         help_text="Enable or disable sending data to the webhook"
     )
     
+    webhook_accepts_arrays = models.BooleanField(
+        default=False,
+        help_text="The webhook accepts a JSON array of submissions per request (Zapier catch hooks do). Used when re-sending failed deliveries."
+    )
+    
+    webhook_batch_size = models.PositiveIntegerField(
+        default=50,
+        help_text="Maximum submissions per request when the webhook accepts arrays"
+    )
+    
     panels = [
         MultiFieldPanel([
             FieldPanel('webhook_enabled'),
             FieldPanel('zapier_webhook_url'),
         ], heading="Zapier Webhook Configuration"),
+        MultiFieldPanel([
+            FieldPanel('webhook_accepts_arrays'),
+            FieldPanel('webhook_batch_size'),
+        ], heading="Batched Delivery"),
     ]
     
     class Meta:
         verbose_name = "Webhook Settings"
 
 
+# Webhook Delivery - a Zapier payload that could not be delivered (home/webhooks.py)
+class WebhookDelivery(models.Model):
+    STATUS_FAILED = 'failed'
+    STATUS_DELIVERED = 'delivered'
+
+    page = models.ForeignKey(
+        'wagtailcore.Page',
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+'
+    )
+    url = models.URLField(max_length=500)
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=20,
+        choices=[(STATUS_FAILED, 'Failed'), (STATUS_DELIVERED, 'Delivered')],
+        default=STATUS_FAILED,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    response_status = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at', 'pk']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='home_webhook_status_created'),
+        ]
+
+    def __str__(self):
+        return f"Webhook delivery {self.pk} to {self.url} ({self.status})"
+
+
+# Archived Page Revision - written by the compact_revisions management command
+class ArchivedRevision(models.Model):
+    """
+    A pruned revision, kept as zlib-compressed JSON so it can still be inspected
+    or restored by hand after it has been removed from wagtailcore_revision.
+    """
+    revision_id = models.PositiveBigIntegerField(unique=True, help_text="ID of the original revision")
+    content_type = models.ForeignKey('contenttypes.ContentType', on_delete=models.CASCADE, related_name='+')
+    object_id = models.CharField(max_length=255, db_index=True)
+    object_str = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+'
+    )
+    compressed_content = models.BinaryField()
+    content_size = models.PositiveIntegerField(help_text="Size of the uncompressed JSON content in bytes")
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['object_id', '-created_at']
+
+    @classmethod
+    def from_revision(cls, revision):
+        import json
+        import zlib
+
+        content = json.dumps(revision.content, separators=(',', ':')).encode('utf-8')
+        return cls(
+            revision_id=revision.pk,
+            content_type_id=revision.content_type_id,
+            object_id=revision.object_id,
+            object_str=revision.object_str,
+            created_at=revision.created_at,
+            user_id=revision.user_id,
+            compressed_content=zlib.compress(content, 9),
+            content_size=len(content),
+        )
+
+    def get_content(self):
+        """Return the original revision content as a dict"""
+        import json
+        import zlib
+
+        return json.loads(zlib.decompress(self.compressed_content))
+
+    def __str__(self):
+        return f"Revision {self.revision_id} of {self.object_str or self.object_id}"
+
+
+# Form Submission Rollup - daily counters maintained by home/rollups.py
+class SubmissionRollup(models.Model):
+    """
+    Number of submissions to a form page on a given day, in total (empty
+    dimension) or per value of a configured dimension such as location.
+    """
+    page = models.ForeignKey('wagtailcore.Page', on_delete=models.CASCADE, related_name='+')
+    day = models.DateField()
+    dimension = models.CharField(max_length=50, blank=True)
+    value = models.CharField(max_length=100, blank=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['page', 'day', 'dimension', 'value'], name='home_rollup_unique_key'),
+        ]
+        indexes = [
+            models.Index(fields=['dimension', 'day'], name='home_rollup_dimension_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.page_id} {self.day} {self.dimension or 'total'}={self.value}: {self.count}"
+
+
+# Submission Archive - index of the monthly cold-storage files written by home/archive.py
+class SubmissionArchive(models.Model):
+    page = models.ForeignKey('wagtailcore.Page', on_delete=models.CASCADE, related_name='+')
+    month = models.DateField(help_text="First day of the archived month")
+    path = models.CharField(max_length=255, help_text="File path relative to SUBMISSION_ARCHIVE_DIR")
+    row_count = models.PositiveIntegerField(default=0)
+    first_submit_time = models.DateTimeField(null=True)
+    last_submit_time = models.DateTimeField(null=True)
+    size_bytes = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-month', 'page_id']
+        constraints = [
+            models.UniqueConstraint(fields=['page', 'month'], name='home_archive_unique_month'),
+        ]
+
+    def get_path(self):
+        import os
+        from .archive import get_archive_dir
+
+        return os.path.join(get_archive_dir(), self.path)
+
+    def add_rows(self, submissions, size_bytes):
+        """Record ``submissions`` as appended to this month's file"""
+        times = [submission.submit_time for submission in submissions]
+        self.row_count += len(submissions)
+        self.first_submit_time = min(times + ([self.first_submit_time] if self.first_submit_time else []))
+        self.last_submit_time = max(times + ([self.last_submit_time] if self.last_submit_time else []))
+        self.size_bytes = size_bytes
+        self.save()
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} page {self.page_id} ({self.row_count} submissions)"
+
+
+# Pending Notification - submissions waiting for a batched / digest email (home/notifications.py)
+class PendingNotification(models.Model):
+    page = models.ForeignKey('home.HomePage', on_delete=models.CASCADE, related_name='+')
+    form_data = models.JSONField(help_text="Submitted data as {label: value}")
+    submit_time = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['submit_time', 'pk']
+        indexes = [
+            models.Index(fields=['page', 'submit_time'], name='home_pending_page_time'),
+        ]
+
+    def __str__(self):
+        return f"Pending notification for page {self.page_id} at {self.submit_time}"
+
+
+# Rendition Placeholder - tiny blurred preview of a rendition, computed once (home/placeholders.py)
+class RenditionPlaceholder(models.Model):
+    rendition = models.OneToOneField('wagtailimages.Rendition', on_delete=models.CASCADE, related_name='placeholder')
+    data_uri = models.TextField(help_text="Base64 data URI of the tiny preview image")
+    colour = models.CharField(max_length=7, help_text="Average colour as #rrggbb")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Placeholder for rendition {self.rendition_id}"
+
+
 # Form Field for HomePage Contact Form
 class HomePageFormField(AbstractFormField):
     page = ParentalKey(
@@ -112,8 +306,20 @@ class PageSection(Orderable):
         ordering = ['sort_order']  # This comes from Orderable
         unique_together = ['page', 'section_id']  # Prevent duplicate sections
     
+    # Element ids of the rendered sections, which navigation links point at
+    ANCHORS = {
+        'hero': 'home',
+        'usp-section': 'services',
+        'partners': 'partners',
+        'testimonials': 'testimonials',
+    }
+
     def __str__(self):
         return f"{self.section_id} ({'Enabled' if self.is_enabled else 'Disabled'})"
+
+    @property
+    def anchor(self):
+        return self.ANCHORS.get(self.section_id, '')
     
     def save(self, *args, **kwargs):
         # Auto-populate section_name if not provided
@@ -147,9 +353,8 @@ class StatisticItem(Orderable):
 #         FieldPanel('caption'),
 #     ]
 
-# Brand Partner Model
+# Brand Partner Model - managed as a snippet (see wagtail_hooks.py)
 class BrandPartner(Orderable):
-    page = ParentalKey('home.HomePage', related_name='brand_partners', on_delete=models.CASCADE)
     image = models.ForeignKey(
         'wagtailimages.Image',
         null=True,
@@ -165,11 +370,12 @@ class BrandPartner(Orderable):
         FieldPanel('alt_text'),
     ]
 
+    def __str__(self):
+        return self.alt_text
 
-# Google Review Model
-class GoogleReview(Orderable):
-    page = ParentalKey('home.HomePage', related_name='google_reviews', on_delete=models.CASCADE)
-    
+
+# Google Review Model - managed as a snippet (see wagtail_hooks.py)
+class GoogleReview(models.Model):
     AVATAR_COLOR_CHOICES = [
         ('#e91e63', 'Pink'),
         ('#ff5722', 'Deep Orange'),
@@ -265,6 +471,9 @@ class GoogleReview(Orderable):
     
     class Meta:
         ordering = ['-is_featured', '-review_date']
+        indexes = [
+            models.Index(fields=['-is_featured', '-review_date'], name='home_review_display_order'),
+        ]
     
     def save(self, *args, **kwargs):
         # Auto-fill review_date if not provided
@@ -422,7 +631,7 @@ class ThankYouPageSettings(Orderable):
         return f"Thank You Settings - {self.thank_you_title}"
 
 
-class HomePage(AbstractEmailForm):
+class HomePage(CachedFormMixin, StreamingExportMixin, AbstractEmailForm):
     # Ensure only one home page can be created
     max_count = 1
     
@@ -512,6 +721,26 @@ class HomePage(AbstractEmailForm):
         help_text="Name displayed as the email sender (e.g., 'Seng Leong Website', 'Company Name')"
     )
     
+    # Email Delivery Mode
+    email_delivery_mode = models.CharField(
+        max_length=20,
+        choices=[
+            ('immediate', 'Immediate (one email per submission)'),
+            ('batched', 'Micro-batched (combine submissions arriving close together)'),
+            ('digest', 'Digest (one email per period)'),
+        ],
+        default='immediate',
+        help_text="How notification emails are sent. Batched and digest modes combine several submissions into one email to avoid rate limits and inbox floods."
+    )
+    email_batch_window = models.PositiveIntegerField(
+        default=60,
+        help_text="Micro-batched mode: seconds to wait for more submissions after the first one before sending"
+    )
+    email_digest_interval = models.PositiveIntegerField(
+        default=60,
+        help_text="Digest mode: minutes between digest emails"
+    )
+    
     # WhatsApp Settings (only used if form_submission_method = 'whatsapp')
     form_whatsapp_number = models.CharField(
         max_length=20,
@@ -681,13 +910,27 @@ class HomePage(AbstractEmailForm):
         help_text="Embed any code in <body> (Google Tag manager)"
     )
 
+    embed_head_loading = models.CharField(
+        max_length=20,
+        choices=LOADING_CHOICES,
+        default=IDLE,
+        help_text="When scripts in the <head> code run. Deferring tracking tags keeps them from delaying the hero."
+    )
+
+    embed_body_loading = models.CharField(
+        max_length=20,
+        choices=LOADING_CHOICES,
+        default=IDLE,
+        help_text="When scripts in the <body> code run"
+    )
+
     # Content blocks here
     usp_content_blocks = StreamField([
         ('heading', blocks.CharBlock(classname="title")),
         ('paragraph', blocks.RichTextBlock()),
         ('image', ImageChooserBlock()),
         ('quote', blocks.BlockQuoteBlock()),
-        ('html', blocks.RawHTMLBlock()),
+        ('html', EmbedHTMLBlock()),
 
         ('call_to_action', CallToActionBlock()),
 
@@ -699,7 +942,7 @@ class HomePage(AbstractEmailForm):
         ('paragraph', blocks.RichTextBlock()),
         ('image', ImageChooserBlock()),
         ('quote', blocks.BlockQuoteBlock()),
-        ('html', blocks.RawHTMLBlock()),
+        ('html', EmbedHTMLBlock()),
 
         ('call_to_action', CallToActionBlock()),
     ], blank=True, null=True, use_json_field=True)
@@ -710,7 +953,7 @@ class HomePage(AbstractEmailForm):
         ('paragraph', blocks.RichTextBlock()),
         ('image', ImageChooserBlock()),
         ('quote', blocks.BlockQuoteBlock()),
-        ('html', blocks.RawHTMLBlock()),
+        ('html', EmbedHTMLBlock()),
 
         ('call_to_action', CallToActionBlock()),
     ], blank=True, null=True, use_json_field=True)
@@ -721,7 +964,7 @@ class HomePage(AbstractEmailForm):
         ('paragraph', blocks.RichTextBlock()),
         ('image', ImageChooserBlock()),
         ('quote', blocks.BlockQuoteBlock()),
-        ('html', blocks.RawHTMLBlock()),
+        ('html', EmbedHTMLBlock()),
 
         ('call_to_action', CallToActionBlock()),
     ], blank=True, null=True, use_json_field=True)
@@ -732,7 +975,7 @@ class HomePage(AbstractEmailForm):
         ('paragraph', blocks.RichTextBlock()),
         ('image', ImageChooserBlock()),
         ('quote', blocks.BlockQuoteBlock()),
-        ('html', blocks.RawHTMLBlock()),
+        ('html', EmbedHTMLBlock()),
 
         ('call_to_action', CallToActionBlock()),
     ], blank=True, null=True, use_json_field=True)
@@ -746,7 +989,9 @@ class HomePage(AbstractEmailForm):
             FieldPanel('show_navigation'),
             FieldPanel('show_footer'),
             FieldPanel('embed_head_code'),
+            FieldPanel('embed_head_loading'),
             FieldPanel('embed_body_code'),
+            FieldPanel('embed_body_loading'),
         ], heading="Page Display Options"),
     ]
     
@@ -762,6 +1007,13 @@ class HomePage(AbstractEmailForm):
             FieldPanel('form_submission_method'),
             FieldPanel('email_sender_name'),
         ], heading="Contact Form Settings"),
+        MultiFieldPanel([
+            FieldPanel('email_delivery_mode'),
+            FieldRowPanel([
+                FieldPanel('email_batch_window'),
+                FieldPanel('email_digest_interval'),
+            ]),
+        ], heading="Notification Email Delivery"),
         InlinePanel('form_fields', heading="Form Fields", 
                    help_text="Add form fields for the contact form (only used when Email method is selected)"),
         MultiFieldPanel([
@@ -776,7 +1028,7 @@ class HomePage(AbstractEmailForm):
             ]),
             FieldPanel('subject'),
         ], heading="Email Settings (only used when Email method is selected)"),
-        FormSubmissionsPanel(),
+        RollupSubmissionsPanel(),
         InlinePanel('thank_you_settings', heading="Thank You Page Settings", 
                    help_text="Customize the thank you page content and layout", 
                    max_num=1),
@@ -807,7 +1059,7 @@ class HomePage(AbstractEmailForm):
             FieldPanel('partners_subtitle'),
             # InlinePanel('home_images', label="Home Images"),
         ], heading="Partners Section"),
-        InlinePanel('brand_partners', heading="Brand Partners", min_num=1),
+        HelpPanel(content="Brand partner logos are managed under Snippets &rarr; Brand Partners."),
         FieldPanel('partners_content_blocks'),
     ]
     
@@ -822,7 +1074,7 @@ class HomePage(AbstractEmailForm):
             FieldPanel('google_widget_review_count'),
             FieldPanel('google_widget_url'),
         ], heading="Google Review Widget"),
-        InlinePanel('google_reviews', heading="Google Reviews", min_num=1),
+        HelpPanel(content="Reviews are managed under Snippets &rarr; Google Reviews."),
         FieldPanel('testimonial_content_blocks'),
     ]
     
@@ -870,10 +1122,42 @@ class HomePage(AbstractEmailForm):
         ObjectList(seo_panels, heading='SEO'),
     ])
 
+    def get_google_reviews(self):
+        """Return all reviews, featured first then newest, from the per-worker snapshot"""
+        from .showcase import showcase
+        return showcase.get_reviews()
+
+    def get_brand_partners(self):
+        """Return all brand partners in their snippet sort order"""
+        from .showcase import showcase
+        return showcase.get_partners()
+
     def get_ordered_sections(self):
         """Return sections in the order specified by the user"""
         return self.page_sections.filter(is_enabled=True).order_by('sort_order')
 
+    def get_lazy_section_ids(self, request):
+        """
+        Return the ids of the sections sent as placeholders that fetch their HTML
+        (home.views.section_fragment) when scrolled near. The hero and the next
+        HOMEPAGE_EAGER_SECTIONS - 1 sections render inline; so does everything
+        in previews and for ?sections=all, the fallback for browsers without
+        JavaScript.
+        """
+        if getattr(request, 'is_preview', False) or request.GET.get('sections') == 'all':
+            return set()
+        eager = getattr(settings, 'HOMEPAGE_EAGER_SECTIONS', 2)
+        return {
+            section.section_id for section in list(self.get_ordered_sections())[eager:]
+            if section.section_id != 'hero'
+        }
+
+    def get_context(self, request, *args, **kwargs):
+        context = super().get_context(request, *args, **kwargs)
+        context['lazy_sections'] = self.get_lazy_section_ids(request)
+        context['critical_assets'] = early_hints.get_critical_assets()
+        return context
+
     def get_section_dict(self):
         """Return a dictionary mapping section_id to order for use in templates"""
         sections = {}
@@ -922,6 +1206,7 @@ class HomePage(AbstractEmailForm):
             form_data=form.cleaned_data,
             page=self,
         )
+        record_submission(form_submission)
         
         # IMPORTANT: Do NOT call send_mail() here
         # This prevents Wagtail from sending its default plain text email
@@ -949,8 +1234,47 @@ class HomePage(AbstractEmailForm):
             form = self.get_form(request.POST, page=self, user=request.user)
             
             if form.is_valid():
+                from django.shortcuts import redirect
+                from .throttling import (
+                    PENDING, claim_submission, forget_submission, get_client_ip,
+                    get_form_submission_limiter, remember_submission, submission_fingerprint,
+                )
+
+                def render_error(message, status, retry_after):
+                    form.add_error(None, message)
+                    context = self.get_context(request)
+                    context['form'] = form
+                    response = render(request, self.get_template(request), context, status=status)
+                    response['Retry-After'] = str(retry_after)
+                    return response
+
+                allowed, retry_after = get_form_submission_limiter().consume(get_client_ip(request))
+                if not allowed:
+                    return render_error(
+                        "Too many submissions from your network. Please try again in a minute or contact us on WhatsApp.",
+                        429, retry_after,
+                    )
+
+                # Duplicate of a recent submission (double click, resubmit):
+                # answer it like the first one without saving or sending again
+                fingerprint = submission_fingerprint(f"homepage:{self.pk}", form.cleaned_data)
+                is_first, previous = claim_submission(fingerprint)
+                if not is_first:
+                    if previous == PENDING:
+                        # The first attempt is still being sent and may yet fail
+                        return render_error(
+                            "Your inquiry is still being sent. Please wait a moment and try again.",
+                            409, 5,
+                        )
+                    return redirect('thank_you')
+
                 # Save the form submission to database (without sending Wagtail's email)
-                form_submission = self.process_form_submission(form)
+                try:
+                    form_submission = self.process_form_submission(form)
+                except Exception:
+                    # Release the claim, or every retry would be answered as a duplicate
+                    forget_submission(fingerprint)
+                    raise
                 
                 # Send to Zapier webhook
                 try:
@@ -967,8 +1291,9 @@ class HomePage(AbstractEmailForm):
                     # Log the error but don't fail the submission
                     print(f"Error sending email via Mailtrap: {str(e)}")
                 
+                remember_submission(fingerprint, form_submission.pk)
+
                 # Redirect to thank you page
-                from django.shortcuts import redirect
                 return redirect('thank_you')
         else:
             form = self.get_form(page=self, user=request.user)
@@ -988,15 +1313,16 @@ class HomePage(AbstractEmailForm):
         import requests
         from django.utils import timezone
 
-        # Resolve webhook settings. Prefer request (site-aware), fall back to page site.
+        from .site_settings import get_setting
+
+        # Resolve webhook settings from the per-worker snapshot. Prefer request
+        # (site-aware), fall back to page site.
         webhook_settings = None
         try:
             if request is not None:
-                webhook_settings = WebhookSettings.for_request(request)
+                webhook_settings = get_setting(WebhookSettings, request=request)
             else:
-                site = self.get_site()
-                if site is not None:
-                    webhook_settings = WebhookSettings.for_site(site)
+                webhook_settings = get_setting(WebhookSettings, site=self.get_site())
         except Exception:
             # If settings can't be resolved, leave webhook_settings as None
             webhook_settings = None
@@ -1014,87 +1340,156 @@ class HomePage(AbstractEmailForm):
         }
 
         # Add all form fields
-        for field in self.form_fields.all():
-            field_key = field.clean_name
-            field_value = form.cleaned_data.get(field_key, '')
-            form_data[field.label] = field_value
-
-        # Send POST request to Zapier webhook
-        response = requests.post(
-            webhook_settings.zapier_webhook_url,
-            json=form_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
+        form_data.update(self.get_labelled_form_data(form))
 
-        # Raise exception if request failed
-        response.raise_for_status()
+        # Send POST request to Zapier webhook; keep the payload for
+        # `manage.py replay_webhooks` if it can't be delivered
+        # While Zapier keeps failing the breaker is open and the payload goes
+        # straight to the replay queue instead of waiting out the timeout.
+        from .circuit import CircuitOpenError, zapier_breaker
+        from .webhooks import WebhookDispatcher, get_live_session, record_failed_delivery
 
-        return response
+        try:
+            dispatcher = WebhookDispatcher(webhook_settings.zapier_webhook_url, session=get_live_session())
+            return zapier_breaker.call(dispatcher.post, [form_data])
+        except (requests.RequestException, CircuitOpenError) as e:
+            record_failed_delivery(self, webhook_settings.zapier_webhook_url, form_data, e)
+            raise
     
     def send_via_mailtrap(self, form):
         """
-        Send form submission via Mailtrap SDK
+        Send form submission via Mailtrap SDK, or queue it for a combined
+        email when email_delivery_mode is 'batched' or 'digest'
+        """
+        from django.utils import timezone
+        
+        # Collect form data as {label: value} from the cached field map
+        form_data = self.get_labelled_form_data(form)
+        
+        from .circuit import CircuitOpenError
+        from .notifications import flush_notifications, queue_failed_notification, queue_notification
+        
+        if self.email_delivery_mode == 'immediate':
+            try:
+                self.send_notification_email([(form_data, timezone.now())])
+            except CircuitOpenError:
+                # The email provider is failing; the next flush sends it once
+                # the circuit closes again
+                queue_notification(self, form_data)
+            except Exception as e:
+                # Only errors that a retry can fix are queued
+                queue_failed_notification(self, form_data, e)
+                raise
+            return
+        
+        queue_notification(self, form_data)
+        # Send the pending batch straight away if its window has already passed;
+        # otherwise the scheduled flush task (home/notifications.py) picks it up.
+        flush_notifications(self)
+    
+    def send_notification_email(self, entries):
+        """
+        Send one email covering [(form_data, submitted_at), ...] via the
+        Mailtrap SDK, or through EMAIL_BACKEND when NOTIFICATION_EMAIL_TRANSPORT
+        is 'smtp'
         """
+        from django.conf import settings
+        
+        # Create HTML email content - one render for all submissions
+        html_content = self.generate_batch_email_html(entries)
+        text_content = self.generate_batch_email_text(entries)
+        
+        if len(entries) == 1:
+            form_data = entries[0][0]
+            subject = self.subject or f"New Contact Form Submission from {form_data.get('Name', 'Website')}"
+            category = "Contact Form Submission"
+        else:
+            subject = f"{self.subject or 'New Contact Form Submissions'} ({len(entries)} submissions)"
+            category = "Contact Form Digest"
+        
+        # Parse recipient emails (handle comma-separated emails)
+        recipient_emails = [email.strip() for email in self.to_address.split(',') if email.strip()]
+        sender_email = self.from_address or "noreply@sengleongaircond.com.my"
+        sender_name = self.email_sender_name or "Seng Leong Website"
+        
+        if getattr(settings, 'NOTIFICATION_EMAIL_TRANSPORT', 'mailtrap') == 'smtp':
+            from email.utils import formataddr
+            from django.core.mail import EmailMultiAlternatives
+            from .circuit import smtp_breaker
+            
+            mail = EmailMultiAlternatives(
+                subject=subject,
+                body=text_content,
+                from_email=formataddr((sender_name, sender_email)),
+                to=recipient_emails,
+            )
+            mail.attach_alternative(html_content, "text/html")
+            smtp_breaker.call(mail.send)
+            return
+        
         from decouple import config
         import mailtrap as mt
-        from django.utils import timezone
         
         # Get Mailtrap API token from environment
         api_token = config('MAILTRAP_API_TOKEN', default='')
         if not api_token:
             raise ValueError("MAILTRAP_API_TOKEN not configured in .env file")
         
-        # Collect form data - iterate through the page's form fields
-        form_data = {}
-        for field in self.form_fields.all():
-            # Get the field's clean_name which is used as the form field key
-            field_key = field.clean_name
-            # Get the value from cleaned_data
-            field_value = form.cleaned_data.get(field_key, '')
-            # Use the label as the display name
-            form_data[field.label] = field_value
-        
-        # Create HTML email content
-        html_content = self.generate_email_html(form_data)
-        text_content = self.generate_email_text(form_data)
-        
         # Initialize Mailtrap client
         client = mt.MailtrapClient(token=api_token)
         
-        # Parse recipient emails (handle comma-separated emails)
-        recipient_emails = [email.strip() for email in self.to_address.split(',') if email.strip()]
-        recipient_addresses = [mt.Address(email=email) for email in recipient_emails]
-        
         # Create the email
         mail = mt.Mail(
-            sender=mt.Address(
-                email=self.from_address or "noreply@sengleongaircond.com.my", 
-                name=self.email_sender_name or "Seng Leong Website"
-            ),
-            to=recipient_addresses,
-            subject=self.subject or f"New Contact Form Submission from {form_data.get('Name', 'Website')}",
+            sender=mt.Address(email=sender_email, name=sender_name),
+            to=[mt.Address(email=email) for email in recipient_emails],
+            subject=subject,
             text=text_content,
             html=html_content,
-            category="Contact Form Submission"
+            category=category
         )
         
-        # Send the email
-        client.send(mail)
+        # Send the email; fails fast with CircuitOpenError while Mailtrap is down
+        from .circuit import mailtrap_breaker
+        
+        mailtrap_breaker.call(client.send, mail)
     
-    def generate_email_html(self, form_data):
+    def generate_email_html(self, form_data, submitted_at=None):
         """Generate beautiful HTML email template"""
+        return self.generate_batch_email_html([(form_data, submitted_at)])
+    
+    def generate_batch_email_html(self, entries):
+        """
+        Generate one HTML email for several submissions, given as
+        [(form_data, submitted_at), ...]. The document is rendered once and
+        each submission only adds its field blocks.
+        """
         from django.utils import timezone
         
-        fields_html = ""
-        for field_name, field_value in form_data.items():
-            if field_value:
+        sections = []
+        for number, (form_data, submitted_at) in enumerate(entries, 1):
+            fields_html = ""
+            if len(entries) > 1:
                 fields_html += f"""
+                <h2 class="submission-heading">Submission {number} of {len(entries)}</h2>
+                """
+            for field_name, field_value in form_data.items():
+                if field_value:
+                    fields_html += f"""
                 <div class="field">
                     <div class="label">{field_name}:</div>
                     <div class="value">{field_value}</div>
                 </div>
                 """
+            fields_html += f"""
+                <div class="field">
+                    <div class="label">Submitted At:</div>
+                    <div class="value">{(submitted_at or timezone.now()).strftime('%d %B %Y, %I:%M %p %Z')}</div>
+                </div>
+                """
+            sections.append(fields_html)
+        
+        title = "New Contact Form Submission" if len(entries) == 1 else f"{len(entries)} New Contact Form Submissions"
+        fields_html = "".join(sections)
         
         html = f"""
         <!DOCTYPE html>
@@ -1137,6 +1532,13 @@ class HomePage(AbstractEmailForm):
                 .value {{
                     color: #555;
                 }}
+                .submission-heading {{
+                    color: #1a237e;
+                    font-size: 18px;
+                    margin: 30px 0 10px 0;
+                    padding-bottom: 5px;
+                    border-bottom: 2px solid #0097a7;
+                }}
                 .footer {{
                     background: #1a237e;
                     color: white;
@@ -1149,17 +1551,12 @@ class HomePage(AbstractEmailForm):
         </head>
         <body>
             <div class="header">
-                <h1 style="margin: 0;">New Contact Form Submission</h1>
+                <h1 style="margin: 0;">{title}</h1>
                 <p style="margin: 10px 0 0 0;">from Seng Leong Engineering Website</p>
             </div>
             
             <div class="content">
                 {fields_html}
-                
-                <div class="field">
-                    <div class="label">Submitted At:</div>
-                    <div class="value">{timezone.now().strftime('%d %B %Y, %I:%M %p %Z')}</div>
-                </div>
             </div>
             
             <div class="footer">
@@ -1171,16 +1568,28 @@ class HomePage(AbstractEmailForm):
         """
         return html
     
-    def generate_email_text(self, form_data):
+    def generate_email_text(self, form_data, submitted_at=None):
         """Generate plain text email"""
+        return self.generate_batch_email_text([(form_data, submitted_at)])
+    
+    def generate_batch_email_text(self, entries):
+        """Generate one plain text email for [(form_data, submitted_at), ...]"""
         from django.utils import timezone
         
-        text = "NEW CONTACT FORM SUBMISSION\n\n"
-        for field_name, field_value in form_data.items():
-            if field_value:
-                text += f"{field_name}: {field_value}\n"
+        if len(entries) == 1:
+            text = "NEW CONTACT FORM SUBMISSION\n\n"
+        else:
+            text = f"{len(entries)} NEW CONTACT FORM SUBMISSIONS\n\n"
+        for number, (form_data, submitted_at) in enumerate(entries, 1):
+            if len(entries) > 1:
+                text += f"--- Submission {number} of {len(entries)} ---\n"
+            for field_name, field_value in form_data.items():
+                if field_value:
+                    text += f"{field_name}: {field_value}\n"
+            text += f"\nSubmitted at: {(submitted_at or timezone.now()).strftime('%d %B %Y, %I:%M %p %Z')}\n"
+            if number < len(entries):
+                text += "\n"
         
-        text += f"\nSubmitted at: {timezone.now().strftime('%d %B %Y, %I:%M %p %Z')}\n"
         text += "\n---\nThis email was sent from the contact form on sengleongaircond.com\n"
         text += "Seng Leong Engineering Sdn Bhd\n"
         
@@ -0,0 +1,174 @@
+"""
+Batched and digest delivery of HomePage notification emails.
+
+In 'batched' and 'digest' mode ``HomePage.send_via_mailtrap`` stores each
+submission as a ``PendingNotification`` instead of emailing it. Once the oldest
+pending submission of a page is older than the page's window
+(``email_batch_window`` seconds, or ``email_digest_interval`` minutes) all of
+them are sent as one email, rendered in a single pass by
+``HomePage.generate_batch_email_html``.
+
+Flushing happens opportunistically when the next submission arrives, and from
+``home.tasks.flush_notifications_task``: queueing a page's first pending
+submission schedules that task for when the window closes, and it schedules
+itself again ``NOTIFICATION_RETRY_DELAY`` seconds later while submissions are
+left (a failed send, or a backlog larger than one email). So a quiet period
+never leaves submissions unsent, and a worker restart loses nothing, as the
+task is stored until ``manage.py db_worker`` runs it. ``manage.py
+flush_notifications`` does the same from cron. A cache lock per page keeps two
+workers from sending the same batch.
+
+In 'immediate' mode a submission is only queued here when the send failed for
+a reason that retrying can fix (network trouble, a provider 5xx or 429, an open
+circuit breaker - see home/circuit.py); the next flush retries it. Permanent
+errors such as a missing API token are logged instead of being retried forever.
+"""
+import datetime
+import logging
+import smtplib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on submissions in one email; anything beyond goes in the next one
+MAX_BATCH_SIZE = 100
+
+LOCK_TIMEOUT = 300
+
+
+def get_flush_delay(page):
+    if page.email_delivery_mode == 'digest':
+        return datetime.timedelta(minutes=page.email_digest_interval)
+    if page.email_delivery_mode == 'batched':
+        return datetime.timedelta(seconds=page.email_batch_window)
+    return datetime.timedelta(0)
+
+
+def get_retry_delay():
+    return datetime.timedelta(seconds=getattr(settings, "NOTIFICATION_RETRY_DELAY", 30))
+
+
+def queue_notification(page, form_data):
+    from .models import PendingNotification
+
+    notification = PendingNotification.objects.create(page=page, form_data=form_data)
+    if PendingNotification.objects.filter(page=page).count() == 1:
+        # The first one of a new batch: make sure it is flushed once due
+        schedule_flush(page)
+    return notification
+
+
+def schedule_flush(page):
+    """
+    Enqueue ``flush_notifications_task`` for ``page`` (once the transaction
+    commits), to run when its oldest pending submission is due, and at least
+    ``NOTIFICATION_RETRY_DELAY`` from now. Does nothing with a task backend
+    that cannot defer tasks, such as the inline one used in development.
+    """
+    from .models import PendingNotification
+    from .tasks import flush_notifications_task
+
+    if not flush_notifications_task.get_backend().supports_defer:
+        return None
+    oldest = PendingNotification.objects.filter(page=page).values_list('submit_time', flat=True).first()
+    if oldest is None:
+        return None
+    run_after = max(oldest + get_flush_delay(page), timezone.now() + get_retry_delay())
+    return flush_notifications_task.using(run_after=run_after).enqueue(page.pk)
+
+
+def is_transient(error):
+    """Return True if sending again later may succeed after ``error``"""
+    import requests
+
+    from .circuit import CircuitOpenError
+
+    if isinstance(error, (CircuitOpenError, requests.RequestException)):
+        return True
+    try:
+        from mailtrap.exceptions import APIError
+    except ImportError:
+        APIError = None
+    if APIError is not None and isinstance(error, APIError):
+        return error.status == 429 or error.status >= 500
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 4xx replies are temporary failures in SMTP
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+def queue_failed_notification(page, form_data, error):
+    """
+    Queue a submission whose immediate email failed, if retrying can help.
+    Returns True if it was queued.
+    """
+    if is_transient(error):
+        queue_notification(page, form_data)
+        return True
+    logger.error("Notification email for page %s failed and will not be retried: %s", page.pk, error)
+    return False
+
+
+def flush_notifications(page, force=False):
+    """
+    Send the pending submissions of ``page`` as one email if the oldest has
+    waited long enough (or ``force``). Returns the number of submissions sent.
+
+    Rows are only deleted after Mailtrap accepted the email, so a failed send
+    is retried on the next flush.
+    """
+    from .models import PendingNotification
+
+    pending = PendingNotification.objects.filter(page=page)
+    oldest = pending.values_list('submit_time', flat=True).first()
+    if oldest is None:
+        return 0
+    if not force and timezone.now() - oldest < get_flush_delay(page):
+        return 0
+
+    lock_key = f"home:notifications:flush:{page.pk}"
+    if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        # Another worker is sending this page's batch right now
+        return 0
+    try:
+        entries = list(pending[:MAX_BATCH_SIZE])
+        if not entries:
+            return 0
+        page.send_notification_email([(entry.form_data, entry.submit_time) for entry in entries])
+        PendingNotification.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+        return len(entries)
+    finally:
+        cache.delete(lock_key)
+
+
+def flush_page(page, force=False):
+    """Flush ``page`` until less than a full email is left; returns the number sent"""
+    total = 0
+    try:
+        # Keep going while a backlog larger than one email remains
+        while True:
+            count = flush_notifications(page, force=force or total > 0)
+            total += count
+            if count < MAX_BATCH_SIZE:
+                break
+    except Exception:
+        logger.exception("Error sending batched notifications for page %s", page.pk)
+    return total
+
+
+def flush_all_notifications(force=False):
+    """Flush every page with pending submissions; returns {page: sent count}"""
+    from .models import HomePage, PendingNotification
+
+    sent = {}
+    page_ids = PendingNotification.objects.order_by().values_list('page_id', flat=True).distinct()
+    for page in HomePage.objects.filter(pk__in=page_ids):
+        total = flush_page(page, force=force)
+        if total:
+            sent[page] = total
+    return sent
@@ -0,0 +1,34 @@
+from django.db.models import Sum
+from django.utils.functional import cached_property
+from wagtail.contrib.forms.panels import FormSubmissionsPanel
+
+
+class RollupSubmissionsPanel(FormSubmissionsPanel):
+    """
+    FormSubmissionsPanel that reads the submission count from the daily rollups
+    (home/rollups.py) instead of counting every FormSubmission row, and the
+    latest submission time from the (page_id, submit_time) index.
+    """
+
+    class BoundPanel(FormSubmissionsPanel.BoundPanel):
+        @cached_property
+        def submission_count(self):
+            from .models import SubmissionRollup
+            from .rollups import TOTAL
+
+            if not self.instance.pk:
+                return 0
+            total = SubmissionRollup.objects.filter(
+                page_id=self.instance.pk, dimension=TOTAL
+            ).aggregate(total=Sum('count'))['total']
+            return total or 0
+
+        def get_context_data(self, parent_context=None):
+            context = super(FormSubmissionsPanel.BoundPanel, self).get_context_data(parent_context)
+            context.update({
+                "submission_count": self.submission_count,
+                "last_submit_time": self.submissions.order_by("-submit_time")
+                .values_list("submit_time", flat=True)
+                .first(),
+            })
+            return context
@@ -0,0 +1,105 @@
+"""
+Low-quality image placeholders (LQIP) for HomePage renditions.
+
+For every rendition shown on the HomePage - the hero background, partner logos
+and review avatars - a ``RenditionPlaceholder`` row holds a tiny
+(``LQIP_SIZE`` pixels) base64 preview and the average colour. The template
+paints it behind the real image, whose width/height the rendition already
+carries, so the browser reserves the space and shows something immediately.
+
+The preview is made once, when the rendition is created (a ``post_save``
+receiver in ``home.signals``), and then read from the cache, falling back to
+the database; displaying a rendition never decodes an image. Renditions that
+Wagtail bulk-creates, or that predate placeholders, get theirs from
+``manage.py create_placeholders``.
+"""
+import base64
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY = "home:lqip:{}"
+# Seconds a rendition without a placeholder is remembered as such
+MISSING_TIMEOUT = 300
+
+
+def make_placeholder(rendition):
+    """Return (data_uri, colour) for ``rendition``"""
+    from PIL import Image as PILImage
+
+    size = getattr(settings, "LQIP_SIZE", 16)
+    with rendition.file.open("rb") as f:
+        pil_image = PILImage.open(f)
+        pil_image.draft("RGB", (size * 4, size * 4))
+        pil_image.thumbnail((size, size))
+        has_alpha = pil_image.mode in ("RGBA", "LA", "P") and (
+            pil_image.mode != "P" or "transparency" in pil_image.info
+        )
+        pil_image = pil_image.convert("RGBA" if has_alpha else "RGB")
+
+    red, green, blue = pil_image.convert("RGB").resize((1, 1), PILImage.BOX).getpixel((0, 0))
+    output = BytesIO()
+    if has_alpha:
+        pil_image.save(output, "PNG", optimize=True)
+        mime = "image/png"
+    else:
+        pil_image.save(output, "JPEG", quality=50)
+        mime = "image/jpeg"
+    data_uri = f"data:{mime};base64,{base64.b64encode(output.getvalue()).decode('ascii')}"
+    return data_uri, f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def create_placeholder(rendition):
+    """Make and store the RenditionPlaceholder for a new ``rendition``; returns it, or None on error"""
+    from .models import RenditionPlaceholder
+
+    try:
+        data_uri, colour = make_placeholder(rendition)
+    except (OSError, ValueError) as e:
+        print(f"Error creating placeholder for rendition {rendition.pk}: {str(e)}")
+        return None
+    placeholder, _ = RenditionPlaceholder.objects.get_or_create(
+        rendition=rendition, defaults={"data_uri": data_uri, "colour": colour}
+    )
+    cache.set(get_cache_key(rendition), placeholder, None)
+    return placeholder
+
+
+def get_cache_key(rendition):
+    # Keyed by file name: rendition ids can be reused, and with content-addressed
+    # storage identical renditions share one name
+    return CACHE_KEY.format(rendition.file.name)
+
+
+def get_placeholder(rendition):
+    """Return the stored RenditionPlaceholder for ``rendition``, or None if it has none"""
+    from .models import RenditionPlaceholder
+
+    if rendition is None or not rendition.pk:
+        return None
+    key = get_cache_key(rendition)
+    placeholder = cache.get(key)
+    if placeholder is not None:
+        return placeholder or None
+
+    placeholder = RenditionPlaceholder.objects.filter(rendition=rendition).first()
+    # Remember a missing placeholder for a while too, until create_placeholders runs
+    cache.set(key, placeholder or False, None if placeholder else MISSING_TIMEOUT)
+    return placeholder
+
+
+def create_missing_placeholders(stdout=None):
+    """Create placeholders for every rendition without one. Returns (created, failed)"""
+    from wagtail.images import get_image_model
+
+    Rendition = get_image_model().get_rendition_model()
+    created = failed = 0
+    for rendition in Rendition.objects.filter(placeholder__isnull=True).iterator():
+        if create_placeholder(rendition) is None:
+            failed += 1
+            continue
+        created += 1
+        if stdout:
+            stdout.write(f"  {rendition.file.name}")
+    return created, failed
@@ -0,0 +1,152 @@
+"""
+Incremental analytics rollups for form submissions.
+
+Every submission to a form page bumps a handful of counters in
+``SubmissionRollup``, keyed by (page, day, dimension, value): the daily total
+(empty dimension) plus one counter per configured dimension, e.g. the
+submitted location or budget band. Reports and the editor's submissions panel
+read these counters instead of scanning and JSON-decoding FormSubmission rows.
+
+Dimensions are configured with ``SUBMISSION_ROLLUP_DIMENSIONS``, mapping a
+dimension name to the clean_name prefix of the form field that feeds it.
+Budget values are grouped into ``SUBMISSION_BUDGET_BANDS``. ``manage.py
+rebuild_submission_rollups`` recomputes everything from the submissions.
+
+Deleting a submission (e.g. in the admin) takes it off the counters again
+(``home.signals``); moving submissions to the archive does not, as archived
+submissions still count.
+"""
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TOTAL = ""
+UNSPECIFIED = "Unspecified"
+AMOUNT = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+_state = threading.local()
+
+
+def get_dimension_fields(form_data):
+    """Return {dimension: clean_name} for the dimensions present in ``form_data``"""
+    fields = {}
+    for dimension, prefix in getattr(settings, "SUBMISSION_ROLLUP_DIMENSIONS", {}).items():
+        for clean_name in form_data:
+            if clean_name.startswith(prefix):
+                fields[dimension] = clean_name
+                break
+    return fields
+
+
+def get_budget_band(value):
+    """
+    Group a free-text budget such as "RM 2,500" into one of
+    SUBMISSION_BUDGET_BANDS. Only the first amount counts, so a range like
+    "RM1000-2000" falls in the band of RM1000.
+    """
+    match = AMOUNT.search(str(value or ""))
+    if match is None:
+        return UNSPECIFIED
+    amount = float(match.group().replace(",", ""))
+    bands = getattr(settings, "SUBMISSION_BUDGET_BANDS", [])
+    lower = 0
+    for upper in bands:
+        if amount < upper:
+            return f"RM{lower:,}-{upper - 1:,}" if lower else f"Below RM{upper:,}"
+        lower = upper
+    return f"RM{lower:,}+"
+
+
+def normalise_value(dimension, value):
+    if dimension == "budget":
+        return get_budget_band(value)
+    value = " ".join(str(value or "").split()).title()
+    return value[:100] or UNSPECIFIED
+
+
+def get_rollup_keys(form_data):
+    """Return the (dimension, value) pairs a submission counts towards"""
+    keys = [(TOTAL, TOTAL)]
+    for dimension, clean_name in get_dimension_fields(form_data).items():
+        keys.append((dimension, normalise_value(dimension, form_data.get(clean_name))))
+    return keys
+
+
+def record_submission(submission):
+    """
+    Count ``submission`` in the rollups with a single upsert statement.
+
+    Called from process_form_submission; analytics must never break lead
+    capture, so errors are logged and swallowed. The statement runs in a
+    savepoint, so a failure does not break the caller's transaction.
+    """
+    from .models import SubmissionRollup
+
+    try:
+        day = timezone.localdate(submission.submit_time)
+        rows = [
+            (submission.page_id, day, dimension, value)
+            for dimension, value in get_rollup_keys(submission.form_data)
+        ]
+        table = connection.ops.quote_name(SubmissionRollup._meta.db_table)
+        placeholders = ", ".join(["(%s, %s, %s, %s, 1)"] * len(rows))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (page_id, day, dimension, value, count) VALUES {placeholders} "
+                "ON CONFLICT (page_id, day, dimension, value) DO UPDATE SET count = "
+                f"{table}.count + 1",
+                [param for row in rows for param in row],
+            )
+    except Exception:
+        logger.exception("Error updating submission rollups for submission %s", submission.pk)
+
+
+@contextmanager
+def keep_rollups():
+    """Leave the counters alone for submissions deleted inside this block (archiving)"""
+    previous = getattr(_state, "keep", False)
+    _state.keep = True
+    try:
+        yield
+    finally:
+        _state.keep = previous
+
+
+def unrecord_submission(submission):
+    """Take a deleted ``submission`` off the rollups it was counted in"""
+    from .models import SubmissionRollup
+
+    if getattr(_state, "keep", False):
+        return
+    try:
+        keys = Q()
+        for dimension, value in get_rollup_keys(submission.form_data):
+            keys |= Q(dimension=dimension, value=value)
+        with transaction.atomic():
+            SubmissionRollup.objects.filter(
+                keys,
+                page_id=submission.page_id,
+                day=timezone.localdate(submission.submit_time),
+                count__gt=0,
+            ).update(count=F("count") - 1)
+    except Exception:
+        logger.exception("Error updating submission rollups for deleted submission %s", submission.pk)
+
+
+def build_rollups(submissions):
+    """Return a Counter of (page_id, day, dimension, value) for an iterable of submissions"""
+    counts = Counter()
+    for page_id, submit_time, form_data in submissions:
+        day = timezone.localdate(submit_time)
+        for dimension, value in get_rollup_keys(form_data):
+            counts[(page_id, day, dimension, value)] += 1
+    return counts
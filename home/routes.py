@@ -0,0 +1,92 @@
+"""
+Known-good public routes, used to answer unknown paths with a cheap 404.
+
+``known_routes`` holds, per worker, the site-relative paths of every live page
+and the old paths of every redirect. Publishing, unpublishing, moving or
+deleting a page and saving or deleting a redirect or site bumps a generation
+counter in the shared cache (see ``home.signals`` and ``home.snapshots``); each
+worker notices within ``KNOWN_ROUTES_CHECK_INTERVAL`` seconds and rebuilds.
+"""
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+from .snapshots import WorkerSnapshot
+
+
+def build_known_routes():
+    """
+    Return (paths, prefixes) of live pages and redirects.
+
+    ``paths`` holds exact site-relative page paths ("/", "/contact/") and
+    normalised redirect paths ("/old-page"). ``prefixes`` holds pages whose
+    type overrides ``route()`` and may serve sub-paths of their own.
+    """
+    from wagtail.contrib.redirects.models import Redirect
+    from wagtail.models import Page, Site
+
+    paths = set()
+    prefixes = set()
+
+    site_roots = [
+        root_path for root_path in Site.objects.values_list("root_page__url_path", flat=True) if root_path
+    ]
+    for page in Page.objects.live().only("url_path", "content_type"):
+        for root_path in site_roots:
+            if page.url_path.startswith(root_path):
+                path = page.url_path[len(root_path) - 1:]
+                paths.add(path)
+                if page.specific_class and page.specific_class.route is not Page.route:
+                    prefixes.add(path)
+
+    for old_path in Redirect.objects.values_list("old_path", flat=True):
+        paths.add(old_path)
+        paths.add(urlparse(old_path).path)
+
+    return frozenset(paths), tuple(sorted(prefixes))
+
+
+class KnownRoutes(WorkerSnapshot):
+    """Per-worker snapshot of known routes with a bounded LRU of per-path verdicts"""
+
+    generation_key = "home:known-routes:generation"
+    check_interval_setting = "KNOWN_ROUTES_CHECK_INTERVAL"
+
+    def __init__(self):
+        super().__init__()
+        self.paths = frozenset()
+        self.prefixes = ()
+        self.verdicts = OrderedDict()
+
+    def load(self):
+        self.paths, self.prefixes = build_known_routes()
+        self.verdicts.clear()
+
+    def get_verdict(self, path):
+        with self.lock:
+            verdict = self.verdicts.get(path)
+            if verdict is not None:
+                self.verdicts.move_to_end(path)
+            return verdict
+
+    def set_verdict(self, path, verdict):
+        with self.lock:
+            self.verdicts[path] = verdict
+            if len(self.verdicts) > getattr(settings, "KNOWN_ROUTES_LRU_SIZE", 2048):
+                self.verdicts.popitem(last=False)
+
+    def is_known_page_path(self, path):
+        if not path.endswith("/"):
+            path += "/"
+        return path in self.paths or path.startswith(self.prefixes)
+
+    def is_known_redirect_path(self, path):
+        from django.utils.encoding import uri_to_iri
+        from wagtail.contrib.redirects.models import Redirect
+
+        normalised = Redirect.normalise_path(path)
+        return normalised in self.paths or uri_to_iri(normalised) in self.paths
+
+
+known_routes = KnownRoutes()
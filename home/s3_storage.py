@@ -0,0 +1,23 @@
+"""
+Media on S3-compatible object storage (AWS S3, MinIO, ...), so several web
+replicas can share uploads and renditions:
+
+    MEDIA_STORAGE=s3 AWS_STORAGE_BUCKET_NAME=media AWS_S3_ENDPOINT_URL=http://localhost:9000
+
+``S3MediaStorage`` is django-storages' ``S3Storage`` with the same
+content-addressed names as ``ContentAddressedStorage`` plus ``RemoteMediaMixin``
+(local cache of originals, memoized URLs). Requires ``django-storages[s3]``;
+this module is only imported when ``STORAGES["default"]`` points at it.
+"""
+from storages.backends.s3 import S3Storage
+
+from .storage import ContentAddressedMixin, RemoteMediaMixin
+
+
+class S3MediaStorage(ContentAddressedMixin, RemoteMediaMixin, S3Storage):
+    def get_url_cache_timeout(self):
+        timeout = super().get_url_cache_timeout()
+        if self.querystring_auth:
+            # A memoized signed URL must not outlive its signature
+            return min(timeout, self.querystring_expire // 2)
+        return timeout
@@ -0,0 +1,94 @@
+"""
+Deferred loading of third-party scripts pasted into the HomePage.
+
+Tag snippets in ``embed_head_code`` / ``embed_body_code`` and in the "HTML"
+blocks of the content StreamFields run as soon as the parser reaches them, so
+Google Tag Manager and friends block rendering and compete with the hero
+image. Each embed has a loading mode:
+
+critical     the HTML is output unchanged, as before;
+idle         scripts run after the page has loaded and the browser is idle;
+interaction  scripts run on the first scroll, click, tap or key press (or
+             after ``INTERACTION_TIMEOUT`` ms as a fallback).
+
+``defer_scripts`` rewrites the ``<script>`` tags of a deferred embed into inert
+``<script type="text/plain" data-load="...">`` placeholders; ``LOADER_SCRIPT``
+(emitted once in ``<head>`` by ``{% script_loader %}``) turns them back into
+live scripts in document order when their moment comes. Everything else in
+the embed (``<noscript>`` fallbacks, meta tags, pixels) is left untouched.
+"""
+import re
+
+from django.utils.html import escape
+
+CRITICAL = "critical"
+IDLE = "idle"
+INTERACTION = "interaction"
+
+LOADING_CHOICES = [
+    (CRITICAL, "Critical - run while the page loads"),
+    (IDLE, "Deferred - run after first paint, when the browser is idle"),
+    (INTERACTION, "On interaction - run on the first scroll, click, tap or key press"),
+]
+
+# Fallback for visitors who never interact, in milliseconds
+INTERACTION_TIMEOUT = 8000
+
+SCRIPT_TAG = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+TYPE_ATTRIBUTE = re.compile(r"""\stype\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+JAVASCRIPT_TYPES = {"", "text/javascript", "application/javascript", "module"}
+
+LOADER_SCRIPT = """<script>
+(function () {
+    var started = {};
+    function run(mode) {
+        started[mode] = true;
+        document.querySelectorAll('script[type="text/plain"][data-load="' + mode + '"]').forEach(function (inert) {
+            var script = document.createElement('script');
+            for (var i = 0; i < inert.attributes.length; i++) {
+                var attribute = inert.attributes[i];
+                if (attribute.name !== 'type' && attribute.name !== 'data-load' && attribute.name !== 'data-type') {
+                    script.setAttribute(attribute.name, attribute.value);
+                }
+            }
+            if (inert.dataset.type) script.type = inert.dataset.type;
+            // Keep external scripts in document order, like the original tags
+            if (script.src && !inert.hasAttribute('async')) script.async = false;
+            script.text = inert.text;
+            inert.parentNode.replaceChild(script, inert);
+        });
+    }
+    // For HTML inserted later (lazy homepage sections) once its moment has already come
+    window.runDeferredScripts = function () { Object.keys(started).forEach(run); };
+    var idle = window.requestIdleCallback || function (callback) { setTimeout(callback, 1); };
+    window.addEventListener('load', function () { idle(function () { run('idle'); }); });
+    var events = ['scroll', 'pointerdown', 'keydown', 'touchstart'], done = false;
+    function interact() {
+        if (done) return;
+        done = true;
+        events.forEach(function (name) { window.removeEventListener(name, interact); });
+        run('interaction');
+    }
+    events.forEach(function (name) { window.addEventListener(name, interact, {passive: true}); });
+    setTimeout(interact, %(timeout)d);
+})();
+</script>""" % {"timeout": INTERACTION_TIMEOUT}
+
+
+def defer_scripts(html, loading):
+    """Return ``html`` with its JavaScript ``<script>`` tags made inert until ``loading`` (idle/interaction)"""
+    if not html or loading not in (IDLE, INTERACTION):
+        return html
+
+    def rewrite(match):
+        attributes, body = match.groups()
+        type_match = TYPE_ATTRIBUTE.search(attributes)
+        script_type = next((group for group in type_match.groups() if group is not None), "") if type_match else ""
+        if script_type.strip().lower() not in JAVASCRIPT_TYPES:
+            # JSON-LD, templates and the like are data, not code
+            return match.group(0)
+        attributes = TYPE_ATTRIBUTE.sub("", attributes)
+        data_type = f' data-type="{escape(script_type)}"' if script_type else ""
+        return f'<script type="text/plain" data-load="{loading}"{data_type}{attributes}>{body}</script>'
+
+    return SCRIPT_TAG.sub(rewrite, html)
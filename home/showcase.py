@@ -0,0 +1,40 @@
+"""
+Per-worker snapshot of the homepage showcase snippets (reviews and partners).
+
+``GoogleReview`` and ``BrandPartner`` are standalone snippets rather than page
+children, so they no longer go through page revisions. ``showcase`` loads each
+list with a single query (plus its image renditions) and keeps it in process
+memory; saving or deleting a review, partner or image bumps a generation
+counter (see ``home.signals`` and ``home.snapshots``) and each worker reloads
+within ``SHOWCASE_CHECK_INTERVAL`` seconds.
+"""
+from .snapshots import WorkerSnapshot
+
+
+class ShowcaseSnapshot(WorkerSnapshot):
+    generation_key = "home:showcase:generation"
+    check_interval_setting = "SHOWCASE_CHECK_INTERVAL"
+
+    def __init__(self):
+        super().__init__()
+        self.reviews = []
+        self.partners = []
+
+    def load(self):
+        from .models import BrandPartner, GoogleReview
+
+        self.reviews = list(
+            GoogleReview.objects.select_related("profile_picture").prefetch_related("profile_picture__renditions")
+        )
+        self.partners = list(BrandPartner.objects.select_related("image").prefetch_related("image__renditions"))
+
+    def get_reviews(self):
+        self.refresh()
+        return self.reviews
+
+    def get_partners(self):
+        self.refresh()
+        return self.partners
+
+
+showcase = ShowcaseSnapshot()
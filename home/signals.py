@@ -0,0 +1,119 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from wagtail.contrib.forms.models import FormSubmission
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.contrib.settings.models import BaseGenericSetting, BaseSiteSetting
+from wagtail.images import get_image_model
+from wagtail.models import Page, Site
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from .models import BrandPartner, GoogleReview
+from .rollups import unrecord_submission
+from .routes import known_routes
+from .showcase import showcase
+from .snapshots import bump_generation
+from .site_settings import site_settings
+
+
+# Known routes - rebuilt whenever the set of live pages or redirects changes
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_page_move)
+def invalidate_known_routes_for_page(sender, **kwargs):
+    known_routes.invalidate()
+
+
+@receiver(post_delete)
+def invalidate_known_routes_for_deleted_page(sender, instance, **kwargs):
+    if isinstance(instance, Page):
+        known_routes.invalidate()
+
+
+@receiver(post_save, sender=Redirect)
+@receiver(post_delete, sender=Redirect)
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def invalidate_known_routes(sender, **kwargs):
+    known_routes.invalidate()
+
+
+# Site / settings snapshot - reloaded whenever a Site or any setting model changes
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_site_settings(sender, **kwargs):
+    if issubclass(sender, (Site, BaseSiteSetting, BaseGenericSetting)):
+        site_settings.invalidate()
+
+
+# Showcase snapshot - reloaded whenever a review, partner or image changes
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_showcase(sender, **kwargs):
+    if issubclass(sender, (GoogleReview, BrandPartner, get_image_model())):
+        showcase.invalidate()
+
+
+# Content API - cached JSON responses dropped after a page is (un)published or deleted
+@receiver(page_published)
+@receiver(page_unpublished)
+def invalidate_content_api(sender, **kwargs):
+    from .api import GENERATION_KEY
+
+    bump_generation(GENERATION_KEY)
+
+
+@receiver(post_delete)
+def invalidate_content_api_for_deleted_page(sender, instance, **kwargs):
+    if isinstance(instance, Page):
+        invalidate_content_api(sender)
+
+
+# Static export - re-rendered in the background after a page is (un)published
+@receiver(page_published)
+@receiver(page_unpublished)
+def export_static_site(sender, **kwargs):
+    if getattr(settings, "STATIC_EXPORT_ON_PUBLISH", False):
+        from .static_export import request_export
+
+        transaction.on_commit(request_export)
+
+
+# Image originals - optimised by a background task after upload or when the file
+# is replaced (home/image_optimization.py); title and focal point edits are left alone
+@receiver(pre_save)
+def detect_image_file_change(sender, instance, raw=False, **kwargs):
+    if raw or sender is not get_image_model() or not getattr(settings, "IMAGE_OPTIMIZE_ON_UPLOAD", False):
+        return
+    if instance._state.adding:
+        instance._file_changed = True
+        return
+    stored_name = sender.objects.filter(pk=instance.pk).values_list("file", flat=True).first()
+    instance._file_changed = stored_name != instance.file.name
+
+
+@receiver(post_save)
+def optimize_uploaded_image(sender, instance, raw=False, **kwargs):
+    if raw or sender is not get_image_model() or not getattr(instance, "_file_changed", False):
+        return
+    from .tasks import optimize_image_task
+
+    instance._file_changed = False
+    transaction.on_commit(lambda: optimize_image_task.enqueue(instance.pk))
+
+
+# Image placeholders - made once, when a rendition is created (home/placeholders.py)
+@receiver(post_save)
+def create_rendition_placeholder(sender, instance, created=False, raw=False, **kwargs):
+    if raw or not created or sender is not get_image_model().get_rendition_model():
+        return
+    from .placeholders import create_placeholder
+
+    create_placeholder(instance)
+
+
+# Submission rollups - deleted submissions no longer count
+@receiver(post_delete, sender=FormSubmission)
+def unrecord_deleted_submission(sender, instance, **kwargs):
+    unrecord_submission(instance)
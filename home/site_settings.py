@@ -0,0 +1,116 @@
+"""
+Query-free Site and site-settings resolution.
+
+``site_settings`` keeps, per worker, the Site matched for each (hostname, port)
+and every Wagtail setting instance already loaded, keyed by model and site id.
+Saving or deleting a Site or any setting model invalidates it on every worker
+(see ``home.signals``). Use ``get_site_for_request()`` and ``get_setting()``
+instead of ``Site.find_for_request()`` / ``Setting.for_request()``;
+``home.middleware.CachedSiteMiddleware`` and the ``settings`` context processor
+below route Wagtail's own lookups through the snapshot too.
+"""
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http.request import split_domain_port
+from wagtail.contrib.settings.context_processors import SettingModuleProxy, SettingProxy
+from wagtail.contrib.settings.models import BaseGenericSetting, BaseSiteSetting
+from wagtail.models import Site
+
+from .snapshots import WorkerSnapshot
+
+
+class SiteSettingsSnapshot(WorkerSnapshot):
+    generation_key = "home:site-settings:generation"
+    check_interval_setting = "SITE_SETTINGS_CHECK_INTERVAL"
+
+    def __init__(self):
+        super().__init__()
+        self.sites = OrderedDict()
+        self.settings = {}
+
+    def load(self):
+        self.sites.clear()
+        self.settings.clear()
+
+    def get_site(self, request):
+        """
+        Return the Site for ``request`` - a fresh instance built from cached
+        field values, so per-request state (e.g. ``root_page``) isn't shared.
+        """
+        self.refresh()
+        key = (split_domain_port(request._get_raw_host())[0], request.get_port())
+        with self.lock:
+            fields = self.sites.get(key, False)
+            if fields is not False:
+                self.sites.move_to_end(key)
+        if fields is False:
+            site = Site._find_for_request(request)
+            fields = None
+            if site is not None:
+                fields = {f.attname: getattr(site, f.attname) for f in Site._meta.concrete_fields}
+            with self.lock:
+                self.sites[key] = fields
+                # Host headers are client-controlled: keep the map bounded
+                if len(self.sites) > getattr(settings, "SITE_SETTINGS_MAX_HOSTS", 256):
+                    self.sites.popitem(last=False)
+        if fields is None:
+            return None
+        return Site.from_db("default", list(fields), list(fields.values()))
+
+    def get_setting(self, model, site=None):
+        """Return the ``model`` setting instance for ``site`` (ignored for generic settings)"""
+        self.refresh()
+        site_id = site.pk if site is not None and issubclass(model, BaseSiteSetting) else None
+        key = (model._meta.label_lower, site_id)
+        instance = self.settings.get(key)
+        if instance is None:
+            if issubclass(model, BaseSiteSetting):
+                instance = model.for_site(site)
+            else:
+                instance = model.load()
+            with self.lock:
+                self.settings[key] = instance
+        return instance
+
+
+site_settings = SiteSettingsSnapshot()
+
+
+def get_site_for_request(request):
+    """Return the Site for ``request``, cached on the request like Wagtail does"""
+    if not hasattr(request, "_wagtail_site"):
+        request._wagtail_site = site_settings.get_site(request)
+    return request._wagtail_site
+
+
+def get_setting(model, request=None, site=None):
+    """Return a site (or generic) setting instance without querying the database"""
+    if request is not None and site is None:
+        site = get_site_for_request(request)
+    if issubclass(model, BaseSiteSetting) and site is None:
+        raise model.DoesNotExist(f"{model.__name__} does not exist for site None.")
+    return site_settings.get_setting(model, site)
+
+
+class CachedSettingModuleProxy(SettingModuleProxy):
+    def get_setting(self, model_name):
+        from wagtail.contrib.settings.registry import registry
+
+        Model = registry.get_by_natural_key(self.app_label, model_name)
+        if Model is None or not issubclass(Model, (BaseSiteSetting, BaseGenericSetting)):
+            return super().get_setting(model_name)
+        if isinstance(self.request_or_site, Site):
+            return get_setting(Model, site=self.request_or_site)
+        return get_setting(Model, request=self.request_or_site)
+
+
+class CachedSettingProxy(SettingProxy):
+    def __missing__(self, app_label):
+        self[app_label] = value = CachedSettingModuleProxy(self.request_or_site, app_label)
+        return value
+
+
+def settings_context_processor(request):
+    """Drop-in replacement for ``wagtail.contrib.settings.context_processors.settings``"""
+    return {"settings": CachedSettingProxy(request_or_site=request)}
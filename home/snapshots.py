@@ -0,0 +1,64 @@
+"""
+Per-worker snapshots of rarely changing data, invalidated across workers.
+
+Each ``WorkerSnapshot`` keeps its data in process memory. Invalidating it bumps
+a generation counter in the shared default cache; every worker compares its
+generation with the cached one at most once every ``check_interval`` seconds
+and reloads when they differ. Lookups between checks cost no queries and no
+cache round trip.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def bump_generation(key):
+    """Increment a cache-shared generation counter, creating it if missing"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+        return 1
+
+
+class WorkerSnapshot:
+    """
+    Base class for per-worker snapshots.
+
+    Subclasses set ``generation_key`` and ``check_interval_setting`` and
+    implement ``load()``, which runs under ``self.lock`` whenever the snapshot
+    is stale.
+    """
+
+    generation_key = None
+    check_interval_setting = None
+    default_check_interval = 5
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.generation = None
+        self.checked_at = 0.0
+
+    def load(self):
+        raise NotImplementedError
+
+    def refresh(self):
+        interval = getattr(settings, self.check_interval_setting, self.default_check_interval)
+        now = time.monotonic()
+        if self.generation is not None and now - self.checked_at < interval:
+            return
+        generation = cache.get(self.generation_key, 0)
+        with self.lock:
+            self.checked_at = now
+            if generation == self.generation:
+                return
+            self.load()
+            self.generation = generation
+
+    def invalidate(self):
+        """Drop this worker's snapshot and tell the other workers to reload theirs"""
+        bump_generation(self.generation_key)
+        with self.lock:
+            self.generation = None
@@ -0,0 +1,207 @@
+"""
+Static HTML export of the public site.
+
+``export_site`` renders every live public page of the default site, the
+thank-you page, ``sitemap.xml`` and ``robots.txt`` through the normal Django
+stack and writes them into a new release directory:
+
+    STATIC_EXPORT_DIR/releases/<version>/index.html
+    STATIC_EXPORT_DIR/releases/<version>/contact/index.html
+    STATIC_EXPORT_DIR/releases/<version>/thank-you/index.html
+    ...
+
+Every file gets a precompressed ``.gz`` sibling (and ``.br`` when the
+``brotli`` package is installed) for nginx's ``gzip_static`` / ``brotli_static``.
+Once a release is complete the ``STATIC_EXPORT_DIR/current`` symlink is
+switched to it with a single rename, so readers only ever see a whole
+release. The newest ``STATIC_EXPORT_KEEP`` releases are kept.
+
+Forms still post to Django. The CSRF token baked into a page would be shared
+by every visitor, so it is blanked in the exported HTML and a small script
+fetches a fresh token from ``/api/csrf/`` before the form is used.
+
+Pages are rendered through the project's WSGI handler with the same minimal
+environ as worker warm-up (``home.warmup.build_environ``), so the full
+middleware stack and request signals run as for a real request.
+
+With ``STATIC_EXPORT_ON_PUBLISH`` on, publishing or unpublishing a page
+enqueues ``home.tasks.export_static_site_task`` (see ``request_export``).
+"""
+import gzip
+import logging
+import os
+import re
+import shutil
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+EXTRA_PATHS = ["/thank-you/", "/sitemap.xml", "/robots.txt"]
+
+LOCK_KEY = "home:static-export:lock"
+PENDING_KEY = "home:static-export:pending"
+LOCK_TIMEOUT = 600
+
+CSRF_INPUT = re.compile(rb'(<input type="hidden" name="csrfmiddlewaretoken" value=")[^"]*(")')
+CSRF_SCRIPT = b"""<script>
+(function () {
+    var inputs = document.querySelectorAll('input[name="csrfmiddlewaretoken"]');
+    if (!inputs.length) return;
+    fetch('/api/csrf/', {credentials: 'same-origin'})
+        .then(function (response) { return response.json(); })
+        .then(function (data) { inputs.forEach(function (input) { input.value = data.token; }); });
+})();
+</script>
+"""
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def get_export_dir():
+    return getattr(settings, "STATIC_EXPORT_DIR", os.path.join(settings.BASE_DIR, "export"))
+
+
+def get_export_paths(site):
+    """Return the site-relative paths to export: live public pages, then EXTRA_PATHS"""
+    paths = []
+    for page in site.root_page.get_descendants(inclusive=True).live().public().order_by("path"):
+        url = page.get_url(current_site=site)
+        if url and url.startswith("/") and url not in paths:
+            paths.append(url)
+    return paths + [path for path in EXTRA_PATHS if path not in paths]
+
+
+def get_file_path(release_dir, path):
+    relative = path.lstrip("/")
+    if not relative or path.endswith("/"):
+        relative = os.path.join(relative, "index.html")
+    return os.path.join(release_dir, relative)
+
+
+def prepare_html(content):
+    """Blank the per-visitor CSRF tokens and add the script that fetches a fresh one"""
+    content, replaced = CSRF_INPUT.subn(rb"\1\2", content)
+    if replaced:
+        content = content.replace(b"</body>", CSRF_SCRIPT + b"</body>", 1)
+    return content
+
+
+def write_file(file_path, content):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(content)
+    with open(file_path + ".gz", "wb") as f:
+        # mtime=0 keeps the output identical between exports of the same content
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(file_path + ".br", "wb") as f:
+            f.write(brotli.compress(content))
+
+
+def switch_current(export_dir, release_dir):
+    """Point the ``current`` symlink at ``release_dir`` atomically"""
+    current = os.path.join(export_dir, "current")
+    temporary = f"{current}.{os.getpid()}.tmp"
+    if os.path.lexists(temporary):
+        os.remove(temporary)
+    os.symlink(os.path.relpath(release_dir, export_dir), temporary)
+    os.replace(temporary, current)
+
+
+def prune_releases(export_dir, keep):
+    releases_dir = os.path.join(export_dir, "releases")
+    current = os.path.realpath(os.path.join(export_dir, "current"))
+    releases = sorted(name for name in os.listdir(releases_dir) if not name.endswith(".partial"))
+    for name in releases[:-keep] if keep else []:
+        path = os.path.join(releases_dir, name)
+        if os.path.realpath(path) != current:
+            shutil.rmtree(path)
+
+
+def render_path(application, site, path, query_string=""):
+    """GET ``path`` on ``site`` through the WSGI application; returns (status code, headers, body)"""
+    from .warmup import build_environ
+
+    started = []
+    response = application(
+        build_environ(path, site.hostname, site.port, query_string),
+        lambda status, headers, exc_info=None: started.append((status, headers)),
+    )
+    try:
+        content = b"".join(response)
+    finally:
+        if hasattr(response, "close"):
+            response.close()
+    status, headers = started[0]
+    return int(status.split()[0]), dict(headers), content
+
+
+def export_site(site=None, keep=None, stdout=None):
+    """
+    Render the public site into a new release and make it current. Returns
+    the release directory. Paths that do not render with status 200 are
+    reported and left out.
+    """
+    from django.core.wsgi import get_wsgi_application
+    from wagtail.models import Site
+
+    site = site or Site.objects.get(is_default_site=True)
+    export_dir = get_export_dir()
+    version = timezone.now().strftime("%Y%m%d%H%M%S%f")
+    release_dir = os.path.join(export_dir, "releases", version)
+    partial_dir = release_dir + ".partial"
+    os.makedirs(partial_dir)
+
+    application = get_wsgi_application()
+    try:
+        for path in get_export_paths(site):
+            # Homepage sections inline rather than as placeholders for fragment URLs
+            status, headers, content = render_path(application, site, path, "sections=all" if path.endswith("/") else "")
+            if status != 200:
+                logger.warning("Static export skipped %s: status %s", path, status)
+                continue
+            if headers.get("Content-Type", "").startswith("text/html"):
+                content = prepare_html(content)
+            write_file(get_file_path(partial_dir, path), content)
+            if stdout:
+                stdout.write(f"  {path}")
+        os.rename(partial_dir, release_dir)
+    except BaseException:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        raise
+
+    switch_current(export_dir, release_dir)
+    prune_releases(export_dir, getattr(settings, "STATIC_EXPORT_KEEP", 3) if keep is None else keep)
+    return release_dir
+
+
+def request_export():
+    """
+    Enqueue a re-export. Requests that arrive while an export is running are
+    folded into one more export after it finishes.
+    """
+    from .tasks import export_static_site_task
+
+    cache.set(PENDING_KEY, True, None)
+    return export_static_site_task.enqueue()
+
+
+def run_pending_exports():
+    """Export until no request is pending; does nothing while another export runs"""
+    if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+        return 0
+    exports = 0
+    try:
+        while cache.get(PENDING_KEY):
+            cache.delete(PENDING_KEY)
+            export_site()
+            exports += 1
+    finally:
+        cache.delete(LOCK_KEY)
+    return exports
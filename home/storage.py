@@ -0,0 +1,277 @@
+"""
+Content-addressed media storage.
+
+``ContentAddressedStorage`` is the project's ``FileSystemStorage`` with one
+change: files saved under ``CONTENT_ADDRESSED_PREFIXES`` (Wagtail's
+``original_images/`` and ``images/`` by default) are named after the SHA-256
+of their bytes,
+
+    original_images/3f/3f2a...c9.png
+
+so uploading the same logo twice stores one blob, and identical renditions
+share one file. Anything else (documents, exports) is stored as usual.
+
+Because several Image or Rendition rows can point at the same blob, a file is
+only deleted once no row references it any more. ``manage.py dedupe_media``
+moves existing media to these names and merges duplicate Image rows so they
+also share a single set of renditions.
+
+Content-addressed names never change meaning, which ``RemoteMediaMixin`` uses
+for remote storages (``home.s3_storage.S3MediaStorage``): originals read for
+rendition generation are kept in a local read-through cache under
+``MEDIA_CACHE_DIR``, and ``url()`` results are memoized in the Django cache so
+rendering a page makes no calls to the object store. ``exists()`` always asks
+the store: it decides whether an upload can be skipped, and with several
+replicas (each with its own cache) another one may have deleted the blob.
+``manage.py upload_media`` copies an existing ``MEDIA_ROOT`` to the configured
+storage in parallel.
+"""
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+DEFAULT_PREFIXES = ["original_images/", "images/"]
+# Originals are what rendition generation reads, so only they are cached locally
+LOCAL_CACHE_PREFIX = "original_images/"
+
+URL_KEY = "home:media-url:{}"
+
+
+def hash_content(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def get_content_addressed_prefix(name):
+    for prefix in getattr(settings, "CONTENT_ADDRESSED_PREFIXES", DEFAULT_PREFIXES):
+        if name.startswith(prefix):
+            return prefix
+    return None
+
+
+def is_referenced(name):
+    """Return True if an image or rendition row still points at ``name``"""
+    from wagtail.images import get_image_model
+
+    Image = get_image_model()
+    Rendition = Image.get_rendition_model()
+    return Image.objects.filter(file=name).exists() or Rendition.objects.filter(file=name).exists()
+
+
+def is_content_addressed(name):
+    """Return True if ``name`` is a content-addressed name (its content never changes)"""
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return bool(get_content_addressed_prefix(name)) and len(stem) == 64 and all(c in "0123456789abcdef" for c in stem)
+
+
+class ContentAddressedMixin:
+    def get_content_addressed_name(self, name, content):
+        prefix = get_content_addressed_prefix(name)
+        if prefix is None:
+            return None
+        digest = hash_content(content)
+        extension = os.path.splitext(name)[1].lower()
+        return f"{prefix}{digest[:2]}/{digest}{extension}"
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            from django.core.files import File
+
+            content = File(content, name)
+
+        hashed_name = self.get_content_addressed_name(name, content)
+        if hashed_name is None:
+            return super().save(name, content, max_length=max_length)
+        if self.exists(hashed_name):
+            # Same bytes are already stored - share the blob
+            return hashed_name
+        saved_name = super().save(hashed_name, content, max_length=max_length)
+        if saved_name != hashed_name:
+            # An identical upload stored the blob since exists() was checked,
+            # and this copy was given an alternative name: drop it
+            super().delete(saved_name)
+        return hashed_name
+
+    def delete(self, name):
+        if name and get_content_addressed_prefix(name) and is_referenced(name):
+            # Another image or rendition shares this blob
+            return
+        super().delete(name)
+
+
+class ContentAddressedStorage(ContentAddressedMixin, FileSystemStorage):
+    pass
+
+
+class RemoteMediaMixin:
+    """
+    Local read-through cache and memoized url() for a remote storage. Only
+    content-addressed names are cached: their content never changes.
+    """
+
+    def get_url_cache_timeout(self):
+        return getattr(settings, "MEDIA_URL_CACHE_TIMEOUT", 86400)
+
+    def get_local_path(self, name):
+        cache_dir = getattr(settings, "MEDIA_CACHE_DIR", None)
+        if not cache_dir or not name.startswith(LOCAL_CACHE_PREFIX) or not is_content_addressed(name):
+            return None
+        return os.path.join(cache_dir, name)
+
+    def _open(self, name, mode="rb"):
+        local_path = self.get_local_path(name) if mode == "rb" else None
+        if local_path is None:
+            return super()._open(name, mode)
+        if not os.path.exists(local_path):
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            # Download next to the target and rename, so readers never see half a file
+            temporary = f"{local_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with super()._open(name, "rb") as remote, open(temporary, "wb") as f:
+                    for chunk in remote.chunks():
+                        f.write(chunk)
+                os.replace(temporary, local_path)
+            finally:
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+        return File(open(local_path, "rb"), name)
+
+    def url(self, name, *args, **kwargs):
+        if args or kwargs or not is_content_addressed(name):
+            return super().url(name, *args, **kwargs)
+        key = URL_KEY.format(name)
+        url = cache.get(key)
+        if url is None:
+            url = super().url(name)
+            cache.set(key, url, self.get_url_cache_timeout())
+        return url
+
+    def delete(self, name):
+        super().delete(name)
+        if not is_content_addressed(name):
+            return
+        cache.delete(URL_KEY.format(name))
+        local_path = self.get_local_path(name)
+        if local_path and os.path.exists(local_path):
+            os.remove(local_path)
+
+
+def move_to_content_addressed(instance):
+    """
+    Re-store the file of an Image or Rendition under its content-addressed
+    name and point the row at it. Returns the new name, or None if the row
+    already used one or its file is missing.
+    """
+    storage = instance.file.storage
+    name = instance.file.name
+    if not name or not storage.exists(name):
+        return None
+    with storage.open(name) as content:
+        new_name = storage.save(name, content)
+    if new_name == name:
+        return None
+    type(instance).objects.filter(pk=instance.pk).update(file=new_name)
+    # Removed only if no other row still uses the old name
+    storage.delete(name)
+    return new_name
+
+
+def get_image_relations():
+    """Foreign keys to the image model that can be repointed (renditions excluded)"""
+    from wagtail.images import get_image_model
+
+    Image = get_image_model()
+    Rendition = Image.get_rendition_model()
+    return [
+        rel.field
+        for rel in Image._meta.get_fields(include_hidden=True)
+        if rel.one_to_many and rel.related_model is not Rendition and getattr(rel, "field", None) is not None
+    ]
+
+
+def merge_images(keep, duplicate):
+    """
+    Repoint everything that uses ``duplicate`` to ``keep`` and delete it.
+
+    Images used inside StreamField or rich text content are left alone (the
+    block JSON is not rewritten), so False is returned for those.
+    """
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import transaction
+    from wagtail.models import ReferenceIndex, Revision, RevisionMixin
+
+    if any("." in model_path for model_path in ReferenceIndex.get_references_to(duplicate).values_list("model_path", flat=True)):
+        return False
+
+    with transaction.atomic():
+        for field in get_image_relations():
+            model = field.model
+            if issubclass(model, RevisionMixin):
+                # Keep drafts and scheduled revisions pointing at the kept image
+                revisions = Revision.objects.filter(
+                    content_type=ContentType.objects.get_for_model(model),
+                    **{f"content__{field.name}": duplicate.pk},
+                )
+                for revision in revisions:
+                    revision.content[field.name] = keep.pk
+                    revision.save(update_fields=["content"])
+            model._default_manager.filter(**{field.name: duplicate}).update(**{field.name: keep})
+        duplicate.delete()
+    return True
+
+
+def upload_file(storage, source_dir, name):
+    """Copy one file from ``source_dir`` to ``storage`` under the same name. Returns its size, or None if already there"""
+    if storage.exists(name):
+        return None
+    path = os.path.join(source_dir, name)
+    with open(path, "rb") as f:
+        # _save keeps the name as is: rows already point at it, content-addressed or not
+        storage._save(name, File(f, name))
+    return os.path.getsize(path)
+
+
+def upload_media(source_dir, storage=None, workers=8, stdout=None):
+    """
+    Copy every file under ``source_dir`` (by default MEDIA_ROOT) to ``storage``
+    (by default the default storage), ``workers`` uploads at a time. Files that
+    already exist are skipped. Returns (uploaded, skipped, failed, bytes).
+    """
+    from django.core.files.storage import default_storage
+
+    storage = storage or default_storage
+    names = []
+    for root, _, files in os.walk(source_dir):
+        for filename in files:
+            names.append(os.path.relpath(os.path.join(root, filename), source_dir).replace(os.sep, "/"))
+
+    uploaded = skipped = failed = total = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(upload_file, storage, source_dir, name): name for name in sorted(names)}
+        for future, name in futures.items():
+            try:
+                size = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"Error uploading {name}: {str(e)}")
+                continue
+            if size is not None:
+                uploaded += 1
+                total += size
+                if stdout:
+                    stdout.write(f"  {name} ({size} bytes)")
+            else:
+                skipped += 1
+    return uploaded, skipped, failed, total
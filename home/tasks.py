@@ -0,0 +1,49 @@
+"""
+Background tasks (django-tasks, the task framework Wagtail 7 uses as well).
+
+Tasks are enqueued once the triggering transaction commits. With the database
+backend (``TASKS`` in settings) they are stored as rows until
+``manage.py db_worker`` runs them, so a worker that is recycled or stopped
+after an upload, a form submission or a publish loses nothing; failures are
+recorded on the task result.
+"""
+from django_tasks import task
+
+
+@task()
+def optimize_image_task(image_id):
+    """Optimise one uploaded image original; returns (bytes before, bytes after) or None"""
+    from wagtail.images import get_image_model
+    from .image_optimization import optimize_image
+
+    image = get_image_model().objects.filter(pk=image_id).first()
+    if image is None:
+        # Deleted before the worker got to it
+        return None
+    return optimize_image(image)
+
+
+@task()
+def flush_notifications_task(page_id):
+    """
+    Send the due batched / digest notifications of one HomePage, and schedule
+    another run while submissions are still pending; returns the number sent
+    """
+    from .models import HomePage, PendingNotification
+    from .notifications import flush_page, schedule_flush
+
+    page = HomePage.objects.filter(pk=page_id).first()
+    if page is None:
+        return 0
+    sent = flush_page(page)
+    if PendingNotification.objects.filter(page=page).exists():
+        schedule_flush(page)
+    return sent
+
+
+@task()
+def export_static_site_task():
+    """Re-export the static site after a publish; returns the number of exports run"""
+    from .static_export import run_pending_exports
+
+    return run_pending_exports()
@@ -0,0 +1,42 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from home.placeholders import get_placeholder
+
+register = template.Library()
+
+
+@register.simple_tag
+def image_placeholder(rendition):
+    """
+    {% image_placeholder rendition as lqip %} - the rendition's precomputed
+    placeholder, with ``lqip.data_uri`` and ``lqip.colour``
+    """
+    return get_placeholder(rendition)
+
+
+@register.simple_tag
+def placeholder_img(rendition, fit="cover", **attrs):
+    """
+    {% placeholder_img rendition alt="..." class="..." %} - an <img> with the
+    rendition's intrinsic width/height and its blurred placeholder painted
+    behind it until the image loads
+    """
+    if not rendition:
+        return ""
+    placeholder = get_placeholder(rendition)
+    style = attrs.pop("style", "")
+    if placeholder is not None:
+        style = (
+            f"background: {placeholder.colour} url('{placeholder.data_uri}') center / {fit} no-repeat; {style}"
+        ).strip()
+    attrs.setdefault("loading", "lazy")
+    attrs.setdefault("decoding", "async")
+    return format_html(
+        '<img src="{}" width="{}" height="{}"{}{}>',
+        rendition.url,
+        rendition.width,
+        rendition.height,
+        format_html(' style="{}"', style) if style else "",
+        format_html_join("", ' {}="{}"', attrs.items()),
+    )
@@ -0,0 +1,20 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from home.script_loader import LOADER_SCRIPT, defer_scripts as rewrite_scripts
+
+register = template.Library()
+
+
+@register.simple_tag
+def script_loader():
+    """{% script_loader %} - the inline loader that runs deferred embed scripts"""
+    return mark_safe(LOADER_SCRIPT)
+
+
+@register.filter
+def defer_scripts(html, loading):
+    """{{ page.embed_body_code|defer_scripts:page.embed_body_loading }} - editor HTML, output unescaped"""
+    if not html:
+        return ""
+    return mark_safe(rewrite_scripts(str(html), loading))
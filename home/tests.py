@@ -1,10 +1,34 @@
+from django.test import override_settings
 from django.urls import reverse
 from home.models import HomePage
+from home.routes import known_routes
 
 from wagtail.models import Page
 from wagtail.test.utils import WagtailPageTestCase
 
 
+class SiteHomePageMixin:
+    """
+    Creates a HomePage as the root of the default site, resetting the
+    snapshots of routes, site settings and showcase that outlive a test.
+    """
+
+    def create_site_homepage(self, **fields):
+        from wagtail.models import Site
+        from home.showcase import showcase
+        from home.site_settings import site_settings
+
+        homepage = HomePage(title="Home", **fields)
+        Page.objects.get(pk=1).add_child(instance=homepage)
+        Site.objects.update(root_page=homepage)
+        known_routes.invalidate()
+        site_settings.invalidate()
+        self.addCleanup(site_settings.invalidate)
+        showcase.invalidate()
+        self.addCleanup(showcase.invalidate)
+        return homepage
+
+
 class HomeSetUpTests(WagtailPageTestCase):
     """
     Tests for basic page structure setup and HomePage creation.
@@ -41,3 +65,1909 @@ class HomeTests(WagtailPageTestCase):
     def test_homepage_template_used(self):
         response = self.client.get(reverse("home"))
         self.assertTemplateUsed(response, "home/home_page.html")
+
+
+class PublicEntrypointTests(WagtailPageTestCase):
+    """
+    Tests for the trimmed public URLConf and lazy admin routing.
+    """
+
+    def test_public_urlconf_has_no_admin(self):
+        from django.urls import resolve
+
+        self.assertEqual(resolve("/thank-you/", urlconf="base.urls_public").url_name, "thank_you")
+        # Without the admin trees these fall through to Wagtail's page router
+        self.assertEqual(resolve("/admin/", urlconf="base.urls_public").url_name, "wagtail_serve")
+        self.assertEqual(resolve("/django-admin/", urlconf="base.urls_public").url_name, "wagtail_serve")
+
+    @override_settings(ROOT_URLCONF="base.urls_public")
+    def test_admin_loaded_lazily(self):
+        response = self.client.get("/admin/login/")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(ROOT_URLCONF="base.urls_public", ADMIN_URLCONF=None)
+    def test_admin_disabled_on_public_pool(self):
+        response = self.client.get("/admin/login/")
+        self.assertEqual(response.status_code, 404)
+
+
+class WorkerStartupTests(SiteHomePageMixin, WagtailPageTestCase):
+    """
+    Tests for gunicorn worker sizing and warm-up.
+    """
+
+    def test_worker_count_capped_by_memory(self):
+        from base.gunicorn_conf import worker_count
+
+        self.assertEqual(worker_count(cpus=2, memory=None), 5)
+        self.assertEqual(worker_count(cpus=8, memory=512 * 1024 * 1024), 3)
+        self.assertEqual(worker_count(cpus=4, memory=64 * 1024 * 1024), 1)
+
+    def test_warm_up_renders_pages(self):
+        from home.warmup import warm_up
+
+        self.create_site_homepage()
+
+        results = warm_up()
+        self.assertEqual([(path, status) for path, status, _ in results], [("/", "200"), ("/thank-you/", "200")])
+
+
+class NotFoundShortcutTests(SiteHomePageMixin, WagtailPageTestCase):
+    """
+    Tests for the cheap 404 path taken by unknown URLs.
+    """
+
+    def setUp(self):
+        self.homepage = self.create_site_homepage()
+
+    def test_scanner_paths_get_minimal_404(self):
+        # The first request builds the known-routes snapshot
+        self.client.get("/")
+        for path in ["/wp-login.php", "/.env", "/wp-admin/"]:
+            with self.assertNumQueries(0):
+                response = self.client.get(path)
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.content, b"Not Found")
+            self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_known_routes_are_served(self):
+        self.assertEqual(self.client.get("/").status_code, 200)
+        self.assertEqual(self.client.get("/thank-you/").status_code, 200)
+
+    def test_redirect_save_rebuilds_routes(self):
+        from wagtail.contrib.redirects.models import Redirect
+
+        self.assertEqual(self.client.get("/old-page/").status_code, 404)
+        Redirect.objects.create(old_path=Redirect.normalise_path("/old-page/"), redirect_link="/")
+        response = self.client.get("/old-page/")
+        self.assertEqual(response.status_code, 301)
+
+    def test_publish_rebuilds_routes(self):
+        from contact.models import ContactPage
+
+        page = ContactPage(title="Contact", slug="contact", live=False)
+        self.homepage.add_child(instance=page)
+        self.assertEqual(self.client.get("/contact/").status_code, 404)
+        page.save_revision().publish()
+        self.assertEqual(self.client.get("/contact/").status_code, 200)
+
+
+@override_settings(FORM_THROTTLE_BURST=2, FORM_THROTTLE_RATE_PER_MINUTE=1)
+class FormSubmissionAdmissionTests(SiteHomePageMixin, WagtailPageTestCase):
+    """
+    Tests for per-IP throttling and duplicate suppression of form submissions.
+    """
+
+    def setUp(self):
+        from unittest import mock
+        from django.core.cache import cache
+        from home.models import HomePageFormField
+
+        cache.clear()
+        self.homepage = self.create_site_homepage(to_address="sales@example.com")
+        HomePageFormField.objects.create(page=self.homepage, label="Name", field_type="singleline")
+        HomePageFormField.objects.create(page=self.homepage, label="Email", field_type="email")
+
+        for method in ("send_to_zapier_webhook", "send_via_mailtrap"):
+            patcher = mock.patch.object(HomePage, method)
+            self.addCleanup(patcher.stop)
+            setattr(self, method, patcher.start())
+
+    def test_duplicate_submission_processed_once(self):
+        data = {"name": "Ali", "email": "ali@example.com"}
+        first = self.client.post("/", data)
+        second = self.client.post("/", {"name": "  ali ", "email": "ALI@example.com"})
+
+        self.assertRedirects(first, "/thank-you/")
+        self.assertRedirects(second, "/thank-you/")
+        self.assertEqual(self.homepage.get_submission_class().objects.count(), 1)
+        self.assertEqual(self.send_via_mailtrap.call_count, 1)
+        self.assertEqual(self.send_to_zapier_webhook.call_count, 1)
+
+    def test_burst_is_throttled_per_ip(self):
+        for i in range(2):
+            response = self.client.post("/", {"name": f"Visitor {i}", "email": f"v{i}@example.com"})
+            self.assertEqual(response.status_code, 302)
+
+        response = self.client.post("/", {"name": "Visitor 3", "email": "v3@example.com"})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(self.homepage.get_submission_class().objects.count(), 2)
+
+        response = self.client.post("/", {"name": "Visitor 4", "email": "v4@example.com"}, REMOTE_ADDR="10.0.0.9")
+        self.assertEqual(response.status_code, 302)
+
+    def test_failed_save_releases_the_claim(self):
+        from unittest import mock
+
+        data = {"name": "Ali", "email": "ali@example.com"}
+        with mock.patch.object(HomePage, "process_form_submission", side_effect=RuntimeError("database is locked")):
+            with self.assertRaises(RuntimeError):
+                self.client.post("/", data)
+
+        self.assertRedirects(self.client.post("/", data), "/thank-you/")
+        self.assertEqual(self.homepage.get_submission_class().objects.count(), 1)
+
+    def test_duplicate_of_pending_submission_asks_to_retry(self):
+        from home.models import PageSection
+        from home.throttling import claim_submission, submission_fingerprint
+
+        PageSection.objects.create(page=self.homepage, section_id="hero")
+        data = {"name": "Ali", "email": "ali@example.com"}
+        claim_submission(submission_fingerprint(f"homepage:{self.homepage.pk}", data))
+
+        response = self.client.post("/", data)
+
+        self.assertContains(response, "still being sent", status_code=409)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(self.homepage.get_submission_class().objects.count(), 0)
+
+    def test_contact_api_duplicate_of_pending_submission(self):
+        import json
+        from home.throttling import claim_submission, submission_fingerprint
+
+        data = {"name": "Ali", "email": "ali@example.com", "phone": "0123456789", "budget": "", "location": "Klang", "message": ""}
+        claim_submission(submission_fingerprint("contact-api", data))
+
+        response = self.client.post("/api/contact/submit/", json.dumps(data), content_type="application/json")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(response.json()["success"])
+        self.assertIn("Retry-After", response)
+
+    def test_contact_api_throttled(self):
+        for _ in range(2):
+            self.client.post("/api/contact/submit/", "{}", content_type="application/json")
+        response = self.client.post("/api/contact/submit/", "{}", content_type="application/json")
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(response.json()["success"])
+
+
+class SiteSettingsSnapshotTests(WagtailPageTestCase):
+    """
+    Tests for query-free Site and WebhookSettings resolution.
+    """
+
+    def setUp(self):
+        from django.test import RequestFactory
+        from wagtail.models import Site
+        from home.models import WebhookSettings
+        from home.site_settings import site_settings
+
+        # Creating the row on first access would itself invalidate the snapshot
+        WebhookSettings.for_site(Site.objects.get(is_default_site=True))
+        site_settings.invalidate()
+        self.factory = RequestFactory()
+
+    def test_settings_resolved_without_queries(self):
+        from home.models import WebhookSettings
+        from home.site_settings import get_setting
+
+        get_setting(WebhookSettings, request=self.factory.get("/"))
+        with self.assertNumQueries(0):
+            webhook_settings = get_setting(WebhookSettings, request=self.factory.get("/"))
+        self.assertTrue(webhook_settings.webhook_enabled)
+
+    def test_save_invalidates_snapshot(self):
+        from home.models import WebhookSettings
+        from home.site_settings import get_setting
+
+        webhook_settings = get_setting(WebhookSettings, request=self.factory.get("/"))
+        webhook_settings = WebhookSettings.objects.get(pk=webhook_settings.pk)
+        webhook_settings.webhook_enabled = False
+        webhook_settings.save()
+
+        self.assertFalse(get_setting(WebhookSettings, request=self.factory.get("/")).webhook_enabled)
+
+    def test_context_processor_uses_snapshot(self):
+        from django.template import engines
+
+        request = self.factory.get("/")
+        template = engines["django"].from_string("{{ settings.home.WebhookSettings.zapier_webhook_url }}")
+        template.render({}, request)
+        with self.assertNumQueries(0):
+            output = template.render({}, self.factory.get("/"))
+        self.assertEqual(output, "https://EXAMPLE.COM/")
+
+
+class CachedFormTests(WagtailPageTestCase):
+    """
+    Tests for the per-revision form class and field map cache.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+        from home.models import HomePageFormField
+        from home.site_settings import site_settings
+
+        cache.clear()
+        root_page = Page.objects.get(pk=1)
+        self.homepage = HomePage(title="Home", to_address="sales@example.com")
+        root_page.add_child(instance=self.homepage)
+        HomePageFormField.objects.create(page=self.homepage, label="Your Name", field_type="singleline")
+        self.homepage.save_revision().publish()
+        self.addCleanup(site_settings.invalidate)
+
+    def get_live_page(self):
+        return HomePage.objects.get(pk=self.homepage.pk)
+
+    def test_form_built_once_per_revision(self):
+        self.get_live_page().get_form()
+        page = self.get_live_page()
+        with self.assertNumQueries(0):
+            form = page.get_form({"your_name": "Ali"})
+            self.assertTrue(form.is_valid())
+            self.assertEqual(page.get_labelled_form_data(form), {"Your Name": "Ali"})
+
+    def test_new_revision_rebuilds_form(self):
+        from home.models import HomePageFormField
+
+        self.get_live_page().get_form()
+        page = self.get_live_page()
+        page.form_fields.add(HomePageFormField(label="Phone", field_type="singleline"))
+        page.save_revision().publish()
+
+        self.assertIn("phone", self.get_live_page().get_form().fields)
+
+    def test_valid_submission_issues_insert_and_rollup_upsert(self):
+        from unittest import mock
+        from django.contrib.auth.models import AnonymousUser
+        from django.test import RequestFactory
+        from home.models import WebhookSettings
+
+        WebhookSettings.objects.update_or_create(site_id=1, defaults={"webhook_enabled": False})
+        factory = RequestFactory()
+
+        def post(name):
+            request = factory.post("/", {"your_name": name})
+            request.user = AnonymousUser()
+            return self.get_live_page(), request
+
+        with mock.patch.object(HomePage, "send_via_mailtrap"):
+            page, request = post("Warm")
+            page.serve(request)
+            page, request = post("Ali")
+            # The FormSubmission insert and the analytics rollup upsert (in a savepoint)
+            with self.assertNumQueries(4):
+                response = page.serve(request)
+        self.assertEqual(response.status_code, 302)
+
+
+class ShowcaseSnippetTests(WagtailPageTestCase):
+    """
+    Tests for reviews and brand partners served from the showcase snapshot.
+    """
+
+    def setUp(self):
+        from home.showcase import showcase
+
+        showcase.invalidate()
+        self.addCleanup(showcase.invalidate)
+        self.homepage = HomePage(title="Home")
+        Page.objects.get(pk=1).add_child(instance=self.homepage)
+
+    def create_review(self, name, days_ago, **kwargs):
+        import datetime
+        from django.utils import timezone
+        from home.models import GoogleReview
+
+        return GoogleReview.objects.create(
+            name=name,
+            review_text="Great service",
+            review_date=timezone.now() - datetime.timedelta(days=days_ago),
+            **kwargs,
+        )
+
+    def test_reviews_ordered_featured_first_then_newest(self):
+        self.create_review("Old", 30)
+        self.create_review("New", 1)
+        self.create_review("Featured", 60, is_featured=True)
+
+        names = [review.name for review in self.homepage.get_google_reviews()]
+        self.assertEqual(names, ["Featured", "New", "Old"])
+
+    def test_snapshot_served_without_queries_until_changed(self):
+        self.create_review("First", 1)
+        self.homepage.get_google_reviews()
+        self.homepage.get_brand_partners()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(len(self.homepage.get_google_reviews()), 1)
+            self.assertEqual(len(self.homepage.get_brand_partners()), 0)
+
+        self.create_review("Second", 2)
+        self.assertEqual(len(self.homepage.get_google_reviews()), 2)
+
+
+class CompactRevisionsTests(WagtailPageTestCase):
+    """
+    Tests for the compact_revisions management command.
+    """
+
+    def setUp(self):
+        import datetime
+        from django.utils import timezone
+
+        self.homepage = HomePage(title="Home")
+        Page.objects.get(pk=1).add_child(instance=self.homepage)
+        now = timezone.now()
+        # Two revisions on each of four old days, then three recent ones
+        self.old_days = [now - datetime.timedelta(days=days) for days in (40, 41, 42, 43)]
+        timestamps = [day - datetime.timedelta(hours=hour) for day in reversed(self.old_days) for hour in (2, 1)]
+        timestamps += [now - datetime.timedelta(hours=hour) for hour in (3, 2, 1)]
+        for created_at in timestamps:
+            revision = self.homepage.save_revision()
+            revision.created_at = created_at
+            revision.save(update_fields=["created_at"])
+        self.homepage.refresh_from_db()
+
+    def call(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command("compact_revisions", "--keep-last=2", "--daily-after=30", *args, stdout=out)
+        return out.getvalue()
+
+    def test_keeps_recent_and_one_per_old_day(self):
+        from home.models import ArchivedRevision
+
+        output = self.call("--batch-size=3")
+
+        revisions = self.homepage.revisions.order_by("-created_at")
+        self.assertEqual(revisions.count(), 3 + len(self.old_days))
+        self.assertEqual(revisions.first().pk, self.homepage.latest_revision_id)
+        self.assertEqual(ArchivedRevision.objects.count(), len(self.old_days))
+        archive = ArchivedRevision.objects.first()
+        self.assertEqual(archive.get_content()["title"], "Home")
+        self.assertIn("Archived 4 revisions", output)
+
+    def test_dry_run_changes_nothing(self):
+        output = self.call("--dry-run")
+
+        self.assertEqual(self.homepage.revisions.count(), 11)
+        self.assertIn("Prunable by policy: 4", output)
+
+
+class StreamingSubmissionsExportTests(WagtailPageTestCase):
+    """
+    Tests for the keyset-paginated CSV / XLSX submissions export.
+    """
+
+    def setUp(self):
+        import datetime
+        from django.utils import timezone
+        from home.models import HomePageFormField
+
+        self.login()
+        self.homepage = HomePage(title="Home")
+        Page.objects.get(pk=1).add_child(instance=self.homepage)
+        HomePageFormField.objects.create(page=self.homepage, label="Name", field_type="singleline")
+        submission_class = self.homepage.get_submission_class()
+        start = timezone.now() - datetime.timedelta(days=10)
+        for day in range(7):
+            submission = submission_class.objects.create(page=self.homepage, form_data={"name": f"Lead {day}"})
+            # Two submissions share a timestamp to exercise the id tie-break
+            submission.submit_time = start + datetime.timedelta(days=min(day, 5))
+            submission.save(update_fields=["submit_time"])
+        self.url = reverse("wagtailforms:list_submissions", args=(self.homepage.pk,))
+
+    def get_export(self, export_format, **params):
+        from unittest import mock
+        from home.exports import StreamingSubmissionsListView
+
+        with mock.patch.object(StreamingSubmissionsListView, "export_chunk_size", 2):
+            return self.client.get(self.url, {"export": export_format, **params})
+
+    def test_csv_streams_every_row_in_order(self):
+        response = self.get_export("csv")
+
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "Submission date,Name")
+        self.assertEqual([line.split(",")[1] for line in lines[1:]], [f"Lead {day}" for day in range(7)])
+
+    def test_xlsx_honours_date_filter_and_descending_order(self):
+        import io
+        import datetime
+        from django.utils import timezone
+        from openpyxl import load_workbook
+
+        since = (timezone.now() - datetime.timedelta(days=7)).date().isoformat()
+        response = self.get_export("xlsx", date_from=since, order_by="-submit_time")
+
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+        names = [row[1] for row in workbook.active.iter_rows(min_row=2, values_only=True)]
+        self.assertEqual(names, ["Lead 6", "Lead 5", "Lead 4", "Lead 3"])
+
+
+class SubmissionRollupTests(WagtailPageTestCase):
+    """
+    Tests for the incremental submission analytics rollups.
+    """
+
+    def setUp(self):
+        from home.models import HomePageFormField
+
+        self.homepage = HomePage(title="Home")
+        Page.objects.get(pk=1).add_child(instance=self.homepage)
+        for label in ("Name", "Budget (e.g. RM2000)", "Location / Area"):
+            HomePageFormField.objects.create(
+                page=self.homepage, label=label, field_type="singleline", required=label == "Name"
+            )
+
+    def submit(self, budget, location):
+        form = self.homepage.get_form({
+            "name": "Ali",
+            "budget_eg_rm2000": budget,
+            "location_area": location,
+        })
+        self.assertTrue(form.is_valid())
+        return self.homepage.process_form_submission(form)
+
+    def get_counts(self):
+        from home.models import SubmissionRollup
+
+        return {
+            (rollup.dimension, rollup.value): rollup.count
+            for rollup in SubmissionRollup.objects.filter(page=self.homepage)
+        }
+
+    def test_submissions_update_rollups_and_backfill_matches(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        self.submit("RM 2,500", "klang")
+        self.submit("3000", " Klang ")
+        self.submit("", "Petaling Jaya")
+
+        expected = {
+            ("", ""): 3,
+            ("budget", "RM2,000-4,999"): 2,
+            ("budget", "Unspecified"): 1,
+            ("location", "Klang"): 2,
+            ("location", "Petaling Jaya"): 1,
+        }
+        self.assertEqual(self.get_counts(), expected)
+
+        call_command("rebuild_submission_rollups", stdout=StringIO())
+        self.assertEqual(self.get_counts(), expected)
+
+    def test_budget_ranges_use_the_first_amount(self):
+        from home.rollups import get_budget_band
+
+        self.assertEqual(get_budget_band("RM1000-2000"), "RM1,000-1,999")
+        self.assertEqual(get_budget_band("RM 2,500"), "RM2,000-4,999")
+        self.assertEqual(get_budget_band("ask me"), "Unspecified")
+
+    def test_deleting_submissions_updates_rollups(self):
+        import tempfile
+        from datetime import timedelta
+        from django.utils import timezone
+        from home.archive import archive_submissions
+
+        first = self.submit("RM 2,500", "Klang")
+        self.submit("3000", "Klang")
+        first.delete()
+
+        self.assertEqual(self.get_counts()[("", "")], 1)
+        self.assertEqual(self.get_counts()[("location", "Klang")], 1)
+
+        # Archived submissions still count
+        with tempfile.TemporaryDirectory() as archive_dir, override_settings(SUBMISSION_ARCHIVE_DIR=archive_dir):
+            archive_submissions(timezone.now() + timedelta(days=1))
+        self.assertEqual(self.get_counts()[("", "")], 1)
+
+    def test_report_and_panel_read_rollups(self):
+        self.submit("800", "Klang")
+        self.login()
+
+        response = self.client.get(reverse("home_submission_report"), {"page": self.homepage.pk})
+        self.assertContains(response, "1 submission since")
+        self.assertContains(response, "Below RM1,000")
+
+        response = self.client.get(reverse("wagtailadmin_pages:edit", args=(self.homepage.pk,)))
+        self.assertContains(response, "Total submissions")
+
+
+class SubmissionArchiveTests(WagtailPageTestCase):
+    """
+    Tests for moving old submissions to monthly archive files and back.
+    """
+
+    def setUp(self):
+        import datetime
+        import tempfile
+        from django.utils import timezone
+        from home.models import HomePageFormField
+
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        settings_override = override_settings(SUBMISSION_ARCHIVE_DIR=archive_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.homepage = HomePage(title="Home")
+        Page.objects.get(pk=1).add_child(instance=self.homepage)
+        HomePageFormField.objects.create(page=self.homepage, label="Name", field_type="singleline")
+        self.submission_class = self.homepage.get_submission_class()
+        now = timezone.now()
+        for name, days_ago in [("Ali", 400), ("Bala", 400), ("Chong", 370), ("Devi", 1)]:
+            submission = self.submission_class.objects.create(page=self.homepage, form_data={"name": name})
+            submission.submit_time = now - datetime.timedelta(days=days_ago)
+            submission.save(update_fields=["submit_time"])
+        self.old_times = dict(self.submission_class.objects.values_list("form_data__name", "submit_time"))
+
+    def archive(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        call_command("archive_submissions", "--older-than=30", "--batch-size=2", stdout=StringIO())
+
+    def test_archive_moves_old_months_out_of_hot_table(self):
+        from home.archive import iter_archived
+        from home.models import SubmissionArchive
+
+        self.archive()
+
+        self.assertEqual(list(self.submission_class.objects.values_list("form_data__name", flat=True)), ["Devi"])
+        self.assertEqual(sum(SubmissionArchive.objects.values_list("row_count", flat=True)), 3)
+        names = sorted(
+            row["form_data"]["name"]
+            for index in SubmissionArchive.objects.all()
+            for row in iter_archived(index.get_path())
+        )
+        self.assertEqual(names, ["Ali", "Bala", "Chong"])
+
+    def test_admin_search_export_and_restore(self):
+        from home.models import SubmissionArchive
+
+        self.archive()
+        self.login()
+        url = reverse("home_submission_archive")
+
+        response = self.client.get(url, {"q": "chong"})
+        self.assertContains(response, "1 matching submission")
+
+        response = self.client.get(url, {"q": "a", "export": "csv"})
+        csv_rows = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(csv_rows), 3)  # heading, Ali and Bala
+
+        for index in SubmissionArchive.objects.all():
+            self.client.post(url, {"restore": index.pk})
+        self.assertFalse(SubmissionArchive.objects.exists())
+        restored = dict(self.submission_class.objects.values_list("form_data__name", "submit_time"))
+        self.assertEqual(restored, self.old_times)
+
+
+class NotificationDeliveryModeTests(WagtailPageTestCase):
+    """
+    Tests for immediate, micro-batched and digest notification emails.
+    """
+
+    def setUp(self):
+        from unittest import mock
+        from home.models import HomePageFormField
+
+        self.homepage = HomePage(title="Home", to_address="sales@example.com", email_batch_window=60)
+        Page.objects.get(pk=1).add_child(instance=self.homepage)
+        HomePageFormField.objects.create(page=self.homepage, label="Name", field_type="singleline")
+
+        patcher = mock.patch("mailtrap.MailtrapClient")
+        self.client_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        config_patcher = mock.patch("decouple.config", return_value="token")
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+
+    def submit(self, name):
+        form = self.homepage.get_form({"name": name})
+        self.assertTrue(form.is_valid())
+        self.homepage.send_via_mailtrap(form)
+
+    def sent_mails(self):
+        return [call.args[0] for call in self.client_class.return_value.send.call_args_list]
+
+    def age_pending(self, seconds):
+        import datetime
+        from django.utils import timezone
+        from home.models import PendingNotification
+
+        PendingNotification.objects.update(submit_time=timezone.now() - datetime.timedelta(seconds=seconds))
+
+    def test_immediate_sends_one_email_per_submission(self):
+        self.submit("Ali")
+        self.submit("Bala")
+
+        self.assertEqual(len(self.sent_mails()), 2)
+
+    def test_batched_submissions_share_one_email(self):
+        from home.models import PendingNotification
+        from home.notifications import flush_all_notifications
+
+        self.homepage.email_delivery_mode = "batched"
+        self.homepage.save()
+        self.submit("Ali")
+        self.submit("Bala")
+        self.assertEqual(self.sent_mails(), [])
+
+        self.age_pending(61)
+        flush_all_notifications()
+
+        mails = self.sent_mails()
+        self.assertEqual(len(mails), 1)
+        self.assertIn("2 New Contact Form Submissions", mails[0].html)
+        self.assertIn("Ali", mails[0].html)
+        self.assertIn("Bala", mails[0].text)
+        self.assertFalse(PendingNotification.objects.exists())
+
+    def test_failed_digest_is_kept_for_retry(self):
+        from home.models import PendingNotification
+        from home.notifications import flush_all_notifications
+
+        self.homepage.email_delivery_mode = "digest"
+        self.homepage.save()
+        self.submit("Ali")
+        self.age_pending(3600)
+        self.client_class.return_value.send.side_effect = ConnectionError("rate limited")
+
+        with self.assertLogs("home.notifications", "ERROR"):
+            flush_all_notifications()
+
+        self.assertEqual(PendingNotification.objects.count(), 1)
+
+    def test_only_transient_errors_are_queued(self):
+        from unittest import mock
+        from django.core.cache import cache
+        from mailtrap.exceptions import APIError, AuthorizationError
+        from home.circuit import mailtrap_breaker
+        from home.models import PendingNotification
+
+        # The failures below count towards the (cache-backed) circuit breaker
+        self.addCleanup(cache.delete_many, [f"{mailtrap_breaker.prefix}:{suffix}" for suffix in ("failures", "opened-at", "probe")])
+        self.client_class.return_value.send.side_effect = APIError(503, ["Service unavailable"])
+        with self.assertRaises(APIError):
+            self.submit("Ali")
+        self.assertEqual(PendingNotification.objects.count(), 1)
+
+        self.client_class.return_value.send.side_effect = AuthorizationError(["Invalid token"])
+        with self.assertRaises(AuthorizationError), mock.patch("home.notifications.logger"):
+            self.submit("Bala")
+        self.assertEqual(PendingNotification.objects.count(), 1)
+
+    @override_settings(TASKS={"default": {"BACKEND": "django_tasks.backends.dummy.DummyBackend"}})
+    def test_first_pending_submission_schedules_flush_task(self):
+        import datetime
+        from home.models import PendingNotification
+        from home.tasks import flush_notifications_task
+
+        self.homepage.email_delivery_mode = "batched"
+        self.homepage.save()
+        backend = flush_notifications_task.get_backend()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.submit("Ali")
+            self.submit("Bala")
+
+        [result] = backend.results
+        oldest = PendingNotification.objects.earliest("submit_time").submit_time
+        self.assertEqual(result.task.run_after, oldest + datetime.timedelta(seconds=60))
+        self.assertEqual(result.args, [self.homepage.pk])
+
+        # Run by the worker once due: one email, nothing left to reschedule
+        self.age_pending(61)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(result.task.call(self.homepage.pk), 2)
+        self.assertEqual(len(self.sent_mails()), 1)
+        self.assertEqual(len(backend.results), 1)
+
+
+class WebhookDeliveryTests(SiteHomePageMixin, WagtailPageTestCase):
+    """
+    Tests for recording failed Zapier deliveries and replaying them in batches.
+    """
+
+    hook_url = "https://hooks.example.com/catch/1/"
+
+    def setUp(self):
+        from wagtail.models import Site
+        from home.models import HomePageFormField, WebhookSettings
+        from home.site_settings import site_settings
+
+        self.homepage = self.create_site_homepage()
+        HomePageFormField.objects.create(page=self.homepage, label="Name", field_type="singleline")
+        WebhookSettings.objects.update_or_create(
+            site=Site.objects.get(is_default_site=True),
+            defaults={"zapier_webhook_url": self.hook_url, "webhook_accepts_arrays": True, "webhook_batch_size": 2},
+        )
+        site_settings.invalidate()
+
+    def test_failed_live_delivery_is_recorded(self):
+        import requests
+        from unittest import mock
+        from home.models import WebhookDelivery
+
+        form = self.homepage.get_form({"name": "Ali"})
+        self.assertTrue(form.is_valid())
+        with mock.patch("requests.Session.post", side_effect=requests.ConnectionError("down")):
+            with self.assertRaises(requests.ConnectionError):
+                self.homepage.send_to_zapier_webhook(form)
+
+        delivery = WebhookDelivery.objects.get()
+        self.assertEqual(delivery.status, WebhookDelivery.STATUS_FAILED)
+        self.assertEqual(delivery.payload["Name"], "Ali")
+
+    def test_live_deliveries_share_one_session(self):
+        from unittest import mock
+
+        form = self.homepage.get_form({"name": "Ali"})
+        self.assertTrue(form.is_valid())
+        with mock.patch("home.webhooks.WebhookDispatcher") as dispatcher:
+            self.homepage.send_to_zapier_webhook(form)
+            self.homepage.send_to_zapier_webhook(form)
+
+        sessions = [call.kwargs["session"] for call in dispatcher.call_args_list]
+        self.assertEqual(len(sessions), 2)
+        self.assertIs(sessions[0], sessions[1])
+
+    def test_replay_sends_arrays_and_marks_delivered(self):
+        from io import StringIO
+        from unittest import mock
+        from django.core.management import call_command
+        from home.models import WebhookDelivery
+
+        for number in range(5):
+            WebhookDelivery.objects.create(page=self.homepage, url=self.hook_url, payload={"Name": f"Lead {number}"})
+
+        with mock.patch("requests.Session.post") as post:
+            post.return_value.status_code = 200
+            out = StringIO()
+            call_command("replay_webhooks", "--since=1d", "--rate=0", stdout=out)
+
+        bodies = [call.kwargs["json"] for call in post.call_args_list]
+        self.assertEqual(sorted(len(body) for body in bodies), [1, 2, 2])
+        self.assertFalse(WebhookDelivery.objects.filter(status=WebhookDelivery.STATUS_FAILED).exists())
+        self.assertIn("Delivered 5, still failing 0", out.getvalue())
+
+
+@override_settings(CIRCUIT_BREAKERS={"mailtrap": {"failure_threshold": 2, "reset_timeout": 60}})
+class CircuitBreakerTests(WagtailPageTestCase):
+    """
+    Tests for the cache-backed circuit breakers around Mailtrap and Zapier.
+    """
+
+    def setUp(self):
+        from unittest import mock
+        from django.core.cache import cache
+        from home.models import HomePageFormField
+
+        self.homepage = HomePage(title="Home", to_address="sales@example.com")
+        Page.objects.get(pk=1).add_child(instance=self.homepage)
+        HomePageFormField.objects.create(page=self.homepage, label="Name", field_type="singleline")
+
+        patcher = mock.patch("mailtrap.MailtrapClient")
+        self.send = patcher.start().return_value.send
+        self.addCleanup(patcher.stop)
+        config_patcher = mock.patch("decouple.config", return_value="token")
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+        # State changes are logged as warnings
+        logger_patcher = mock.patch("home.circuit.logger")
+        logger_patcher.start()
+        self.addCleanup(logger_patcher.stop)
+        from home.circuit import breakers
+
+        # Only drop the breaker keys: clearing the whole cache would reset the
+        # snapshot generations other tests rely on
+        keys = [f"{breaker.prefix}:{suffix}" for breaker in breakers for suffix in
+                ["failures", "opened-at", "probe", "events", "count:success", "count:failure", "count:rejected"]]
+        cache.delete_many(keys)
+        self.addCleanup(cache.delete_many, keys)
+
+    def submit(self, name):
+        form = self.homepage.get_form({"name": name})
+        self.assertTrue(form.is_valid())
+        try:
+            self.homepage.send_via_mailtrap(form)
+        except ConnectionError:
+            pass
+
+    def test_open_circuit_queues_without_calling_mailtrap(self):
+        from home.circuit import OPEN, mailtrap_breaker
+        from home.models import PendingNotification
+
+        self.send.side_effect = ConnectionError("timeout")
+        self.submit("Ali")
+        self.submit("Bala")
+        self.assertEqual(mailtrap_breaker.state, OPEN)
+
+        self.submit("Chong")
+
+        self.assertEqual(self.send.call_count, 2)
+        self.assertEqual(PendingNotification.objects.count(), 3)
+        self.assertEqual(mailtrap_breaker.get_status()["counts"]["rejected"], 1)
+
+    def test_successful_probe_closes_circuit(self):
+        from unittest import mock
+        from home.circuit import CLOSED, HALF_OPEN, mailtrap_breaker
+        from home.notifications import flush_all_notifications
+
+        self.send.side_effect = ConnectionError("timeout")
+        self.submit("Ali")
+        self.submit("Bala")
+
+        with mock.patch("home.circuit.time.time", return_value=mailtrap_breaker.get_status()["opened_at"] + 61):
+            self.assertEqual(mailtrap_breaker.state, HALF_OPEN)
+            self.assertTrue(mailtrap_breaker.allow())
+            # Only one probe at a time
+            self.assertFalse(mailtrap_breaker.allow())
+            mailtrap_breaker.record_success()
+
+        self.assertEqual(mailtrap_breaker.state, CLOSED)
+        self.send.side_effect = None
+        self.assertEqual(sum(flush_all_notifications().values()), 2)
+
+    def test_admin_status_json(self):
+        from home.circuit import mailtrap_breaker
+        from home.site_settings import site_settings
+
+        self.addCleanup(site_settings.invalidate)
+        self.login()
+        mailtrap_breaker.open("test")
+
+        response = self.client.get(reverse("home_circuit_breakers"), {"format": "json"})
+
+        breakers = {status["name"]: status for status in response.json()["breakers"]}
+        self.assertEqual(breakers["mailtrap"]["state"], "open")
+        self.assertEqual(breakers["zapier"]["state"], "closed")
+        self.assertContains(self.client.get(reverse("home_circuit_breakers")), "Close circuit")
+
+    def test_metrics_endpoint_requires_token(self):
+        from home.circuit import mailtrap_breaker
+
+        url = reverse("circuit_breaker_metrics")
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        mailtrap_breaker.open("test")
+        with self.settings(CIRCUIT_METRICS_TOKEN="s3cret"):
+            self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+            response = self.client.get(url, HTTP_AUTHORIZATION="Bearer s3cret")
+
+        breakers = {status["name"]: status for status in response.json()["breakers"]}
+        self.assertEqual(breakers["mailtrap"]["state"], "open")
+        self.assertEqual(response["Cache-Control"], "no-store")
+
+
+@override_settings(
+    EMAIL_BACKEND="home.mail.PooledSMTPBackend",
+    EMAIL_HOST="smtp.example.com",
+    EMAIL_PORT=587,
+    EMAIL_USE_TLS=True,
+    EMAIL_HOST_USER="website",
+    EMAIL_HOST_PASSWORD="secret",
+)
+class PooledSMTPBackendTests(WagtailPageTestCase):
+    """
+    Tests for the pooled SMTP email backend.
+    """
+
+    def setUp(self):
+        from home.mail import close_pooled_connections
+
+        close_pooled_connections()
+        self.addCleanup(close_pooled_connections)
+
+    def test_connection_is_reused_across_sends(self):
+        from unittest import mock
+        from django.core.mail import send_mail
+
+        with mock.patch("smtplib.SMTP") as smtp:
+            for number in range(3):
+                send_mail(f"Lead {number}", "Body", "web@example.com", ["sales@example.com"])
+
+        smtp.assert_called_once()
+        smtp.return_value.starttls.assert_called_once()
+        smtp.return_value.login.assert_called_once_with("website", "secret")
+        self.assertEqual(smtp.return_value.sendmail.call_count, 3)
+        smtp.return_value.quit.assert_not_called()
+
+    def test_dropped_connection_is_replaced(self):
+        import smtplib
+        from unittest import mock
+        from django.core.mail import send_mail
+
+        with mock.patch("smtplib.SMTP") as smtp:
+            send_mail("First", "Body", "web@example.com", ["sales@example.com"])
+            smtp.return_value.sendmail.side_effect = [smtplib.SMTPServerDisconnected("idle timeout"), {}]
+            send_mail("Second", "Body", "web@example.com", ["sales@example.com"])
+
+        self.assertEqual(smtp.call_count, 2)
+        self.assertEqual(smtp.return_value.sendmail.call_count, 3)
+
+    def start_smtp_server(self, port=None):
+        """Start an aiosmtpd server on 127.0.0.1; returns (controller, handler)"""
+        import socket
+        import unittest
+
+        try:
+            from aiosmtpd.controller import Controller
+        except ImportError:
+            raise unittest.SkipTest("aiosmtpd is not installed (pip install -r requirements-dev.txt)")
+
+        class Handler:
+            def __init__(self):
+                self.sessions = 0
+                self.messages = []
+
+            async def handle_EHLO(self, server, session, envelope, hostname, responses):
+                self.sessions += 1
+                session.host_name = hostname
+                return responses
+
+            async def handle_DATA(self, server, session, envelope):
+                self.messages.append(envelope)
+                return "250 OK"
+
+        if port is None:
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                port = sock.getsockname()[1]
+        handler = Handler()
+        controller = Controller(handler, hostname="127.0.0.1", port=port)
+        controller.start()
+        # Unless the test already stopped it
+        self.addCleanup(lambda: controller.server is not None and controller.stop())
+        return controller, handler
+
+    def smtp_settings(self, port):
+        return self.settings(EMAIL_HOST="127.0.0.1", EMAIL_PORT=port, EMAIL_USE_TLS=False,
+                             EMAIL_HOST_USER="", NOTIFICATION_EMAIL_TRANSPORT="smtp")
+
+    def test_notifications_share_one_session_with_local_server(self):
+        from django.core.mail import send_mail
+        from home.models import HomePageFormField
+
+        controller, handler = self.start_smtp_server()
+
+        homepage = HomePage(title="Home", to_address="sales@example.com")
+        Page.objects.get(pk=1).add_child(instance=homepage)
+        HomePageFormField.objects.create(page=homepage, label="Name", field_type="singleline")
+
+        with self.smtp_settings(controller.port):
+            homepage.send_notification_email([({"Name": "Ali"}, None)])
+            send_mail("Contact form", "Body", "web@example.com", ["sales@example.com"])
+
+        self.assertEqual(len(handler.messages), 2)
+        self.assertEqual(handler.sessions, 1)
+
+    def test_reconnects_after_local_server_drops_session(self):
+        from django.core.mail import send_mail
+
+        controller, handler = self.start_smtp_server()
+        with self.smtp_settings(controller.port):
+            send_mail("First", "Body", "web@example.com", ["sales@example.com"])
+            # A server restart closes the pooled session
+            controller.stop()
+            controller, restarted = self.start_smtp_server(port=controller.port)
+            send_mail("Second", "Body", "web@example.com", ["sales@example.com"])
+
+        self.assertEqual(len(handler.messages), 1)
+        self.assertEqual(len(restarted.messages), 1)
+        self.assertEqual(restarted.sessions, 1)
+
+
+class StaticExportTests(SiteHomePageMixin, WagtailPageTestCase):
+    """
+    Tests for the versioned static HTML export.
+    """
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from contact.models import ContactPage
+        from home.models import HomePageFormField, PageSection
+
+        self.homepage = self.create_site_homepage(form_submission_method="email")
+        HomePageFormField.objects.create(page=self.homepage, label="Name", field_type="singleline")
+        PageSection.objects.create(page=self.homepage, section_id="hero")
+        self.homepage.add_child(instance=ContactPage(title="Contact", slug="contact"))
+        known_routes.invalidate()
+
+        self.export_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.export_dir)
+        settings_override = self.settings(STATIC_EXPORT_DIR=self.export_dir, ALLOWED_HOSTS=["*"])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def read(self, path):
+        import os
+
+        with open(os.path.join(self.export_dir, "current", path), "rb") as f:
+            return f.read()
+
+    def test_export_writes_release_and_switches_current(self):
+        import gzip
+        import os
+        from home.static_export import export_site
+
+        release_dir = export_site()
+
+        self.assertEqual(os.path.realpath(os.path.join(self.export_dir, "current")), os.path.realpath(release_dir))
+        for path in ["index.html", "contact/index.html", "thank-you/index.html", "sitemap.xml", "robots.txt"]:
+            self.assertEqual(gzip.decompress(self.read(path + ".gz")), self.read(path))
+        self.assertIn(b"/contact/", self.read("sitemap.xml"))
+
+        html = self.read("index.html")
+        self.assertIn(b'name="csrfmiddlewaretoken" value=""', html)
+        self.assertIn(b"/api/csrf/", html)
+
+    def test_reexport_prunes_old_releases(self):
+        import os
+        from home.static_export import export_site
+
+        first = export_site()
+        second = export_site(keep=1)
+
+        self.assertFalse(os.path.exists(first))
+        self.assertEqual(os.listdir(os.path.join(self.export_dir, "releases")), [os.path.basename(second)])
+
+    def test_publish_enqueues_export_task(self):
+        import os
+
+        with self.settings(STATIC_EXPORT_ON_PUBLISH=True), self.captureOnCommitCallbacks(execute=True):
+            self.homepage.save_revision().publish()
+
+        # Run inline by the development task backend
+        self.assertTrue(os.path.exists(os.path.join(self.export_dir, "current", "contact", "index.html")))
+
+    def test_csrf_endpoint_issues_token(self):
+        response = self.client.get("/api/csrf/")
+
+        self.assertTrue(response.json()["token"])
+        self.assertIn("csrftoken", response.cookies)
+
+
+class ContentAddressedStorageTests(WagtailPageTestCase):
+    """
+    Tests for content-addressed image storage and the dedupe_media command.
+    """
+
+    def setUp(self):
+        import shutil
+        import tempfile
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_image(self, title, filename, colour="white", storage=None):
+        from django.core.files.images import ImageFile
+        from io import BytesIO
+        from PIL import Image as PILImage
+        from wagtail.images import get_image_model
+
+        buffer = BytesIO()
+        PILImage.new("RGB", (40, 20), colour).save(buffer, "PNG")
+        image = get_image_model()(title=title, file=ImageFile(buffer, name=filename))
+        if storage is not None:
+            image.file.storage = storage
+        image.save()
+        return image
+
+    def test_identical_uploads_share_one_blob(self):
+        import os
+        from django.core.files.storage import default_storage
+
+        first = self.create_image("Daikin", "Daikin.png")
+        second = self.create_image("Daikin copy", "Daikin_jOGlsZP.png")
+        other = self.create_image("Midea", "Midea.png", colour="red")
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertNotEqual(first.file.name, other.file.name)
+        self.assertRegex(first.file.name, r"^original_images/[0-9a-f]{2}/[0-9a-f]{64}\.png$")
+        self.assertEqual(first.get_rendition("width-20").file.name, second.get_rendition("width-20").file.name)
+
+        path = default_storage.path(first.file.name)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertTrue(os.path.exists(path))
+
+    def test_concurrent_identical_upload_keeps_one_blob(self):
+        import os
+        from unittest import mock
+        from django.core.files.base import ContentFile
+        from home.storage import ContentAddressedStorage
+
+        storage = ContentAddressedStorage()
+        first = storage.save("original_images/Daikin.png", ContentFile(b"logo"))
+        exists = storage.exists
+        calls = []
+
+        def racing_exists(name):
+            # The second upload checked before the first one was written
+            calls.append(name)
+            return len(calls) > 1 and exists(name)
+
+        with mock.patch.object(storage, "exists", side_effect=racing_exists):
+            second = storage.save("original_images/Daikin copy.png", ContentFile(b"logo"))
+
+        self.assertEqual(second, first)
+        self.assertEqual(os.listdir(os.path.dirname(storage.path(first))), [os.path.basename(first)])
+
+    def test_dedupe_media_moves_files_and_merges_duplicates(self):
+        from io import StringIO
+        from django.core.files.storage import FileSystemStorage
+        from django.core.management import call_command
+        from wagtail.images import get_image_model
+        from home.models import BrandPartner
+
+        plain = FileSystemStorage()
+        first = self.create_image("AUX", "AUX.png", storage=plain)
+        second = self.create_image("AUX copy", "AUX_wLBhuxt.png", storage=plain)
+        self.assertNotEqual(first.file.name, second.file.name)
+        partner = BrandPartner.objects.create(image=second, alt_text="AUX")
+
+        out = StringIO()
+        call_command("dedupe_media", stdout=out)
+
+        image = get_image_model().objects.get()
+        self.assertEqual(image.pk, first.pk)
+        self.assertRegex(image.file.name, r"^original_images/[0-9a-f]{2}/")
+        self.assertTrue(image.file.storage.exists(image.file.name))
+        self.assertFalse(plain.exists("original_images/AUX.png"))
+        partner.refresh_from_db()
+        self.assertEqual(partner.image_id, first.pk)
+        self.assertIn("Merged 1 duplicate images", out.getvalue())
+
+
+class ImageOptimizationTests(WagtailPageTestCase):
+    """
+    Tests for upload-time optimisation of image originals.
+    """
+
+    def setUp(self):
+        import shutil
+        import tempfile
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(MEDIA_ROOT=media_root, IMAGE_OPTIMIZE_MAX_SIZE=1000)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_image(self, pil_image, filename, **save_options):
+        from django.core.files.images import ImageFile
+        from io import BytesIO
+        from wagtail.images import get_image_model
+
+        buffer = BytesIO()
+        pil_image.save(buffer, "PNG", **save_options)
+        return get_image_model().objects.create(title=filename, file=ImageFile(buffer, name=filename))
+
+    def open(self, image):
+        from PIL import Image as PILImage
+
+        with image.open_file() as f:
+            pil_image = PILImage.open(f)
+            pil_image.load()
+        return pil_image
+
+    def test_flat_logo_is_capped_and_quantised(self):
+        from PIL import Image as PILImage
+        from home.image_optimization import optimize_image
+
+        logo = PILImage.new("RGBA", (2000, 400), (0, 0, 0, 0))
+        logo.paste((200, 20, 20, 255), (100, 100, 1900, 300))
+        image = self.create_image(logo, "Daikin.png")
+        image.get_rendition("width-100")
+
+        before, after = optimize_image(image)
+
+        image.refresh_from_db()
+        optimised = self.open(image)
+        self.assertEqual((image.width, image.height), (1000, 200))
+        self.assertEqual(optimised.mode, "P")
+        self.assertEqual(image.file_size, after)
+        self.assertFalse(image.renditions.exists())
+        # Already optimised: nothing more to do
+        self.assertIsNone(optimize_image(image))
+
+    def test_png_photo_becomes_webp_without_metadata(self):
+        import os
+        from PIL import Image as PILImage
+        from home.image_optimization import optimize_image
+
+        photo = PILImage.frombytes("RGB", (300, 200), os.urandom(300 * 200 * 3))
+        exif = PILImage.Exif()
+        exif[0x010F] = "PhoneMaker"
+        image = self.create_image(photo, "site-visit.png", exif=exif)
+
+        self.assertIsNotNone(optimize_image(image))
+
+        image.refresh_from_db()
+        optimised = self.open(image)
+        self.assertEqual(optimised.format, "WEBP")
+        self.assertTrue(image.file.name.endswith(".webp"))
+        self.assertFalse(optimised.getexif())
+
+    def create_jpeg(self, pil_image, filename, exif):
+        from django.core.files.images import ImageFile
+        from io import BytesIO
+        from wagtail.images import get_image_model
+
+        buffer = BytesIO()
+        pil_image.save(buffer, "JPEG", quality=90, exif=exif)
+        return get_image_model().objects.create(title=filename, file=ImageFile(buffer, name=filename))
+
+    def test_jpeg_metadata_is_stripped_without_reencoding(self):
+        import os
+        from PIL import Image as PILImage
+        from home.image_optimization import optimize_image
+
+        exif = PILImage.Exif()
+        exif[0x010F] = "PhoneMaker"
+        image = self.create_jpeg(PILImage.frombytes("RGB", (64, 48), os.urandom(64 * 48 * 3)), "unit.jpg", exif)
+        pixels = self.open(image).tobytes()
+
+        self.assertIsNotNone(optimize_image(image))
+
+        image.refresh_from_db()
+        optimised = self.open(image)
+        self.assertFalse(optimised.getexif())
+        self.assertEqual(optimised.tobytes(), pixels)
+
+    def test_focal_point_follows_exif_rotation(self):
+        from PIL import Image as PILImage
+        from home.image_optimization import optimize_image
+
+        exif = PILImage.Exif()
+        exif[0x0112] = 6  # rotate 90 degrees clockwise for display
+        image = self.create_jpeg(PILImage.new("RGB", (400, 200), "white"), "install.jpg", exif)
+        image.focal_point_x, image.focal_point_y, image.focal_point_width, image.focal_point_height = 300, 50, 40, 20
+        image.save()
+
+        optimize_image(image)
+
+        image.refresh_from_db()
+        self.assertEqual((image.width, image.height), (200, 400))
+        self.assertEqual(
+            (image.focal_point_x, image.focal_point_y, image.focal_point_width, image.focal_point_height),
+            (150, 300, 20, 40),
+        )
+
+    def test_upload_is_optimised_by_task(self):
+        from PIL import Image as PILImage
+
+        with self.settings(IMAGE_OPTIMIZE_ON_UPLOAD=True, IMAGE_OPTIMIZE_MAX_SIZE=50):
+            with self.captureOnCommitCallbacks(execute=True):
+                image = self.create_image(PILImage.new("RGB", (100, 80), "white"), "Daikin.png")
+
+        image.refresh_from_db()
+        self.assertEqual((image.width, image.height), (50, 40))
+
+    def test_upload_hook_ignores_metadata_edits(self):
+        from unittest import mock
+        from PIL import Image as PILImage
+
+        with self.settings(IMAGE_OPTIMIZE_ON_UPLOAD=True), \
+                mock.patch("home.tasks.optimize_image_task") as optimize:
+            with self.captureOnCommitCallbacks(execute=True):
+                image = self.create_image(PILImage.new("RGB", (100, 100), "white"), "Panasonic.png")
+            optimize.enqueue.assert_called_once_with(image.pk)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                image.title = "Panasonic logo"
+                image.save()
+            self.assertEqual(optimize.enqueue.call_count, 1)
+
+    def test_command_reports_savings_on_dry_run(self):
+        from io import StringIO
+        from PIL import Image as PILImage
+        from django.core.management import call_command
+
+        image = self.create_image(PILImage.new("RGB", (1500, 100), "white"), "Midea.png")
+        name = image.file.name
+
+        out = StringIO()
+        call_command("optimize_images", "--dry-run", stdout=out)
+
+        self.assertIn("'Midea.png'", out.getvalue())
+        self.assertIn("Would optimise 1 images", out.getvalue())
+        image.refresh_from_db()
+        self.assertEqual(image.file.name, name)
+
+
+class RenditionPlaceholderTests(SiteHomePageMixin, WagtailPageTestCase):
+    """
+    Tests for precomputed low-quality placeholders of HomePage images.
+    """
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.core.cache import cache
+        from django.core.files.images import ImageFile
+        from io import BytesIO
+        from PIL import Image as PILImage
+        from wagtail.images import get_image_model
+        from wagtail.images.models import Filter
+        from home.placeholders import CACHE_KEY
+        from home.showcase import showcase
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        showcase.invalidate()
+        self.addCleanup(showcase.invalidate)
+
+        buffer = BytesIO()
+        PILImage.new("RGB", (40, 20), (10, 120, 200)).save(buffer, "PNG")
+        self.image = get_image_model().objects.create(title="Daikin", file=ImageFile(buffer, name="Daikin.png"))
+        # Wagtail caches renditions by image id, which repeats between test runs
+        Rendition = get_image_model().get_rendition_model()
+        rendition_key = Rendition.construct_cache_key(self.image, Filter("original").get_cache_key(self.image), "original")
+        Rendition.cache_backend.delete(rendition_key)
+        self.addCleanup(Rendition.cache_backend.delete, rendition_key)
+        self.rendition = self.image.get_rendition("original")
+        cache.delete(CACHE_KEY.format(self.rendition.file.name))
+        self.addCleanup(cache.delete, CACHE_KEY.format(self.rendition.file.name))
+
+    def test_placeholder_is_made_with_the_rendition(self):
+        from home.models import RenditionPlaceholder
+        from home.placeholders import get_placeholder
+
+        self.assertEqual(RenditionPlaceholder.objects.filter(rendition=self.rendition).count(), 1)
+        placeholder = get_placeholder(self.rendition)
+
+        self.assertTrue(placeholder.data_uri.startswith("data:image/jpeg;base64,"))
+        self.assertEqual(placeholder.colour, "#0a78c8")
+        with self.assertNumQueries(0):
+            self.assertEqual(get_placeholder(self.rendition).data_uri, placeholder.data_uri)
+
+    def test_display_never_computes_placeholders(self):
+        from io import StringIO
+        from unittest import mock
+        from django.core.cache import cache
+        from django.core.management import call_command
+        from home import placeholders
+        from home.models import RenditionPlaceholder
+
+        RenditionPlaceholder.objects.all().delete()
+        cache.delete(placeholders.CACHE_KEY.format(self.rendition.file.name))
+
+        with mock.patch.object(placeholders, "make_placeholder") as make_placeholder:
+            self.assertIsNone(placeholders.get_placeholder(self.rendition))
+        make_placeholder.assert_not_called()
+
+        call_command("create_placeholders", stdout=StringIO())
+        self.assertEqual(placeholders.get_placeholder(self.rendition).colour, "#0a78c8")
+
+    def test_partner_logo_renders_dimensions_and_placeholder(self):
+        from home.models import BrandPartner, PageSection
+
+        homepage = self.create_site_homepage()
+        PageSection.objects.create(page=homepage, section_id="partners")
+        BrandPartner.objects.create(image=self.image, alt_text="Daikin")
+
+        response = self.client.get("/")
+
+        self.assertContains(response, 'width="40" height="20"')
+        self.assertContains(response, "url(&#x27;data:image/jpeg;base64,")
+        self.assertContains(response, 'class="brand-slide"')
+
+
+class RemoteMediaStorageTests(WagtailPageTestCase):
+    """
+    Tests for the remote media storage caching, using a directory as a stand-in
+    for the object store.
+    """
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.core.files.storage import FileSystemStorage
+        from home.storage import ContentAddressedMixin, RemoteMediaMixin
+
+        class StandInStorage(ContentAddressedMixin, RemoteMediaMixin, FileSystemStorage):
+            pass
+
+        bucket = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, bucket)
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        settings_override = self.settings(MEDIA_CACHE_DIR=cache_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.cache_dir = cache_dir
+        self.storage = StandInStorage(location=bucket, base_url="https://media.example.com/")
+
+    def save(self, name, content):
+        from django.core.cache import cache
+        from django.core.files.base import ContentFile
+        from home.storage import URL_KEY
+
+        name = self.storage.save(name, ContentFile(content))
+        self.addCleanup(cache.delete, URL_KEY.format(name))
+        return name
+
+    def test_originals_are_read_through_a_local_cache(self):
+        import os
+        from unittest import mock
+        from django.core.files.storage import FileSystemStorage
+
+        name = self.save("original_images/Daikin.png", b"daikin logo")
+
+        with mock.patch.object(FileSystemStorage, "_open", autospec=True, side_effect=FileSystemStorage._open) as remote_open:
+            for _ in range(2):
+                with self.storage.open(name) as f:
+                    self.assertEqual(f.read(), b"daikin logo")
+
+        self.assertEqual(remote_open.call_count, 1)
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, name)))
+
+    def test_urls_are_memoized(self):
+        from unittest import mock
+        from django.core.files.storage import FileSystemStorage
+
+        name = self.save("images/Daikin.original.png", b"daikin rendition")
+
+        with mock.patch.object(FileSystemStorage, "url", return_value="https://media.example.com/x") as remote_url:
+            for _ in range(3):
+                self.storage.url(name)
+        self.assertEqual(remote_url.call_count, 1)
+
+    def test_blob_deleted_elsewhere_is_uploaded_again(self):
+        import os
+        from django.core.files.base import ContentFile
+
+        name = self.save("original_images/Daikin.png", b"daikin logo")
+        # Another replica deletes the blob straight from the store
+        os.remove(self.storage.path(name))
+
+        self.assertFalse(self.storage.exists(name))
+        self.assertEqual(self.storage.save("original_images/Daikin-2.png", ContentFile(b"daikin logo")), name)
+        self.assertTrue(os.path.exists(self.storage.path(name)))
+
+    def test_upload_media_copies_files_in_parallel(self):
+        import os
+        import shutil
+        import tempfile
+        from django.core.files.base import ContentFile
+        from home.storage import upload_media
+
+        source = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source)
+        for name in ("original_images/Daikin.png", "images/Daikin.max-165x165.png", "documents/price-list.pdf"):
+            os.makedirs(os.path.join(source, os.path.dirname(name)), exist_ok=True)
+            with open(os.path.join(source, name), "wb") as f:
+                f.write(name.encode())
+        self.storage.save("documents/price-list.pdf", ContentFile(b"already uploaded"))
+
+        uploaded, skipped, failed, total = upload_media(source, storage=self.storage, workers=3)
+
+        self.assertEqual((uploaded, skipped, failed), (2, 1, 0))
+        # Names are kept as they are, since image rows already point at them
+        with self.storage.open("original_images/Daikin.png") as f:
+            self.assertEqual(f.read(), b"original_images/Daikin.png")
+
+
+class ScriptLoaderTests(SiteHomePageMixin, WagtailPageTestCase):
+    """
+    Tests for deferring third-party scripts in HomePage embeds.
+    """
+
+    GTM = (
+        '<script>(function(w,d,s,l,i){w[l]=w[l]||[];})(window,document,"script","dataLayer","GTM-XXXX");</script>'
+        '<noscript><iframe src="https://www.googletagmanager.com/ns.html?id=GTM-XXXX"></iframe></noscript>'
+    )
+
+    def test_scripts_are_made_inert_until_their_loading_mode(self):
+        from home.script_loader import defer_scripts
+
+        html = self.GTM + '<script type="application/ld+json">{"@type": "Organization"}</script>'
+
+        deferred = defer_scripts(html, "interaction")
+
+        self.assertIn('<script type="text/plain" data-load="interaction">(function(w,d,s,l,i)', deferred)
+        self.assertIn('<script type="application/ld+json">', deferred)
+        self.assertIn("<noscript><iframe", deferred)
+        self.assertEqual(defer_scripts(html, "critical"), html)
+
+    def test_html_blocks_saved_before_loading_modes_stay_critical(self):
+        from home.models import HomePage
+
+        stream_block = HomePage._meta.get_field("usp_content_blocks").stream_block
+        value = stream_block.to_python([
+            {"type": "html", "value": self.GTM, "id": "a"},
+            {"type": "html", "value": {"html": self.GTM, "loading": "idle"}, "id": "b"},
+        ])
+
+        legacy, deferred = [block.render() for block in value]
+        self.assertEqual(legacy.strip(), self.GTM)
+        self.assertIn('data-load="idle"', deferred)
+
+    def test_home_page_defers_embed_code(self):
+        from home.models import PageSection
+
+        homepage = self.create_site_homepage(embed_head_code=self.GTM, embed_head_loading="idle")
+        PageSection.objects.create(page=homepage, section_id="hero")
+
+        response = self.client.get("/")
+
+        self.assertContains(response, "requestIdleCallback")
+        self.assertContains(response, '<script type="text/plain" data-load="idle">')
+        self.assertNotContains(response, '<script>(function(w,d,s,l,i)')
+
+
+class LazySectionTests(SiteHomePageMixin, WagtailPageTestCase):
+    """
+    Tests for below-the-fold homepage sections served as HTML fragments.
+    """
+
+    def setUp(self):
+        from home.models import GoogleReview, PageSection
+
+        self.homepage = self.create_site_homepage(testimonials_title="What our customers say")
+        for section_id in ("hero", "usp-section", "partners", "testimonials"):
+            PageSection.objects.create(page=self.homepage, section_id=section_id)
+        GoogleReview.objects.create(name="Ahmad", rating=5, review_text="Quick and tidy installation.")
+
+    def test_sections_below_the_fold_are_placeholders(self):
+        fragment_url = reverse("section_fragment", args=[self.homepage.pk, "testimonials"])
+
+        response = self.client.get("/")
+
+        self.assertContains(response, 'id="services"')
+        self.assertContains(response, f'id="testimonials" data-fragment-url="{fragment_url}"')
+        self.assertNotContains(response, "Quick and tidy installation.")
+        self.assertContains(response, '<meta http-equiv="refresh" content="0; url=?sections=all">')
+
+        response = self.client.get("/", {"sections": "all"})
+
+        self.assertContains(response, "Quick and tidy installation.")
+        self.assertNotContains(response, 'class="lazy-section"')
+
+    def test_fragment_is_cacheable(self):
+        url = reverse("section_fragment", args=[self.homepage.pk, "testimonials"])
+
+        response = self.client.get(url)
+
+        self.assertContains(response, "What our customers say")
+        self.assertContains(response, "Quick and tidy installation.")
+        self.assertIn("public", response["Cache-Control"])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+    def test_hero_and_disabled_sections_have_no_fragment(self):
+        from home.models import PageSection
+
+        PageSection.objects.filter(section_id="partners").update(is_enabled=False)
+
+        for section_id in ("hero", "partners", "expertise-section"):
+            url = reverse("section_fragment", args=[self.homepage.pk, section_id])
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class ContentAPITests(SiteHomePageMixin, WagtailPageTestCase):
+    """
+    Tests for the read-only HomePage content API.
+    """
+
+    def setUp(self):
+        from home.models import GoogleReview, PageSection, StatisticItem
+
+        self.homepage = self.create_site_homepage(company_name="Seng Leong Engineering", phone_primary="+6012-652 6665")
+        PageSection.objects.create(page=self.homepage, section_id="hero")
+        PageSection.objects.create(page=self.homepage, section_id="testimonials")
+        StatisticItem.objects.create(page=self.homepage, number="3000+", label="Installations")
+        GoogleReview.objects.create(name="Ahmad", rating=5, review_text="Quick and tidy installation.")
+        self.url = reverse("content_api_home")
+
+    def test_home_content_and_field_selection(self):
+        data = self.client.get(self.url).json()
+
+        self.assertEqual(data["sections"], ["hero", "testimonials"])
+        self.assertEqual(data["statistics"]["items"], [{"number": "3000+", "label": "Installations"}])
+        self.assertEqual(data["reviews"]["items"][0]["text"], "Quick and tidy installation.")
+        self.assertEqual(data["thank_you"]["title"], "Thank You!")
+
+        response = self.client.get(self.url, {"fields": "contact"})
+        self.assertEqual(list(response.json()), ["contact"])
+        self.assertEqual(response.json()["contact"]["phone_primary"], "+6012-652 6665")
+        self.assertEqual(self.client.get(self.url, {"fields": "contact,secrets"}).status_code, 400)
+
+    def test_conditional_get_is_served_from_cache(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], etag)
+
+    def test_cache_follows_this_workers_showcase_snapshot(self):
+        from home.models import GoogleReview
+        from home.showcase import showcase
+        from home.snapshots import bump_generation
+
+        etag = self.client.get(self.url)["ETag"]
+
+        # Another worker saved a review: the shared generation moved on, but this
+        # worker's snapshot is not due for a check yet
+        GoogleReview.objects.update(review_text="Fast and friendly.")
+        bump_generation(showcase.generation_key)
+        self.assertEqual(self.client.get(self.url)["ETag"], etag)
+
+        showcase.checked_at = 0  # the check interval has passed
+        response = self.client.get(self.url)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["reviews"]["items"][0]["text"], "Fast and friendly.")
+
+    def test_content_of_the_requested_site(self):
+        from wagtail.models import Site
+
+        other = HomePage(title="Branch", company_name="Seng Leong Penang")
+        Page.objects.get(pk=1).add_child(instance=other)
+        Site.objects.create(hostname="penang.example.com", root_page=other)
+
+        with self.settings(ALLOWED_HOSTS=["*"]):
+            response = self.client.get(self.url, {"fields": "contact"}, HTTP_HOST="penang.example.com")
+
+        self.assertEqual(response.json()["contact"]["company_name"], "Seng Leong Penang")
+
+    def test_publishing_invalidates_cached_content(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.homepage.company_name = "Seng Leong Aircond"
+        self.homepage.save_revision().publish()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["contact"]["company_name"], "Seng Leong Aircond")
+
+
+class CompressionTests(WagtailPageTestCase):
+    """
+    Tests for response compression and the cached encoded variants.
+    """
+
+    def setUp(self):
+        from django.test import RequestFactory
+        from home.middleware import CompressionMiddleware
+
+        self.factory = RequestFactory()
+        self.body = b"<html><body>" + b"<p>Aircond servicing in Johor Bahru</p>" * 50 + b"</body></html>"
+        self.response = None
+        self.middleware = CompressionMiddleware(lambda request: self.response)
+
+    def get(self, response, path="/", encoding="gzip"):
+        self.response = response
+        return self.middleware(self.factory.get(path, HTTP_ACCEPT_ENCODING=encoding))
+
+    def test_choose_encoding(self):
+        from unittest import mock
+        from home import compression
+
+        with mock.patch.object(compression, "brotli", None), mock.patch.object(compression, "zstandard", None):
+            self.assertEqual(compression.choose_encoding("gzip, deflate, br"), "gzip")
+            self.assertEqual(compression.choose_encoding("*"), "gzip")
+            self.assertIsNone(compression.choose_encoding("gzip;q=0, identity"))
+            self.assertIsNone(compression.choose_encoding(""))
+        with mock.patch.object(compression, "brotli", mock.Mock()), mock.patch.object(compression, "zstandard", None):
+            self.assertEqual(compression.choose_encoding("gzip, br"), "br")
+            self.assertEqual(compression.choose_encoding("gzip, br;q=0.5"), "gzip")
+
+    def test_compresses_dynamic_responses(self):
+        import gzip
+        from django.http import HttpResponse, StreamingHttpResponse
+
+        response = self.get(HttpResponse(self.body))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        self.assertFalse(self.get(HttpResponse(self.body), encoding="").has_header("Content-Encoding"))
+        self.assertFalse(self.get(HttpResponse(b"short")).has_header("Content-Encoding"))
+        self.assertFalse(self.get(HttpResponse(self.body, content_type="image/png")).has_header("Content-Encoding"))
+        self.assertFalse(self.get(StreamingHttpResponse([self.body])).has_header("Content-Encoding"))
+
+    def test_per_visitor_responses_are_padded(self):
+        import zstandard
+        from django.http import HttpResponse
+
+        responses = [self.get(HttpResponse(self.body), encoding="br, zstd, gzip") for _ in range(10)]
+
+        self.assertEqual({response["Content-Encoding"] for response in responses}, {"zstd"})
+        self.assertEqual(zstandard.ZstdDecompressor().decompress(responses[0].content), self.body)
+        self.assertGreater(len({len(response.content) for response in responses}), 1)
+        # Brotli output cannot be padded, so a br-only client gets the body as is
+        self.assertFalse(self.get(HttpResponse(self.body), encoding="br").has_header("Content-Encoding"))
+
+    def test_shared_responses_use_brotli(self):
+        import brotli
+        from django.core.cache import cache
+        from django.http import HttpResponse
+        from home import compression
+
+        path = "/sections/1/testimonials/"
+        self.addCleanup(cache.delete, compression.get_variant_key(self.factory.get(path), '"brotli-test"', "br"))
+        shared = HttpResponse(self.body)
+        shared["ETag"] = '"brotli-test"'
+        shared["Cache-Control"] = "public, max-age=300"
+
+        response = self.get(shared, path, encoding="gzip, br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), self.body)
+        self.assertEqual(response["ETag"], '"brotli-test-br"')
+
+    def test_shared_responses_are_compressed_once(self):
+        import gzip
+        from unittest import mock
+        from django.core.cache import cache
+        from django.http import HttpResponse
+        from home import compression
+
+        etag = '"compression-test-etag"'
+        path = "/sections/1/partners/"
+        self.addCleanup(cache.delete, compression.get_variant_key(self.factory.get(path), etag, "gzip"))
+
+        def shared_response():
+            response = HttpResponse(self.body)
+            response["ETag"] = etag
+            response["Cache-Control"] = "public, max-age=300"
+            return response
+
+        first = self.get(shared_response(), path)
+        self.assertEqual(gzip.decompress(first.content), self.body)
+        self.assertEqual(first["ETag"], '"compression-test-etag-gzip"')
+
+        with mock.patch.object(compression, "encode") as encode:
+            second = self.get(shared_response(), path)
+        encode.assert_not_called()
+        self.assertEqual(second.content, first.content)
+
+    def test_conditional_get_with_encoded_etag(self):
+        from django.http import HttpResponse
+        from django.utils.cache import get_conditional_response
+        from home.middleware import CompressionMiddleware
+
+        def view(request):
+            response = HttpResponse(self.body)
+            response["ETag"] = '"abc"'
+            response["Cache-Control"] = "public, max-age=60"
+            return get_conditional_response(request, etag='"abc"', response=response)
+
+        middleware = CompressionMiddleware(view)
+        request = self.factory.get("/api/v1/home/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH='"abc-gzip"')
+        not_modified = middleware(request)
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], '"abc-gzip"')
+        identity = middleware(self.factory.get("/api/v1/home/", HTTP_IF_NONE_MATCH='"abc"'))
+        self.assertEqual((identity.status_code, identity["ETag"]), (304, '"abc"'))
+
+
+class EarlyHintsTests(SiteHomePageMixin, WagtailPageTestCase):
+    """
+    Tests for preload/preconnect Link headers and 103 Early Hints on the homepage.
+    """
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.core.files.images import ImageFile
+        from io import BytesIO
+        from PIL import Image as PILImage
+        from wagtail.images import get_image_model
+        from wagtail.images.models import Filter
+        from home.models import PageSection
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        buffer = BytesIO()
+        PILImage.new("RGB", (40, 20), (10, 120, 200)).save(buffer, "PNG")
+        image = get_image_model().objects.create(title="Hero", file=ImageFile(buffer, name="Hero.png"))
+        # Wagtail caches renditions by image id, which repeats between test runs
+        Rendition = get_image_model().get_rendition_model()
+        rendition_key = Rendition.construct_cache_key(image, Filter("original").get_cache_key(image), "original")
+        Rendition.cache_backend.delete(rendition_key)
+        self.addCleanup(Rendition.cache_backend.delete, rendition_key)
+
+        # The cached hints are keyed by page id and revision, which repeat
+        # between test runs; creating the page resets the showcase generation
+        self.homepage = self.create_site_homepage(hero_background_image=image)
+        PageSection.objects.create(page=self.homepage, section_id="hero")
+        self.hero_url = image.get_rendition("original").url
+
+    def test_homepage_has_preload_links(self):
+        links = self.client.get("/")["Link"]
+
+        self.assertIn("</static/css/style.css>; rel=preload; as=style", links)
+        self.assertIn("<https://fonts.gstatic.com>; rel=preconnect; crossorigin", links)
+        self.assertIn("font-awesome/6.4.0/css/all.min.css>; rel=preload; as=style", links)
+        self.assertIn(f"<{self.hero_url}>; rel=preload; as=image; fetchpriority=high", links)
+        self.assertFalse(self.client.get(reverse("thank_you")).has_header("Link"))
+
+    def test_template_links_match_the_hints(self):
+        from django.utils.html import escape
+        from home import early_hints
+
+        response = self.client.get("/")
+
+        for asset in early_hints.get_critical_assets():
+            crossorigin = " crossorigin" if asset.get("crossorigin") else ""
+            self.assertContains(response, f'<link rel="{asset["rel"]}" href="{escape(asset["href"])}"{crossorigin}>')
+        self.assertContains(response, '<link rel="stylesheet" href="/static/css/style.css">')
+
+    def test_hero_hint_follows_the_live_revision(self):
+        self.homepage.hero_background_image = None
+        self.homepage.save_revision().publish()
+
+        links = self.client.get("/")["Link"]
+
+        self.assertIn("style.css", links)
+        self.assertNotIn(self.hero_url, links)
+
+    def test_early_hints_sent_when_server_supports_them(self):
+        from django.core.cache import cache
+        from home import early_hints
+
+        sent = []
+        response = self.client.get("/", **{"wsgi.early_hints": sent.append})
+        self.addCleanup(cache.delete, early_hints.get_path_key(response.wsgi_request))
+        self.assertEqual(sent, [])
+
+        response = self.client.get("/", **{"wsgi.early_hints": sent.append})
+
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(", ".join(value for header, value in sent[0]), response["Link"])
+        self.assertTrue(all(header == "Link" for header, value in sent[0]))
+
+    def test_early_hints_follow_the_showcase_generation(self):
+        from django.core.cache import cache
+        from home import early_hints
+        from home.showcase import showcase
+        from home.snapshots import bump_generation
+
+        sent = []
+        response = self.client.get("/", **{"wsgi.early_hints": sent.append})
+        self.addCleanup(cache.delete, early_hints.get_path_key(response.wsgi_request))
+        self.client.get("/", **{"wsgi.early_hints": sent.append})
+        self.assertEqual(len(sent), 1)
+
+        # Replacing an image bumps the showcase generation (see home.signals)
+        bump_generation(showcase.generation_key)
+        response = self.client.get("/", **{"wsgi.early_hints": sent.append})
+        self.addCleanup(cache.delete, early_hints.get_path_key(response.wsgi_request))
+
+        self.assertEqual(len(sent), 1)
@@ -0,0 +1,118 @@
+"""
+Admission control and duplicate suppression for the public form endpoints.
+
+``get_form_submission_limiter()`` is a per-IP token bucket whose state lives in the
+default cache, so every worker on the host draws from the same bucket. The
+read-modify-write is not atomic; under a race a client may get one extra
+token, which is fine for spam control.
+
+``claim_submission`` / ``remember_submission`` implement idempotency: a
+submission is fingerprinted from its normalised cleaned data, and a repeat of
+the same payload within ``FORM_DUPLICATE_WINDOW`` seconds is answered from the
+first result instead of being saved, emailed and posted to the webhook again.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+PENDING = "pending"
+
+
+def get_client_ip(request):
+    """
+    Return the client IP, honouring ``FORM_THROTTLE_TRUSTED_PROXIES`` reverse
+    proxies in front of the app (0 = use REMOTE_ADDR as is).
+    """
+    proxies = getattr(settings, "FORM_THROTTLE_TRUSTED_PROXIES", 0)
+    if proxies:
+        forwarded = [ip.strip() for ip in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if ip.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+class TokenBucket:
+    """
+    Token bucket with ``capacity`` tokens refilled at ``rate`` tokens per second.
+
+    ``consume(key)`` returns ``(allowed, retry_after_seconds)``.
+    """
+
+    def __init__(self, name, capacity, rate):
+        self.name = name
+        self.capacity = capacity
+        self.rate = rate
+
+    def cache_key(self, key):
+        return f"throttle:{self.name}:{key}"
+
+    def consume(self, key, tokens=1):
+        cache_key = self.cache_key(key)
+        now = time.time()
+        level, updated_at = cache.get(cache_key, (self.capacity, now))
+        level = min(self.capacity, level + (now - updated_at) * self.rate)
+
+        allowed = level >= tokens
+        if allowed:
+            level -= tokens
+        # Keep the entry until the bucket would be full again
+        timeout = max(1, int((self.capacity - level) / self.rate) + 1)
+        cache.set(cache_key, (level, now), timeout)
+
+        if allowed:
+            return True, 0
+        return False, int((tokens - level) / self.rate) + 1
+
+    def reset(self, key):
+        cache.delete(self.cache_key(key))
+
+
+def get_form_submission_limiter():
+    """Return the per-IP limiter shared by the HomePage form and the contact API"""
+    return TokenBucket(
+        "form-submission",
+        capacity=getattr(settings, "FORM_THROTTLE_BURST", 5),
+        rate=getattr(settings, "FORM_THROTTLE_RATE_PER_MINUTE", 5) / 60,
+    )
+
+
+def _normalise(value):
+    if isinstance(value, (list, tuple, set)):
+        return sorted(_normalise(item) for item in value)
+    if value is None:
+        return ""
+    return " ".join(str(value).split()).casefold()
+
+
+def submission_fingerprint(scope, data):
+    """Return a stable hash of ``data`` (e.g. ``form.cleaned_data``) within ``scope``"""
+    normalised = {str(key): _normalise(value) for key, value in data.items()}
+    payload = json.dumps([scope, normalised], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def claim_submission(fingerprint):
+    """
+    Claim a fingerprint for processing.
+
+    Returns ``(True, None)`` for a first submission. For a duplicate, returns
+    ``(False, result)`` where ``result`` is whatever ``remember_submission``
+    stored for the first one, or ``PENDING`` if it is still being processed.
+    """
+    window = getattr(settings, "FORM_DUPLICATE_WINDOW", 600)
+    key = f"submission:{fingerprint}"
+    if cache.add(key, PENDING, window):
+        return True, None
+    return False, cache.get(key, PENDING)
+
+
+def remember_submission(fingerprint, result):
+    cache.set(f"submission:{fingerprint}", result, getattr(settings, "FORM_DUPLICATE_WINDOW", 600))
+
+
+def forget_submission(fingerprint):
+    """Release a claim after a failure so the visitor can retry"""
+    cache.delete(f"submission:{fingerprint}")
@@ -4,7 +4,6 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from decouple import config
 import json
-from mailtrap import Mail, Address, MailtrapClient
 
 
 @require_http_methods(["POST"])
@@ -13,6 +12,23 @@ def submit_contact_form(request):
     """
     Handle contact form submissions via email using Mailtrap SDK
     """
+    # Imported here so public workers don't load the SDK until a form is sent
+    from mailtrap import Mail, Address, MailtrapClient
+    from .throttling import (
+        PENDING, claim_submission, forget_submission, get_client_ip,
+        get_form_submission_limiter, remember_submission, submission_fingerprint,
+    )
+
+    allowed, retry_after = get_form_submission_limiter().consume(get_client_ip(request))
+    if not allowed:
+        response = JsonResponse({
+            'success': False,
+            'message': 'Too many submissions from your network. Please try again in a minute or contact us on WhatsApp.'
+        }, status=429)
+        response['Retry-After'] = str(retry_after)
+        return response
+
+    fingerprint = None
     try:
         # Parse JSON data from request
         data = json.loads(request.body)
@@ -32,11 +48,33 @@ def submit_contact_form(request):
                 'message': 'Please fill in all required fields.'
             }, status=400)
         
+        # Duplicate of a recent submission: answer it with the first result
+        fingerprint = submission_fingerprint('contact-api', {
+            'name': name, 'email': email, 'phone': phone,
+            'budget': budget, 'location': location, 'message': message,
+        })
+        is_first, previous = claim_submission(fingerprint)
+        if not is_first:
+            fingerprint = None  # never release someone else's claim
+            if previous == PENDING:
+                # The first attempt is still being sent and may yet fail
+                response = JsonResponse({
+                    'success': False,
+                    'message': 'Your inquiry is still being sent. Please wait a moment before trying again.'
+                }, status=409)
+                response['Retry-After'] = '5'
+                return response
+            return JsonResponse(previous if isinstance(previous, dict) else {
+                'success': True,
+                'message': 'Thank you! Your inquiry has been sent successfully. We will get back to you soon.'
+            })
+
         # Get Mailtrap API token from environment
         api_token = config('MAILTRAP_API_TOKEN', default='')
         recipient_email = config('CONTACT_EMAIL', default='info@sengleongaircond.com')
         
         if not api_token:
+            forget_submission(fingerprint)
             return JsonResponse({
                 'success': False,
                 'message': 'Email service not configured. Please try WhatsApp instead.'
@@ -193,10 +231,12 @@ def submit_contact_form(request):
         response = client.send(mail)
         
         print(response)
-        return JsonResponse({
+        result = {
             'success': True,
             'message': 'Thank you! Your inquiry has been sent successfully. We will get back to you soon.'
-        })
+        }
+        remember_submission(fingerprint, result)
+        return JsonResponse(result)
         
     except json.JSONDecodeError:
         return JsonResponse({
@@ -206,6 +246,8 @@ def submit_contact_form(request):
     
     except Exception as e:
         print(f"Error sending email: {str(e)}")
+        if fingerprint:
+            forget_submission(fingerprint)
         return JsonResponse({
             'success': False,
             'message': 'An error occurred while sending your message. Please try WhatsApp instead or contact us directly.'
@@ -231,3 +273,98 @@ def thank_you_page(request):
     }
     
     return render(request, 'home/home_page_landing.html', context)
+
+
+@require_http_methods(["GET"])
+def section_fragment(request, page_id, section_id):
+    """
+    Render one HomePage section as an HTML fragment, fetched by the placeholders
+    of sections below the fold. Fragments carry no per-visitor data, so they are
+    publicly cacheable and revalidated by ETag.
+    """
+    import hashlib
+    from django.conf import settings
+    from django.http import Http404
+    from django.shortcuts import render
+    from django.utils.cache import get_conditional_response, patch_cache_control
+    from .models import HomePage, PageSection
+
+    if section_id == 'hero' or section_id not in dict(PageSection.SECTION_CHOICES):
+        raise Http404
+    page = HomePage.objects.live().public().filter(pk=page_id).first()
+    if page is None or not page.page_sections.filter(section_id=section_id, is_enabled=True).exists():
+        raise Http404
+
+    response = render(request, f'home/sections/{section_id}.html', {'page': page, 'self': page})
+    etag = f'"{hashlib.md5(response.content).hexdigest()}"'
+    response['ETag'] = etag
+    response['X-Robots-Tag'] = 'noindex'
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'HOMEPAGE_FRAGMENT_MAX_AGE', 300))
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+@csrf_exempt
+def content_api_home(request):
+    """
+    Read-only JSON content of the HomePage (see home/api.py)
+    """
+    # Imported here so public workers only load Django REST framework once the API is used
+    from .api import HomePageContentView
+
+    return HomePageContentView.as_view()(request)
+
+
+@require_http_methods(["GET"])
+def csrf_token(request):
+    """
+    Hand out a CSRF token (and cookie) for forms on statically exported pages,
+    where the token baked into the HTML would be shared by every visitor
+    """
+    from django.middleware.csrf import get_token
+    
+    response = JsonResponse({'token': get_token(request)})
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+@require_http_methods(["GET"])
+def circuit_breaker_metrics(request):
+    """
+    Circuit breaker state and counters as JSON for monitors and metrics
+    scrapers (the data of Reports -> Circuit breakers). Requires
+    ``Authorization: Bearer <CIRCUIT_METRICS_TOKEN>``; answers 404 while no
+    token is configured.
+    """
+    import hmac
+    from django.conf import settings
+    from django.http import Http404
+    from .circuit import breakers
+
+    token = getattr(settings, 'CIRCUIT_METRICS_TOKEN', '')
+    if not token:
+        raise Http404
+    supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ').strip()
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        response = JsonResponse({'detail': 'Invalid or missing token'}, status=401)
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+
+    response = JsonResponse({'breakers': [breaker.get_status() for breaker in breakers]})
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def robots_txt(request):
+    """
+    Serve robots.txt: keep crawlers out of the admin and point them at the sitemap
+    """
+    from django.http import HttpResponse
+    
+    lines = [
+        'User-agent: *',
+        'Disallow: /admin/',
+        'Disallow: /django-admin/',
+        'Disallow: /api/',
+        f"Sitemap: {request.build_absolute_uri('/sitemap.xml')}",
+    ]
+    return HttpResponse('\n'.join(lines) + '\n', content_type='text/plain')
@@ -0,0 +1,103 @@
+from django.urls import path, reverse
+from wagtail import hooks
+from wagtail.admin.menu import MenuItem
+from wagtail.contrib.forms.utils import get_forms_for_user
+from wagtail.snippets.models import register_snippet
+from wagtail.snippets.views.snippets import SnippetViewSet
+
+from .admin_views import CircuitBreakerView, SubmissionArchiveView, SubmissionReportView
+from .models import BrandPartner, GoogleReview
+
+
+class GoogleReviewViewSet(SnippetViewSet):
+    model = GoogleReview
+    icon = "openquote"
+    menu_label = "Google Reviews"
+    add_to_admin_menu = True
+    menu_order = 300
+    list_display = ["name", "rating", "review_source", "review_date", "is_featured", "is_verified"]
+    list_filter = ["rating", "review_source", "is_featured", "is_verified"]
+    list_per_page = 50
+    ordering = ["-is_featured", "-review_date"]
+
+
+class BrandPartnerViewSet(SnippetViewSet):
+    model = BrandPartner
+    icon = "image"
+    menu_label = "Brand Partners"
+    add_to_admin_menu = True
+    menu_order = 310
+    list_display = ["alt_text", "image"]
+    list_per_page = 50
+    sort_order_field = "sort_order"
+
+
+register_snippet(GoogleReviewViewSet)
+register_snippet(BrandPartnerViewSet)
+
+
+# Submission analytics report (reads the rollups maintained by home/rollups.py)
+# and the submission archive (home/archive.py)
+class SubmissionReportMenuItem(MenuItem):
+    def is_shown(self, request):
+        return get_forms_for_user(request.user).exists()
+
+
+@hooks.register("register_admin_urls")
+def register_submission_report_url():
+    return [
+        path("reports/submissions/", SubmissionReportView.as_view(), name="home_submission_report"),
+        path("reports/submission-archive/", SubmissionArchiveView.as_view(), name="home_submission_archive"),
+    ]
+
+
+@hooks.register("register_reports_menu_item")
+def register_submission_report_menu_item():
+    return SubmissionReportMenuItem(
+        "Submission analytics",
+        reverse("home_submission_report"),
+        name="submission-analytics",
+        icon_name="form",
+        order=650,
+    )
+
+
+@hooks.register("register_reports_menu_item")
+def register_submission_archive_menu_item():
+    return SubmissionReportMenuItem(
+        "Submission archive",
+        reverse("home_submission_archive"),
+        name="submission-archive",
+        icon_name="folder-inverse",
+        order=660,
+    )
+
+
+# Circuit breaker state for the Mailtrap and Zapier integrations (home/circuit.py)
+class CircuitBreakerMenuItem(MenuItem):
+    def is_shown(self, request):
+        return request.user.is_superuser
+
+
+@hooks.register("register_admin_urls")
+def register_circuit_breaker_url():
+    return [
+        path("reports/circuit-breakers/", CircuitBreakerView.as_view(), name="home_circuit_breakers"),
+    ]
+
+
+@hooks.register("register_reports_menu_item")
+def register_circuit_breaker_menu_item():
+    return CircuitBreakerMenuItem(
+        "Circuit breakers",
+        reverse("home_circuit_breakers"),
+        name="circuit-breakers",
+        icon_name="warning",
+        order=670,
+    )
+
+
+@hooks.register("before_serve_page")
+def remember_served_page(page, request, serve_args, serve_kwargs):
+    # home.middleware.EarlyHintsMiddleware adds preload hints for the page's assets
+    request.served_page = page
@@ -0,0 +1,100 @@
+"""
+Warm-up for freshly started worker processes.
+
+``warm_up()`` opens the database connections and pushes a few GET requests
+through the WSGI application in-process, so the first real visitor doesn't pay
+for template compilation, URL resolver population, the Site root paths cache or
+the initial DB connect. It is called from the gunicorn hooks in
+``base.gunicorn_conf``.
+"""
+import io
+import sys
+import time
+
+from django.db import connections
+
+
+def get_warm_up_paths():
+    """Return the paths rendered during warm-up: the live HomePage and the thank-you page"""
+    from django.urls import NoReverseMatch, reverse
+    from .models import HomePage
+
+    paths = []
+    page = HomePage.objects.live().first()
+    if page is not None:
+        url = page.get_url()
+        if url and url.startswith("/"):
+            paths.append(url)
+    try:
+        paths.append(reverse("thank_you"))
+    except NoReverseMatch:
+        pass
+    return paths
+
+
+def get_warm_up_host():
+    """Return (hostname, port) of the default Wagtail site"""
+    from wagtail.models import Site
+
+    site = Site.objects.filter(is_default_site=True).first()
+    if site is None:
+        return "localhost", 80
+    return site.hostname, site.port
+
+
+def build_environ(path, host="localhost", port=80, query_string=""):
+    """Return a minimal WSGI environ for an anonymous GET request"""
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query_string,
+        "SERVER_NAME": host,
+        "SERVER_PORT": str(port),
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": host if port in (80, 443) else f"{host}:{port}",
+        "wsgi.version": (1, 0),
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "https" if port == 443 else "http",
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+
+
+def warm_up(application=None, paths=None):
+    """
+    Prime the current process and return a list of (path, status, seconds).
+
+    Failures are reported in the result rather than raised: a worker that
+    can't warm up should still start and serve traffic.
+    """
+    if application is None:
+        from django.core.wsgi import get_wsgi_application
+        application = get_wsgi_application()
+
+    results = []
+    try:
+        for connection in connections.all():
+            connection.ensure_connection()
+        if paths is None:
+            paths = get_warm_up_paths()
+        host, port = get_warm_up_host()
+    except Exception as e:
+        return [("<setup>", f"error: {e}", 0.0)]
+
+    for path in paths:
+        status = []
+        start = time.perf_counter()
+        try:
+            response = application(build_environ(path, host, port), lambda s, h, exc_info=None: status.append(s))
+            try:
+                for _ in response:
+                    pass
+            finally:
+                if hasattr(response, "close"):
+                    response.close()
+            results.append((path, status[0].split()[0] if status else "?", time.perf_counter() - start))
+        except Exception as e:
+            results.append((path, f"error: {e}", time.perf_counter() - start))
+    return results
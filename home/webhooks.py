@@ -0,0 +1,182 @@
+"""
+Zapier webhook delivery.
+
+``WebhookDispatcher`` posts submission payloads to one hook URL, either one
+JSON object per request or - when the hook accepts arrays (Zapier catch hooks
+do) - up to ``batch_size`` payloads as a JSON array per request.
+
+Live submissions share one ``requests.Session`` per process
+(``get_live_session``), so the connection to Zapier is kept alive between
+submissions instead of a new pool being opened (and leaked) for each one.
+
+A live submission that cannot be delivered is stored as a failed
+``WebhookDelivery`` instead of being lost. ``manage.py replay_webhooks`` re-sends
+failed deliveries through ``replay_deliveries``: payloads are grouped per URL,
+sent from a bounded thread pool, and each host is held to
+``WEBHOOK_REPLAY_RATE_PER_HOST`` requests per second by ``HostRateLimiter``.
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.utils import timezone
+
+DEFAULT_TIMEOUT = 10
+
+_live_session = None
+_live_session_lock = threading.Lock()
+
+
+def get_live_session():
+    """Return the process-wide session used for live deliveries"""
+    global _live_session
+    with _live_session_lock:
+        if _live_session is None:
+            import requests
+
+            _live_session = requests.Session()
+        return _live_session
+
+
+class WebhookDispatcher:
+    def __init__(self, url, accepts_arrays=False, batch_size=1, timeout=DEFAULT_TIMEOUT, session=None):
+        import requests
+
+        self.url = url
+        self.batch_size = max(1, batch_size) if accepts_arrays else 1
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def chunks(self, payloads):
+        """Split ``payloads`` into the request bodies this hook receives"""
+        for start in range(0, len(payloads), self.batch_size):
+            yield payloads[start:start + self.batch_size]
+
+    def post(self, chunk):
+        """POST one chunk (a single object if it holds one payload) and raise on failure"""
+        body = chunk if self.batch_size > 1 else chunk[0]
+        response = self.session.post(
+            self.url,
+            json=body,
+            headers={'Content-Type': 'application/json'},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response
+
+
+class HostRateLimiter:
+    """Space requests to each host at least 1/rate seconds apart, across threads"""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second else 0
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def get_hook_options(url):
+    """Return (accepts_arrays, batch_size) configured in WebhookSettings for ``url``"""
+    from .models import WebhookSettings
+
+    webhook_settings = WebhookSettings.objects.filter(zapier_webhook_url=url).first()
+    if webhook_settings is None:
+        return False, 1
+    return webhook_settings.webhook_accepts_arrays, webhook_settings.webhook_batch_size
+
+
+def record_failed_delivery(page, url, payload, error):
+    """Persist a payload that could not be delivered, so replay_webhooks can re-send it"""
+    from .models import WebhookDelivery
+
+    response = getattr(error, 'response', None)
+    return WebhookDelivery.objects.create(
+        page=page,
+        url=url,
+        payload=payload,
+        attempts=1,
+        last_error=str(error)[:1000],
+        response_status=getattr(response, 'status_code', None),
+    )
+
+
+def replay_deliveries(deliveries, workers=None, rate_per_host=None, progress=None):
+    """
+    Re-send failed ``deliveries`` and update their status. ``progress`` is
+    called after every request with (done, total, delivered, failed, elapsed).
+    Returns (delivered, failed) counts.
+
+    HTTP requests run in the thread pool; every database write happens on the
+    calling thread as results come in.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    import requests
+
+    from .models import WebhookDelivery
+
+    workers = workers or getattr(settings, 'WEBHOOK_REPLAY_WORKERS', 4)
+    if rate_per_host is None:
+        rate_per_host = getattr(settings, 'WEBHOOK_REPLAY_RATE_PER_HOST', 2)
+    limiter = HostRateLimiter(rate_per_host)
+    session = requests.Session()
+    session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=workers))
+    session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=workers))
+
+    by_url = {}
+    for delivery in deliveries:
+        by_url.setdefault(delivery.url, []).append(delivery)
+
+    jobs = []
+    for url, url_deliveries in by_url.items():
+        accepts_arrays, batch_size = get_hook_options(url)
+        dispatcher = WebhookDispatcher(url, accepts_arrays, batch_size, session=session)
+        for start in range(0, len(url_deliveries), dispatcher.batch_size):
+            jobs.append((dispatcher, url_deliveries[start:start + dispatcher.batch_size]))
+
+    def send(dispatcher, chunk):
+        limiter.wait(dispatcher.url)
+        try:
+            response = dispatcher.post([delivery.payload for delivery in chunk])
+            return None, response.status_code
+        except requests.RequestException as e:
+            return e, getattr(getattr(e, 'response', None), 'status_code', None)
+
+    total = sum(len(chunk) for _, chunk in jobs)
+    delivered = failed = 0
+    started = time.monotonic()
+    with session, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(send, dispatcher, chunk): chunk for dispatcher, chunk in jobs}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            error, status = future.result()
+            ids = [delivery.pk for delivery in chunk]
+            if error is None:
+                WebhookDelivery.objects.filter(pk__in=ids).update(
+                    status=WebhookDelivery.STATUS_DELIVERED,
+                    delivered_at=timezone.now(),
+                    response_status=status,
+                    last_error='',
+                )
+                delivered += len(chunk)
+            else:
+                for delivery in chunk:
+                    delivery.attempts += 1
+                    delivery.last_error = str(error)[:1000]
+                    delivery.response_status = status
+                WebhookDelivery.objects.bulk_update(chunk, ['attempts', 'last_error', 'response_status'])
+                failed += len(chunk)
+            if progress:
+                progress(delivered + failed, total, delivered, failed, time.monotonic() - started)
+    return delivered, failed
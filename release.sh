@@ -0,0 +1,7 @@
+#!/bin/sh
+# Release phase: run once per deploy, before the new web containers start.
+# Kept out of the container CMD so workers reach serving state without
+# waiting on (or racing each other for) migrations.
+set -e
+
+python manage.py migrate --noinput